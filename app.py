@@ -3,15 +3,14 @@ import logging
 import hmac
 import hashlib
 import threading
+import time
 from flask import Flask, request, jsonify, send_from_directory, render_template
 from flask_socketio import SocketIO
 from bitget.rest_api import bitget  # Import Bitget SDK
 
 from backend.trading_logic.order_execution import OrderExecution, TradingLogic
-from backend.ai_models.reinforcement_learning import ReinforcementLearning
-from backend.ai_models.neural_network import NeuralNetwork
-from backend.ai_models.lstm_model import LSTMTradingModel
 from backend.data.data_fetcher import DataFetcher
+from backend.data.push_channel import MarketPushChannel
 from backend.tasks import run_trading_job_task  # Import the Celery task
 
 # ===========================
@@ -58,7 +57,17 @@ fetcher = DataFetcher(
     trade_symbol=config.TRADE_SYMBOL,
     use_external=config.USE_EXTERNAL_DATA
 )
-order_executor = OrderExecution(config.API_KEY, config.API_SECRET)
+order_executor = OrderExecution(config.API_KEY, config.API_SECRET, config.PASSPHRASE)
+
+# ===========================
+# 📡 Market Push Channel
+# ===========================
+# One publisher reads the market data hub each second and pushes only what changed to every
+# subscribed dashboard over SocketIO, so exchange load does not grow with open tabs. It starts
+# on the first subscription, inside the worker, since gunicorn preloads this module before forking.
+market_channel = MarketPushChannel(socketio, fetcher.hub, symbol=config.TRADE_SYMBOL,
+                                   balance=fetcher.fetch_balance,
+                                   autostart=os.getenv('MARKET_PUSH', '1') != '0').register()
 
 # ===========================
 # ⚙️ Global State
@@ -101,7 +110,7 @@ def start_bot():
     if not bot_running:
         bot_running = True
         # Use Celery to run the trading job in the background
-        run_trading_job_task.delay()  # Trigger the Celery task
+        run_trading_job_task.delay(scheduled_at=time.time())  # Trigger the Celery task; stale runs are dropped
         logging.info("Trading bot started")
 
 def stop_bot():
@@ -153,4 +162,4 @@ if __name__ == '__main__':
     )
     
     logging.info("🚀 Starting Flask Trading Bot App")
-    app.run(host='0.0.0.0', port=5000, debug=config.ENV != 'prod')
+    socketio.run(app, host='0.0.0.0', port=5000, debug=config.ENV != 'prod', allow_unsafe_werkzeug=True)
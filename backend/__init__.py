@@ -1,16 +1,24 @@
-from .ai_models import (
-    LSTMTradingModel,
-    GRUTradingModel,
-    TransformerTradingModel,
-    TradingAI,
-    ReinforcementLearning,
-    train_model,
-)
+# backend/__init__.py
+#
+# Public names are imported on first access, so `import backend.<anything>`
+# does not pull in TensorFlow, sklearn or the exchange SDKs up front.
 
-from .trading_logic.order_execution import OrderExecution
-from .trading_logic.logic import TradingLogic
-from .ai_models.trading_ai import run_trading_job  # Import run_trading_job from trading_ai
-from .exchange.exchange_data import fetch_ohlcv_data
+from ._lazy import lazy_attributes
+
+_LAZY_ATTRIBUTES = {
+    "LSTMTradingModel": ".ai_models.lstm_trading_model",
+    "GRUTradingModel": ".ai_models.gru_trading_model",
+    "TransformerTradingModel": ".ai_models.transformer_trading_model",
+    "TradingAI": ".ai_models.trading_ai",
+    "ReinforcementLearning": ".ai_models.reinforcement_learning",
+    "train_model": ".ai_models.trainer",
+    "OrderExecution": ".trading_logic.order_execution",
+    "TradingLogic": ".trading_logic.logic",
+    "run_trading_job": ".ai_models.trading_ai",
+    "fetch_ohlcv_data": ".exchange.exchange_data",
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
 
 __all__ = [
     "LSTMTradingModel",
@@ -21,6 +29,6 @@ __all__ = [
     "train_model",
     "OrderExecution",
     "TradingLogic",
-    "run_trading_job",  # Added run_trading_job to __all__
+    "run_trading_job",
     "fetch_ohlcv_data"
-]
\ No newline at end of file
+]
@@ -0,0 +1,30 @@
+# backend/_lazy.py
+
+import importlib
+
+
+def lazy_attributes(package, attributes):
+    """
+    Build module-level ``__getattr__``/``__dir__`` (PEP 562) that import on first access.
+
+    Args:
+        package (str): The package's ``__name__``; relative module paths resolve against it.
+        attributes (dict): Public name -> module path that defines it.
+
+    Returns:
+        tuple: (__getattr__, __dir__) to assign in the package ``__init__``.
+    """
+    module = importlib.import_module(package)
+
+    def __getattr__(name):
+        path = attributes.get(name)
+        if path is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(path, package), name)
+        setattr(module, name, value)  # later lookups skip __getattr__
+        return value
+
+    def __dir__():
+        return sorted(set(vars(module)) | set(attributes))
+
+    return __getattr__, __dir__
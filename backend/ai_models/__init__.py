@@ -1,11 +1,20 @@
 # backend/ai_models/__init__.py
+#
+# Model classes are imported on first access so importing a light submodule
+# (windowing, registry, inference_server) does not load TensorFlow.
 
-from .lstm_trading_model import LSTMTradingModel
-from .gru_trading_model import GRUTradingModel
-from .transformer_trading_model import TransformerTradingModel
-from .reinforcement_learning import ReinforcementLearning
-from .trading_ai import TradingAI
-from .trainer import train_model  # Ensure this exists
+from backend._lazy import lazy_attributes
+
+_LAZY_ATTRIBUTES = {
+    "LSTMTradingModel": ".lstm_trading_model",
+    "GRUTradingModel": ".gru_trading_model",
+    "TransformerTradingModel": ".transformer_trading_model",
+    "ReinforcementLearning": ".reinforcement_learning",
+    "TradingAI": ".trading_ai",
+    "train_model": ".trainer",
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
 
 __all__ = [
     "LSTMTradingModel",
@@ -14,4 +23,4 @@ __all__ = [
     "ReinforcementLearning",
     "TradingAI",
     "train_model"
-]
\ No newline at end of file
+]
@@ -0,0 +1,333 @@
+# backend/ai_models/ensemble.py
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+STRATEGY_WEIGHTS_FILE = os.getenv('STRATEGY_WEIGHTS_FILE', 'strategy_weights.json')
+DEFAULT_STRATEGY_WEIGHTS = {'lstm': 0.33, 'trading_ai': 0.33, 'rl': 0.34}
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# score(values) -> float in [-1, 1] (positive is bullish), or None to abstain; values is read-only (rows, 5) OHLCV
+EnsembleMember = namedtuple('EnsembleMember', ['name', 'score'])
+# latency in seconds, measured on the member's thread; error is the message if it failed or timed out
+MemberResult = namedtuple('MemberResult', ['score', 'weight', 'latency', 'error'])
+EnsembleResult = namedtuple('EnsembleResult', ['score', 'signal', 'members', 'latency'])
+
+
+# -------- WEIGHTS --------
+class StrategyWeights:
+    """
+    In-memory copy of the strategy weights JSON file, reloaded when the file changes.
+
+    ``get`` stats the file at most every ``check_interval`` seconds and
+    re-reads it only when its mtime, size or inode has changed. Writers
+    replace the file atomically (see ``write``), so the inode check also
+    catches a replace within the mtime resolution. A missing file yields
+    ``defaults``; an unreadable one keeps the last good weights.
+    """
+
+    def __init__(self, path=STRATEGY_WEIGHTS_FILE, defaults=None, check_interval=1.0):
+        self.path = path
+        self.defaults = dict(DEFAULT_STRATEGY_WEIGHTS if defaults is None else defaults)
+        self.check_interval = check_interval
+        self._weights = dict(self.defaults)
+        self._signature = None
+        self._checked = None
+        self._lock = threading.Lock()
+        self.reloads = 0
+
+    def get(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._checked is None or now - self._checked >= self.check_interval:
+                self._checked = now
+                self._refresh()
+            return dict(self._weights)
+
+    def reload(self):
+        """Check the file now, regardless of ``check_interval``; returns the weights."""
+        with self._lock:
+            self._checked = time.monotonic()
+            self._refresh()
+            return dict(self._weights)
+
+    def _refresh(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self._signature, self._weights = None, dict(self.defaults)
+            return
+        signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+        if signature == self._signature:
+            return
+        try:
+            with open(self.path, 'r') as f:
+                weights = {str(k): float(v) for k, v in json.load(f).items()}
+        except Exception as e:
+            logger.warning("Could not read strategy weights from %s, keeping the previous ones: %s", self.path, e)
+            return
+        self._signature, self._weights = signature, weights
+        self.reloads += 1
+        logger.info("Loaded strategy weights %s", weights)
+
+    def write(self, weights):
+        """Replace the file atomically with ``weights`` and reload them."""
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(weights, f, indent=2)
+        os.replace(tmp, self.path)
+        return self.reload()
+
+
+_weights_files = {}
+_weights_files_lock = threading.Lock()
+
+
+def strategy_weights_file(path=None):
+    """Process-wide StrategyWeights for ``path`` (STRATEGY_WEIGHTS_FILE by default)."""
+    path = path or STRATEGY_WEIGHTS_FILE
+    with _weights_files_lock:
+        weights = _weights_files.get(path)
+        if weights is None:
+            weights = _weights_files[path] = StrategyWeights(path)
+        return weights
+
+
+# -------- MEMBERS --------
+def ohlcv_values(data):
+    """(rows, 5) float64 OHLCV from a hub frame (capitalized columns) or anything array-like."""
+    if hasattr(data, 'columns'):
+        data = data[OHLCV_COLUMNS]
+    return np.array(data, dtype=np.float64)
+
+
+def price_member(name, model, time_steps, sensitivity=100.0):
+    """
+    Member for a next-close regressor such as LSTMTradingModel.
+
+    The model sees the window's closes standardised by their own mean and
+    standard deviation, as in the model backtest, and its output is mapped
+    back to a price with the same two numbers. The score is the predicted
+    move from the last close, scaled by ``sensitivity`` and clipped to
+    [-1, 1]: with the default, a 1% move or more is full conviction.
+    """
+    def score(values):
+        closes = values[-time_steps:, 3]
+        if len(closes) < time_steps:
+            return None
+        mean, std = closes.mean(), closes.std()
+        std = std if std > 0 else 1.0
+        predicted = float(np.asarray(model.predict(((closes - mean) / std)[:, None])).reshape(-1)[-1]) * std + mean
+        return float(np.clip((predicted / closes[-1] - 1.0) * sensitivity, -1.0, 1.0))
+    return EnsembleMember(name, score)
+
+
+def trend_member(name, trading_ai):
+    """Member for a TradingAI: +1 or -1 when its last two predictions rise or fall, as ``model_signal`` reads them."""
+    def score(values):
+        predictions = trading_ai.predict(values[-(trading_ai.time_steps + 1):, 3:4])
+        if not predictions or len(predictions) < 2:
+            return None
+        return float(np.sign(predictions[-1] - predictions[-2]))
+    return EnsembleMember(name, score)
+
+
+def candle_history(symbol, interval='1h', days=180, source=None):
+    """
+    Loader for ``rl_member``: the last ``days`` of closed ``interval`` candles from the candle store.
+
+    Missing candles are downloaded through ``source``, or the shared market
+    hub's rate-limited kline source if none is given.
+    """
+    def load():
+        from backend.data.candle_store import get_candle_store  # deferred: only needed for the first warm start
+        from backend.data.market_hub import get_market_hub
+        end = int(time.time() * 1000)
+        _, values = get_candle_store().history(symbol, interval, end - days * 86_400_000, end,
+                                               source=source or get_market_hub().kline_source)
+        return values
+    return load
+
+
+def rl_member(name, rl_model, history=None, warm_start_epochs=5, min_rows=60):
+    """
+    Member for an RLTradingModel: the position of its greedy action at the last candle.
+
+    An untrained model is trained once on ``history()``, a (rows, 5) OHLCV
+    array such as ``candle_history`` returns, with at least ``min_rows``
+    candles (tabular Q-learning, milliseconds per thousand candles). Without
+    ``history`` it trains on the first long enough window. The member
+    abstains while training runs on another thread, and whenever the last
+    candle's state was never updated in training or its best actions are
+    tied: an all-zero Q row says nothing about the market.
+    """
+    from .rl_model import ACTION_POSITIONS, ohlcv_features
+    lock = threading.Lock()
+
+    def trained():
+        return rl_model.discretizer is not None and rl_model.discretizer.fitted
+
+    def score(values):
+        if not trained():
+            if not lock.acquire(blocking=False):
+                return None
+            try:
+                if not trained():
+                    candles = values if history is None else history()
+                    if len(candles) < min_rows:
+                        return None
+                    rl_model.train_on_candles(candles, epochs=warm_start_epochs, seed=0)
+            finally:
+                lock.release()
+        features = ohlcv_features(values)[-1:]
+        if np.isnan(features).any():
+            return None
+        q = rl_model.q_table[rl_model.discretizer.transform(features)[0]]
+        if not q.any() or np.count_nonzero(q == q.max()) > 1:
+            return None
+        return float(ACTION_POSITIONS[int(np.argmax(q))])
+    return EnsembleMember(name, score)
+
+
+# -------- ENSEMBLE --------
+class WeightedEnsemble:
+    """
+    Runs every weighted member concurrently on one shared candle window and combines their scores.
+
+    Members run on a thread pool. TensorFlow and NumPy release the GIL in
+    their kernels, so the ensemble takes about as long as its slowest
+    member rather than the sum of all of them. All members read the same
+    OHLCV array, which is made read-only. Weights come from ``weights()``
+    on every call, so a changed weights file takes effect on the next
+    prediction. The combined score is the weighted mean over members that
+    answered. Members with zero weight are not run. Members that abstain,
+    fail or miss ``timeout`` are left out.
+
+    Args:
+        members (list): EnsembleMember instances.
+        weights (callable): Returns the current {name: weight} dict, e.g. ``StrategyWeights.get``.
+        timeout (float): Seconds to wait for members; None waits for all.
+        threshold (float): Combined score beyond which the signal is BUY or SELL instead of HOLD.
+    """
+
+    def __init__(self, members, weights=None, timeout=None, threshold=0.1):
+        self.members = list(members)
+        self.weights = weights or strategy_weights_file().get
+        self.timeout = timeout
+        self.threshold = threshold
+        self._executor = ThreadPoolExecutor(max_workers=max(1, len(self.members)), thread_name_prefix='ensemble')
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    @staticmethod
+    def _run_member(member, values):
+        began = time.perf_counter()
+        try:
+            score, error = member.score(values), None
+        except Exception as e:
+            logger.warning("Ensemble member %s failed: %s", member.name, e)
+            score, error = None, str(e)
+        return score, time.perf_counter() - began, error
+
+    def predict(self, data):
+        """
+        Combined prediction on the candles in ``data`` (a hub frame or (rows, 5) OHLCV array).
+
+        Returns:
+            EnsembleResult: The combined score and its signal, each member's
+            MemberResult, and the ensemble latency in seconds.
+        """
+        began = time.perf_counter()
+        values = ohlcv_values(data)
+        values.setflags(write=False)
+        weights = self.weights()
+
+        members, futures = {}, {}
+        for member in self.members:
+            weight = float(weights.get(member.name, 0.0))
+            if weight > 0:
+                futures[member.name] = self._executor.submit(self._run_member, member, values)
+            else:
+                members[member.name] = MemberResult(None, weight, 0.0, None)
+        wait(futures.values(), timeout=self.timeout)
+
+        total = weighted = 0.0
+        for name, future in futures.items():
+            weight = float(weights[name])
+            if future.done():
+                score, latency, error = future.result()
+            else:
+                score, latency, error = None, time.perf_counter() - began, 'timed out'
+                logger.warning("Ensemble member %s timed out after %.3fs", name, latency)
+            members[name] = MemberResult(score, weight, latency, error)
+            if score is not None:
+                total += weight
+                weighted += weight * score
+
+        score = weighted / total if total else 0.0
+        signal = 'BUY' if score > self.threshold else 'SELL' if score < -self.threshold else 'HOLD'
+        latency = time.perf_counter() - began
+        self._record(members, latency)
+        return EnsembleResult(score, signal, members, latency)
+
+    # -------- METRICS --------
+    def _record(self, members, latency):
+        with self._lock:
+            for name, result in list(members.items()) + [('ensemble', MemberResult(None, None, latency, None))]:
+                if name != 'ensemble' and not result.weight:
+                    continue
+                stats = self._stats.setdefault(name, {'calls': 0, 'errors': 0, 'total': 0.0, 'max': 0.0, 'last': 0.0})
+                stats['calls'] += 1
+                stats['errors'] += result.error is not None
+                stats['total'] += result.latency
+                stats['max'] = max(stats['max'], result.latency)
+                stats['last'] = result.latency
+
+    def metrics(self):
+        """Per-member and whole-ensemble call counts, errors and latencies (ms)."""
+        with self._lock:
+            return {name: {'calls': s['calls'], 'errors': s['errors'],
+                           'mean_ms': round(s['total'] / s['calls'] * 1e3, 3),
+                           'max_ms': round(s['max'] * 1e3, 3), 'last_ms': round(s['last'] * 1e3, 3)}
+                    for name, s in self._stats.items()}
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+_ensemble = None
+_ensemble_lock = threading.Lock()
+
+
+def get_strategy_ensemble(time_steps=60, rl_history=None):
+    """
+    Process-wide ensemble of the models named in the strategy weights: 'lstm', 'trading_ai' and 'rl'.
+
+    Each name is a different model from the model registry (built and
+    warmed once): the LSTM as a price regressor, a GRU TradingAI read for
+    its trend, and the tabular RL model. The RL model warm-starts on
+    ``rl_history`` (by default ``candle_history`` for TRADE_SYMBOL).
+    Weights come from the shared STRATEGY_WEIGHTS_FILE cache.
+    """
+    global _ensemble
+    with _ensemble_lock:
+        if _ensemble is None:
+            from .registry import get_model_registry  # deferred: model modules load TensorFlow
+            from .trading_ai import TradingAI
+            registry = get_model_registry()
+            _ensemble = WeightedEnsemble([
+                price_member('lstm', registry.get('LSTM', time_steps, 1), time_steps),
+                trend_member('trading_ai', TradingAI(model_type='GRU', time_steps=time_steps, scale_data=True)),
+                rl_member('rl', registry.get('RL', time_steps, 1),
+                          history=rl_history or candle_history(os.getenv('TRADE_SYMBOL', 'BTCUSDT'))),
+            ])
+        return _ensemble
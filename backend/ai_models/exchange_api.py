@@ -3,16 +3,22 @@ from binance.client import Client
 from binance.enums import *
 from binance.exceptions import BinanceAPIException
 
+from backend.exchange.rate_limiter import get_rate_limiter
+
 logger = logging.getLogger(__name__)
 
 class ExchangeClient:
-    def __init__(self, api_key: str, api_secret: str, use_testnet: bool = False, use_futures: bool = False):
+    def __init__(self, api_key: str, api_secret: str, use_testnet: bool = False, use_futures: bool = False,
+                 rate_limiter=None, futures_rate_limiter=None):
         if not api_key or not api_secret:
             logger.error("Missing API key or secret!")
             raise ValueError("API credentials required.")
 
         self.use_futures = use_futures
         self.client = Client(api_key, api_secret)
+        # Shared per-process limiters: every call waits for request weight, orders ahead of market data
+        self.rate_limiter = rate_limiter or get_rate_limiter('spot')
+        self.futures_rate_limiter = futures_rate_limiter or get_rate_limiter('futures')
 
         if use_testnet:
             self.client.API_URL = "https://testnet.binance.vision/api"
@@ -25,7 +31,8 @@ class ExchangeClient:
     def place_market_order(self, symbol: str, side: str, quantity: float):
         try:
             logger.info("Placing spot market order: %s %s %f", side, symbol, quantity)
-            return self.client.create_order(
+            return self.rate_limiter.call(
+                'create_order', self.client.create_order,
                 symbol=symbol,
                 side=side,
                 type=ORDER_TYPE_MARKET,
@@ -37,7 +44,7 @@ class ExchangeClient:
 
     def get_balance(self):
         try:
-            return self.client.get_account().get("balances", [])
+            return self.rate_limiter.call('account', self.client.get_account).get("balances", [])
         except Exception as e:
             logger.error("Balance fetch error: %s", str(e))
             return []
@@ -47,7 +54,8 @@ class ExchangeClient:
         try:
             logger.info("Placing margin order: %s %s %f", side, symbol, quantity)
             order_type = "MARKET"  # Can be customized for different types (LIMIT, etc.)
-            return self.client.create_margin_order(
+            return self.rate_limiter.call(
+                'margin_order', self.client.create_margin_order,
                 symbol=symbol,
                 side=side,
                 type=order_type,
@@ -60,7 +68,8 @@ class ExchangeClient:
     def borrow_margin(self, asset: str, amount: float):
         try:
             logger.info("Borrowing margin for %s: %f", asset, amount)
-            return self.client.sapi_post(f"/sapi/v1/margin/loan", params={"asset": asset, "amount": amount})
+            return self.rate_limiter.call('margin_loan', self.client.sapi_post, f"/sapi/v1/margin/loan",
+                                          params={"asset": asset, "amount": amount})
         except Exception as e:
             logger.error("Margin borrowing failed: %s", str(e))
             return None
@@ -68,7 +77,8 @@ class ExchangeClient:
     def repay_margin(self, asset: str, amount: float):
         try:
             logger.info("Repaying margin for %s: %f", asset, amount)
-            return self.client.sapi_post(f"/sapi/v1/margin/repay", params={"asset": asset, "amount": amount})
+            return self.rate_limiter.call('margin_repay', self.client.sapi_post, f"/sapi/v1/margin/repay",
+                                          params={"asset": asset, "amount": amount})
         except Exception as e:
             logger.error("Margin repayment failed: %s", str(e))
             return None
@@ -80,7 +90,8 @@ class ExchangeClient:
                 raise ValueError("Futures trading not enabled for this client.")
 
             logger.info("Placing futures %s order: %s %f", order_type, side, quantity)
-            return self.client.futures_create_order(
+            return self.futures_rate_limiter.call(
+                'futures_order', self.client.futures_create_order,
                 symbol=symbol,
                 side=side,
                 type=order_type,
@@ -96,21 +107,22 @@ class ExchangeClient:
                 raise ValueError("Futures trading not enabled.")
 
             logger.info("Setting leverage for %s to %dx", symbol, leverage)
-            return self.client.futures_change_leverage(symbol=symbol, leverage=leverage)
+            return self.futures_rate_limiter.call('leverage', self.client.futures_change_leverage,
+                                                  symbol=symbol, leverage=leverage)
         except Exception as e:
             logger.error("Set leverage error: %s", str(e))
             return None
 
     def get_futures_balance(self):
         try:
-            return self.client.futures_account_balance()
+            return self.futures_rate_limiter.call('futures_balance', self.client.futures_account_balance)
         except Exception as e:
             logger.error("Futures balance error: %s", str(e))
             return []
 
     def get_open_futures_positions(self):
         try:
-            return self.client.futures_position_information()
+            return self.futures_rate_limiter.call('futures_positions', self.client.futures_position_information)
         except Exception as e:
             logger.error("Futures positions fetch error: %s", str(e))
             return []
@@ -123,7 +135,8 @@ class ExchangeClient:
 
             logger.info("Placing trailing stop order: %s %s %f with activation at %f and callback rate of %f", 
                         side, symbol, quantity, activation_price, callback_rate)
-            return self.client.futures_create_order(
+            return self.futures_rate_limiter.call(
+                'futures_order', self.client.futures_create_order,
                 symbol=symbol,
                 side=side,
                 type=ORDER_TYPE_STOP_MARKET,
@@ -142,7 +155,8 @@ class ExchangeClient:
                 raise ValueError("Futures trading not enabled.")
 
             logger.info("Placing take profit order: %s %s %f at price %f", side, symbol, quantity, price)
-            return self.client.futures_create_order(
+            return self.futures_rate_limiter.call(
+                'futures_order', self.client.futures_create_order,
                 symbol=symbol,
                 side=side,
                 type=ORDER_TYPE_LIMIT,
@@ -161,10 +175,11 @@ class ExchangeClient:
                 if not self.use_futures:
                     raise ValueError("Futures trading not enabled.")
                 logger.info("Canceling futures order with ID: %s", order_id)
-                return self.client.futures_cancel_order(symbol=symbol, orderId=order_id)
+                return self.futures_rate_limiter.call('futures_cancel_order', self.client.futures_cancel_order,
+                                                      symbol=symbol, orderId=order_id)
             else:
                 logger.info("Canceling spot order with ID: %s", order_id)
-                return self.client.cancel_order(symbol=symbol, orderId=order_id)
+                return self.rate_limiter.call('cancel_order', self.client.cancel_order, symbol=symbol, orderId=order_id)
         except Exception as e:
             logger.error("Order cancellation failed: %s", str(e))
             return None
@@ -176,10 +191,11 @@ class ExchangeClient:
                 if not self.use_futures:
                     raise ValueError("Futures trading not enabled.")
                 logger.info("Fetching futures order status for order ID: %s", order_id)
-                return self.client.futures_get_order(symbol=symbol, orderId=order_id)
+                return self.futures_rate_limiter.call('futures_order_status', self.client.futures_get_order,
+                                                      symbol=symbol, orderId=order_id)
             else:
                 logger.info("Fetching spot order status for order ID: %s", order_id)
-                return self.client.get_order(symbol=symbol, orderId=order_id)
+                return self.rate_limiter.call('order_status', self.client.get_order, symbol=symbol, orderId=order_id)
         except Exception as e:
             logger.error("Order status fetch failed: %s", str(e))
             return None
@@ -192,7 +208,8 @@ class ExchangeClient:
                     raise ValueError("Futures trading not enabled.")
                 logger.info("Placing stop-loss order (Futures): %s %s %f at stop price %f", 
                             side, symbol, quantity, stop_price)
-                return self.client.futures_create_order(
+                return self.futures_rate_limiter.call(
+                    'stop_loss_order', self.client.futures_create_order,
                     symbol=symbol,
                     side=side,
                     type=ORDER_TYPE_STOP_MARKET,
@@ -202,7 +219,8 @@ class ExchangeClient:
             else:
                 logger.info("Placing stop-loss order (Spot): %s %s %f at stop price %f", 
                             side, symbol, quantity, stop_price)
-                return self.client.create_order(
+                return self.rate_limiter.call(
+                    'stop_loss_order', self.client.create_order,
                     symbol=symbol,
                     side=side,
                     type=ORDER_TYPE_STOP_MARKET,
@@ -3,6 +3,8 @@ import pandas as pd
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import GRU, Dense, Dropout, Input
 
+from .inference_server import get_inference_server
+
 class GRUTradingModel:
     def __init__(self, time_steps=60, n_features=1):
         self.time_steps = time_steps
@@ -40,4 +42,4 @@ class GRUTradingModel:
 
     def predict(self, x_input):
         x_input = self._clean_input(x_input)
-        return self.model.predict(x_input, verbose=0)
\ No newline at end of file
+        return get_inference_server(self.model).predict(x_input)
\ No newline at end of file
@@ -3,6 +3,7 @@ from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import GRU, Dropout, Dense
 import logging
 from .base import BaseTradingModel
+from .windowing import as_feature_array, sliding_windows
 
 logger = logging.getLogger(__name__)
 
@@ -24,16 +25,12 @@ class GRUTradingModel(BaseTradingModel):
         return model
 
     def _clean_input(self, data):
-        data = np.asarray(data).astype(np.float32)
+        data = as_feature_array(data)
         if data.ndim == 2:
             if data.shape[0] < self.time_steps:
                 raise ValueError(f"Not enough data: got {data.shape[0]} rows, need at least {self.time_steps}.")
             try:
-                data = np.array([
-                    data[i:i + self.time_steps]
-                    for i in range(len(data) - self.time_steps + 1)
-                ])
-                data = data.reshape((data.shape[0], self.time_steps, self.n_features))
+                data = sliding_windows(data, self.time_steps, self.n_features, contiguous=True)
             except Exception as e:
                 logger.error("Reshape error in _clean_input: %s", str(e))
                 raise
@@ -0,0 +1,228 @@
+# backend/ai_models/inference_server.py
+
+import logging
+import queue
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Above this many rows Keras' predict() (which batches internally) beats a direct call
+DIRECT_CALL_MAX_ROWS = 1024
+
+
+def keras_predict_fn(model):
+    """
+    Forward pass for a Keras model as a plain ``(batch, ...) -> ndarray`` function.
+
+    ``model.predict`` builds a data adapter and callbacks on every call, and an
+    eager ``model(x)`` runs recurrent layers step by step in Python, so both
+    cost ~100ms even for one row. With TensorFlow available the forward pass
+    is compiled once with ``tf.function`` (retracing is relaxed so varying batch
+    sizes share a graph). Only a weak reference to the model is kept, so a
+    server built on this function does not keep the model alive.
+    """
+    model_ref = weakref.ref(model)
+
+    def forward(x):
+        return model_ref()(x, training=False)
+
+    try:
+        import tensorflow as tf
+        forward = tf.function(forward, reduce_retracing=True)
+    except ImportError:
+        pass
+
+    def predict(x):
+        model = model_ref()
+        if model is None:
+            raise RuntimeError("Model was garbage collected.")
+        if len(x) > DIRECT_CALL_MAX_ROWS:
+            return model.predict(x, verbose=0)
+        return np.asarray(forward(x))
+    return predict
+
+
+class _Request:
+    __slots__ = ('inputs', 'future', 'submitted')
+
+    def __init__(self, inputs):
+        self.inputs = inputs
+        self.future = Future()
+        self.submitted = time.perf_counter()
+
+
+class BatchingInferenceServer:
+    """
+    Micro-batching front end for a model's forward pass.
+
+    Callers submit one or more samples from any thread. A worker thread takes
+    the first pending request, then waits up to ``max_wait`` seconds for more
+    until ``max_batch_size`` rows are queued. It stacks them into one array,
+    runs a single forward pass and hands each caller back its own slice of the
+    output. Requests whose sample shapes differ are run in separate passes.
+
+    Args:
+        predict_fn (callable): Maps a (batch, ...) array to a (batch, ...) array.
+        max_batch_size (int): Rows per forward pass before the batch is cut.
+        max_wait (float): Seconds to hold the first request open for others.
+        name (str): Used for the worker thread name and logging.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=64, max_wait=0.002, name='model'):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1.")
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.name = name
+
+        self._queue = queue.Queue()
+        self._stopped = False
+        self._stats_lock = threading.Lock()
+        self._latencies = deque(maxlen=1000)
+        self._requests = 0
+        self._rows = 0
+        self._batches = 0
+        self._busy_time = 0.0
+        self._started = time.perf_counter()
+
+        self._thread = threading.Thread(target=self._run, name=f"inference-{name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, inputs):
+        """
+        Queue ``inputs`` (shape (n, ...) with n >= 1) for the next batch.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the (n, ...) model output.
+        """
+        if self._stopped:
+            raise RuntimeError(f"Inference server '{self.name}' is stopped.")
+        inputs = np.asarray(inputs, dtype=np.float32)
+        if inputs.ndim == 0 or len(inputs) == 0:
+            raise ValueError("Inference input must contain at least one sample.")
+        request = _Request(inputs)
+        self._queue.put(request)
+        return request.future
+
+    def predict(self, inputs, timeout=None):
+        """Blocking ``submit``: returns the model output for ``inputs``."""
+        return self.submit(inputs).result(timeout)
+
+    def _collect(self, first):
+        batch, rows = [first], len(first.inputs)
+        deadline = time.perf_counter() + self.max_wait
+        while rows < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                self._queue.put(None)  # let _run see the stop marker after this batch
+                break
+            batch.append(request)
+            rows += len(request.inputs)
+        return batch
+
+    def _run_group(self, group):
+        inputs = group[0].inputs if len(group) == 1 else np.concatenate([r.inputs for r in group])
+        began = time.perf_counter()
+        try:
+            outputs = self.predict_fn(inputs)
+        except Exception as e:
+            logger.error("Batched inference on %s failed: %s", self.name, e)
+            for request in group:
+                request.future.set_exception(e)
+            return
+        finished = time.perf_counter()
+
+        offset = 0
+        for request in group:
+            n = len(request.inputs)
+            request.future.set_result(outputs[offset:offset + n])
+            offset += n
+
+        with self._stats_lock:
+            self._batches += 1
+            self._requests += len(group)
+            self._rows += len(inputs)
+            self._busy_time += finished - began
+            self._latencies.extend(finished - r.submitted for r in group)
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                break
+            groups = {}
+            for request in self._collect(first):
+                groups.setdefault(request.inputs.shape[1:], []).append(request)
+            for group in groups.values():
+                self._run_group(group)
+
+    def metrics(self):
+        with self._stats_lock:
+            latencies = np.asarray(self._latencies) * 1000 if self._latencies else np.zeros(1)
+            elapsed = time.perf_counter() - self._started
+            return {
+                'name': self.name,
+                'queue_depth': self._queue.qsize(),
+                'requests': self._requests,
+                'rows': self._rows,
+                'batches': self._batches,
+                'avg_batch_size': self._rows / self._batches if self._batches else 0.0,
+                'latency_ms_p50': float(np.percentile(latencies, 50)),
+                'latency_ms_p95': float(np.percentile(latencies, 95)),
+                'latency_ms_max': float(latencies.max()),
+                'rows_per_second': self._rows / elapsed if elapsed > 0 else 0.0,
+                'busy_fraction': self._busy_time / elapsed if elapsed > 0 else 0.0,
+            }
+
+    def stop(self, timeout=5.0):
+        """Finish queued requests, then stop the worker thread."""
+        if not self._stopped:
+            self._stopped = True
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+_servers = {}
+_servers_lock = threading.Lock()
+
+
+def get_inference_server(model, **kwargs):
+    """
+    Return the batching server for a Keras ``model``, starting it on first use.
+
+    Every caller that shares a model object shares its server, so concurrent
+    predictions for different symbols or routes are batched together. The
+    server stops when the model is garbage collected.
+    """
+    key = id(model)
+    with _servers_lock:
+        server = _servers.get(key)
+        if server is None:
+            server = BatchingInferenceServer(keras_predict_fn(model), name=getattr(model, 'name', 'model'), **kwargs)
+            _servers[key] = server
+            weakref.finalize(model, _release_server, key)
+        return server
+
+
+def _release_server(key):
+    with _servers_lock:
+        server = _servers.pop(key, None)
+    if server is not None:
+        server.stop(timeout=0)
@@ -4,6 +4,9 @@ from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import Input, LSTM, Dense, Dropout
 import logging
 
+from .inference_server import get_inference_server
+from .windowing import as_feature_array, sliding_windows
+
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.DEBUG)
 
@@ -25,20 +28,13 @@ class LSTMTradingModel:
         return model
 
     def _clean_input(self, data):
-        if isinstance(data, pd.DataFrame):
-            data = data.select_dtypes(include=[np.number])
-
-        data = np.asarray(data).astype(np.float32)
+        data = as_feature_array(data)
 
         if data.ndim == 2:
             if data.shape[0] < self.time_steps:
                 raise ValueError(f"Input has {data.shape[0]} rows, which is less than time_steps={self.time_steps}.")
             try:
-                data = np.array([
-                    data[i:i + self.time_steps]
-                    for i in range(len(data) - self.time_steps + 1)
-                ])
-                data = data.reshape((data.shape[0], self.time_steps, self.n_features))
+                data = sliding_windows(data, self.time_steps, self.n_features, contiguous=True)
             except Exception as e:
                 logger.error("Failed reshaping data in _clean_input: %s", str(e))
                 raise
@@ -56,14 +52,9 @@ class LSTMTradingModel:
         return self.model.fit(x_train, y_train, epochs=epochs, batch_size=batch_size, verbose=1)
 
     def predict(self, x_input):
+        """One prediction per window: (samples,) for 3D input, or per sliding window of 2D rows."""
         x_input = self._clean_input(x_input)
         logger.info(f"Predicting on input shape: {x_input.shape}")
-        pred = self.model.predict(x_input, verbose=0)
+        pred = get_inference_server(self.model).predict(x_input)
         logger.debug(f"Raw prediction output shape: {pred.shape}, type: {type(pred)}")
-        
-        if isinstance(pred, np.ndarray) and pred.ndim == 2 and pred.shape[1] == 1:
-            return float(pred[0][0])
-        elif isinstance(pred, np.ndarray):
-            return float(pred[0])
-        else:
-            return float(pred)
\ No newline at end of file
+        return np.asarray(pred, dtype=np.float64).reshape(len(x_input), -1)[:, 0]
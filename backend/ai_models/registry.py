@@ -0,0 +1,183 @@
+# backend/ai_models/registry.py
+
+import logging
+import os
+import threading
+
+import numpy as np
+
+from .inference_server import get_inference_server
+
+logger = logging.getLogger(__name__)
+
+MODEL_DIR = os.getenv('MODEL_DIR', os.path.join(os.getcwd(), 'models'))
+
+MODEL_ALIASES = {
+    'REINFORCEMENTLEARNING': 'REINFORCEMENT',
+    'NN': 'NEURALNETWORK',
+    'RLTRADING': 'RL',
+}
+
+
+# -------- BUILDERS --------
+# Imported inside each builder so only the model types actually used pull in their modules.
+def _build_lstm(time_steps, n_features):
+    from .lstm_model import LSTMTradingModel
+    return LSTMTradingModel(time_steps, n_features)
+
+
+def _build_gru(time_steps, n_features):
+    from .gru_model import GRUTradingModel
+    return GRUTradingModel(time_steps, n_features)
+
+
+def _build_transformer(time_steps, n_features):
+    from .transformer_model import TransformerTradingModel
+    return TransformerTradingModel(time_steps, n_features)
+
+
+def _build_reinforcement(time_steps, n_features):
+    from .reinforcement_learning import ReinforcementLearning
+    return ReinforcementLearning(None, None, time_steps=time_steps, n_features=n_features)
+
+
+def _build_neural_network(time_steps, n_features):
+    from .neural_network import NeuralNetwork
+    return NeuralNetwork(input_dim=n_features, output_dim=1)
+
+
+def _build_rl(time_steps, n_features):
+    from .rl_model import RLTradingModel
+    # Tabular model over discrete states; the window shape does not size it
+    return RLTradingModel(state_size=100, action_size=3)
+
+
+DEFAULT_BUILDERS = {
+    'LSTM': _build_lstm,
+    'GRU': _build_gru,
+    'TRANSFORMER': _build_transformer,
+    'REINFORCEMENT': _build_reinforcement,
+    'NEURALNETWORK': _build_neural_network,
+    'RL': _build_rl,
+}
+
+
+def normalize_model_type(model_type):
+    model_type = model_type.strip().upper().replace('_', '').replace('-', '')
+    return MODEL_ALIASES.get(model_type, model_type)
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of built, warmed model instances.
+
+    Models are keyed by (type, time_steps, n_features, version) and built once.
+    If ``model_dir`` holds saved weights for that key they are loaded. The new
+    model then makes one dummy forward pass through its inference server, so
+    the compiled graph is ready before the first real request. Every caller
+    asking for the same key gets the same instance.
+    Different keys build in parallel. Concurrent requests for one key wait for
+    a single build.
+    """
+
+    def __init__(self, builders=None, model_dir=MODEL_DIR):
+        self.builders = dict(DEFAULT_BUILDERS if builders is None else builders)
+        self.model_dir = model_dir
+        self._models = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def register(self, model_type, builder):
+        """Add or replace the builder for ``model_type``; ``builder(time_steps, n_features)`` returns a model."""
+        self.builders[normalize_model_type(model_type)] = builder
+
+    def key(self, model_type, time_steps=60, n_features=1, version='latest'):
+        return normalize_model_type(model_type), int(time_steps), int(n_features), str(version)
+
+    def weights_path(self, key):
+        model_type, time_steps, n_features, version = key
+        return os.path.join(self.model_dir, f"{model_type.lower()}-t{time_steps}-f{n_features}-{version}.weights.h5")
+
+    def get(self, model_type, time_steps=60, n_features=1, version='latest', warm=True):
+        """
+        Return the shared model for this key, building (and warming) it on first use.
+
+        Raises:
+            ValueError: If no builder is registered for ``model_type``.
+        """
+        key = self.key(model_type, time_steps, n_features, version)
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        if key[0] not in self.builders:
+            raise ValueError(f"Unknown model type: {model_type}")
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            model = self._models.get(key)
+            if model is None:
+                model = self._build(key, warm)
+                self._models[key] = model
+        return model
+
+    def _build(self, key, warm):
+        model_type, time_steps, n_features, version = key
+        logger.info("Building %s model (time_steps=%d, n_features=%d, version=%s)",
+                    model_type, time_steps, n_features, version)
+        model = self.builders[model_type](time_steps, n_features)
+
+        keras_model = getattr(model, 'model', None)
+        path = self.weights_path(key)
+        if keras_model is not None and hasattr(keras_model, 'load_weights') and os.path.exists(path):
+            keras_model.load_weights(path)
+            logger.info("Loaded weights from %s", path)
+        if warm:
+            self.warm(model)
+        return model
+
+    def warm(self, model):
+        """Run one dummy forward pass so graph tracing happens now rather than on the first request."""
+        keras_model = getattr(model, 'model', None)
+        input_shape = getattr(keras_model, 'input_shape', None)
+        if not isinstance(input_shape, tuple) or None in input_shape[1:]:
+            return
+        try:
+            get_inference_server(keras_model).predict(np.zeros((1,) + input_shape[1:], dtype=np.float32))
+        except Exception as e:
+            logger.warning("Warm-up of %s failed: %s", type(model).__name__, e)
+
+    def save(self, model_type, time_steps=60, n_features=1, version='latest'):
+        """Persist the shared model's weights so later processes load instead of starting untrained."""
+        key = self.key(model_type, time_steps, n_features, version)
+        model = self._models.get(key)
+        if model is None:
+            raise KeyError(f"Model {key} is not loaded.")
+        path = self.weights_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        model.model.save_weights(path)
+        return path
+
+    def preload(self, specs):
+        """Build and warm several models at startup. ``specs`` holds dicts of ``get`` arguments."""
+        return [self.get(**spec) for spec in specs]
+
+    def loaded(self):
+        return list(self._models)
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+            self._key_locks.clear()
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry():
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
@@ -1,32 +1,42 @@
 import numpy as np
 import random
-from collections import deque
 from sklearn.preprocessing import StandardScaler
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import Dense, Dropout
 import logging
 
 from .base import BaseTradingModel
+from .inference_server import get_inference_server
+from .replay import DQNReplay, ReplayBuffer
 from backend.core.status_manager import StatusManager  # Fixed import
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 class ReinforcementLearning(BaseTradingModel):
-    def __init__(self, api_key, api_secret, time_steps=10, n_features=10):
+    def __init__(self, api_key, api_secret, time_steps=10, n_features=10,
+                 target_update_interval=None, prioritized_replay=False,
+                 memory_size=2000, memory_path=None):
         self.api_key = api_key
         self.api_secret = api_secret
         self.time_steps = time_steps
         self.n_features = n_features
         self.scaler = StandardScaler()
         self.model = self.build_model()
-        self.memory = deque(maxlen=2000)
+        # train_model walks the data with a stride, so consecutive transitions never share a state row
+        # and each one takes two; twice the rows keeps memory_size transitions, as the deque did
+        self.memory = ReplayBuffer(2 * memory_size, self.n_features * self.time_steps, path=memory_path)
         self.gamma = 0.95
         self.epsilon = 1.0
         self.epsilon_min = 0.01
         self.epsilon_decay = 0.995
         self.batch_size = 32
         self.status_manager = StatusManager(confidence_threshold=0.85)
+        self.replay_engine = DQNReplay(
+            self.model, state_dim=self.n_features * self.time_steps, batch_size=self.batch_size,
+            gamma=self.gamma, target_update_interval=target_update_interval,
+            prioritized=prioritized_replay,
+        )
 
     def build_model(self):
         model = Sequential([
@@ -42,7 +52,7 @@ class ReinforcementLearning(BaseTradingModel):
     def predict(self, state):
         try:
             state = self.scaler.transform(state.reshape(1, -1))
-            pred = self.model.predict(state, verbose=0)
+            pred = get_inference_server(self.model).predict(state)
             logger.debug(f"Prediction shape: {pred.shape}, content: {pred}")
             if isinstance(pred, np.ndarray):
                 return float(pred[0][0]) if pred.ndim == 2 else float(pred[0])
@@ -61,22 +71,21 @@ class ReinforcementLearning(BaseTradingModel):
         return 2 if prediction > 0.5 else 0  # Example decision logic
 
     def remember(self, state, action, reward, next_state, done):
-        self.memory.append((state, action, reward, next_state, done))
+        self.memory.add(state, action, reward, next_state, done)
 
     def replay(self):
+        """
+        One vectorized DQN update over a sampled minibatch.
+
+        Stored states are already scaled (``train_model`` scales the data before
+        windowing), so they are fed to the network as they are.
+        """
         if len(self.memory) < self.batch_size:
             return
-        minibatch = random.sample(self.memory, self.batch_size)
-        for state, action, reward, next_state, done in minibatch:
-            try:
-                target = reward
-                if not done:
-                    next_state_scaled = self.scaler.transform(next_state.reshape(1, -1))
-                    target += self.gamma * self.model.predict(next_state_scaled, verbose=0)[0][0]
-                state_scaled = self.scaler.transform(state.reshape(1, -1))
-                self.model.fit(state_scaled, np.array([target]), epochs=1, verbose=0)
-            except Exception as e:
-                logger.error(f"Replay step failed: {e}")
+        try:
+            self.replay_engine.step(self.memory)
+        except Exception as e:
+            logger.error(f"Replay step failed: {e}")
         if self.epsilon > self.epsilon_min:
             self.epsilon *= self.epsilon_decay
 
@@ -0,0 +1,237 @@
+# backend/ai_models/replay.py
+
+import logging
+import os
+
+import numpy as np
+
+from .inference_server import keras_predict_fn
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayBuffer:
+    """
+    Preallocated circular replay memory backed by NumPy arrays.
+
+    Rows of ``states`` hold one observation each. A transition stored at row
+    ``i`` starts from ``states[i]`` and its next state is ``states[i + 1]``
+    (modulo capacity), so consecutive transitions where one's ``next_state``
+    is the next one's ``state`` share a row. When they do not chain (the
+    next ``state`` differs, e.g. across an episode boundary or a strided
+    walk over history), the old next state is kept as a row of its own that
+    no transition starts from. A chained trajectory costs one row per
+    transition, any other stream at most two. States are stored as float32.
+
+    Sampling draws uniform row indices and redraws the few that do not start a
+    live transition, so its cost depends on the batch size, not the capacity.
+
+    Args:
+        capacity (int): Rows of state storage (at least 2).
+        state_dim (int): Flattened state size.
+        path (str): If set, ``states`` is a memory-mapped ``states.npy`` in this
+            directory, so buffers larger than RAM page in on demand.
+        dtype: State storage dtype.
+    """
+
+    def __init__(self, capacity, state_dim, path=None, dtype=np.float32):
+        if capacity < 2:
+            raise ValueError("ReplayBuffer capacity must be at least 2.")
+        self.capacity = int(capacity)
+        self.state_dim = int(state_dim)
+        self.path = path
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+            self.states = np.lib.format.open_memmap(os.path.join(path, 'states.npy'), mode='w+',
+                                                    dtype=dtype, shape=(self.capacity, self.state_dim))
+        else:
+            self.states = np.zeros((self.capacity, self.state_dim), dtype=dtype)
+        self.actions = np.zeros(self.capacity, dtype=np.int32)
+        self.rewards = np.zeros(self.capacity, dtype=np.float32)
+        self.dones = np.zeros(self.capacity, dtype=bool)
+        self.valid = np.zeros(self.capacity, dtype=bool)  # row starts a live transition
+        self.priorities = np.zeros(self.capacity, dtype=np.float64)
+        self.max_priority = 1.0
+
+        self._filled = 0       # rows written so far, up to capacity
+        self._count = 0        # live transitions
+        self._next_row = None  # row holding the last transition's next state
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def maxlen(self):
+        return self.capacity
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.states, self.actions, self.rewards, self.dones,
+                                      self.valid, self.priorities))
+
+    def _claim(self, row, state):
+        if self.valid[row]:
+            self.valid[row] = False
+            self._count -= 1
+        self.states[row] = state
+        self._filled = max(self._filled, row + 1)
+
+    def add(self, state, action, reward, next_state, done):
+        """Store one transition; once full, the oldest transitions are overwritten."""
+        state = np.ravel(state).astype(self.states.dtype, copy=False)
+        pending = self._next_row
+        if pending is not None and np.array_equal(self.states[pending], state):
+            row = pending
+        else:
+            row = 0 if pending is None else (pending + 1) % self.capacity
+            self._claim(row, state)
+        self.actions[row] = action
+        self.rewards[row] = reward
+        self.dones[row] = done
+        self.priorities[row] = self.max_priority
+        self.valid[row] = True
+        self._count += 1
+
+        self._next_row = (row + 1) % self.capacity
+        self._claim(self._next_row, np.ravel(next_state))
+
+    def append(self, transition):
+        """``deque``-style alias taking a (state, action, reward, next_state, done) tuple."""
+        self.add(*transition)
+
+    def sample(self, batch_size, rng):
+        """Uniformly sample ``batch_size`` transition rows (with replacement)."""
+        if self._count == 0:
+            raise ValueError("Cannot sample from an empty ReplayBuffer.")
+        indices = rng.integers(0, self._filled, batch_size)
+        missing = ~self.valid[indices]
+        while missing.any():
+            indices[missing] = rng.integers(0, self._filled, int(missing.sum()))
+            missing = ~self.valid[indices]
+        return indices
+
+    def sample_prioritized(self, batch_size, rng, alpha=0.6, beta=0.4):
+        """
+        Sample rows in proportion to ``priority ** alpha``.
+
+        Returns:
+            tuple: (indices, importance-sampling weights normalised to a max of 1).
+        """
+        scaled = np.where(self.valid[:self._filled], self.priorities[:self._filled], 0.0) ** alpha
+        cumulative = np.cumsum(scaled)
+        total = cumulative[-1]
+        indices = np.searchsorted(cumulative, rng.random(batch_size) * total, side='right')
+        indices = np.minimum(indices, self._filled - 1)
+        weights = (self._count * scaled[indices] / total) ** -beta
+        return indices, (weights / weights.max()).astype(np.float32)
+
+    def update_priorities(self, indices, priorities):
+        self.priorities[indices] = priorities
+        self.max_priority = max(self.max_priority, float(np.max(priorities)))
+
+    def gather(self, indices, states, next_states, rewards, not_done):
+        """Copy the transitions at ``indices`` into caller-owned minibatch arrays."""
+        np.take(self.states, indices, axis=0, out=states)
+        np.take(self.states, (indices + 1) % self.capacity, axis=0, out=next_states)
+        np.take(self.rewards, indices, out=rewards)
+        np.subtract(1.0, self.dones[indices], out=not_done)
+
+    def transition(self, index):
+        """The (state, action, reward, next_state, done) tuple stored at row ``index``."""
+        if not self.valid[index]:
+            raise IndexError(f"Row {index} does not hold a transition.")
+        return (self.states[index], int(self.actions[index]), float(self.rewards[index]),
+                self.states[(index + 1) % self.capacity], bool(self.dones[index]))
+
+    def flush(self):
+        """Write a memory-mapped buffer's states to disk."""
+        if isinstance(self.states, np.memmap):
+            self.states.flush()
+
+
+class DQNReplay:
+    """
+    Vectorized experience replay for a Keras value network.
+
+    Each ``step`` samples a minibatch into preallocated arrays, computes
+    every bootstrap target with a single batched forward pass, and makes a
+    single ``train_on_batch`` call. The per-sample loop made 2 Keras calls for
+    every sample.
+
+    Args:
+        model: Online Keras model mapping (batch, state_dim) to (batch, 1) values.
+        state_dim (int): Flattened state size.
+        batch_size (int): Transitions per update.
+        gamma (float): Discount factor.
+        target_update_interval (int): If set, bootstrap from a frozen copy of
+            ``model`` whose weights are synced every this many steps.
+        prioritized (bool): Sample transitions in proportion to their last TD
+            error (proportional prioritized replay, priorities kept by the
+            ``ReplayBuffer``) and correct the bias with importance-sampling weights.
+        alpha (float): How strongly priorities skew sampling (0 = uniform).
+        beta (float): Importance-sampling correction strength (1 = full).
+        seed (int): Seed for the sampling RNG.
+    """
+
+    def __init__(self, model, state_dim, batch_size=32, gamma=0.95, target_update_interval=None,
+                 prioritized=False, alpha=0.6, beta=0.4, priority_eps=1e-3, seed=None):
+        self.model = model
+        self.state_dim = state_dim
+        self.batch_size = batch_size
+        self.gamma = gamma
+        self.prioritized = prioritized
+        self.alpha = alpha
+        self.beta = beta
+        self.priority_eps = priority_eps
+        self.rng = np.random.default_rng(seed)
+        self.steps = 0
+
+        self.target_update_interval = target_update_interval
+        self.target_model = None
+        if target_update_interval:
+            from tensorflow.keras.models import clone_model
+            self.target_model = clone_model(model)
+            self.target_model.set_weights(model.get_weights())
+        self._forward = keras_predict_fn(model)
+        self._target_forward = keras_predict_fn(self.target_model) if self.target_model is not None else self._forward
+
+        # Minibatch arrays are reused every step
+        self._states = np.empty((batch_size, state_dim), dtype=np.float32)
+        self._next_states = np.empty((batch_size, state_dim), dtype=np.float32)
+        self._rewards = np.empty(batch_size, dtype=np.float32)
+        self._not_done = np.empty(batch_size, dtype=np.float32)
+
+    def _sample(self, memory):
+        if self.prioritized:
+            indices, weights = memory.sample_prioritized(self.batch_size, self.rng, self.alpha, self.beta)
+        else:
+            indices, weights = memory.sample(self.batch_size, self.rng), None
+        memory.gather(indices, self._states, self._next_states, self._rewards, self._not_done)
+        return indices, weights
+
+    def step(self, memory):
+        """
+        One minibatch update from the ``ReplayBuffer`` ``memory``.
+
+        Returns:
+            float | None: Training loss, or None when memory is smaller than a batch.
+        """
+        size = len(memory)
+        if size < self.batch_size:
+            return None
+
+        indices, weights = self._sample(memory)
+
+        next_values = np.asarray(self._target_forward(self._next_states)).reshape(-1)
+        targets = self._rewards + self.gamma * self._not_done * next_values
+
+        if self.prioritized:
+            td_errors = targets - np.asarray(self._forward(self._states)).reshape(-1)
+            memory.update_priorities(indices, np.abs(td_errors) + self.priority_eps)
+
+        loss = self.model.train_on_batch(self._states, targets.reshape(-1, 1), sample_weight=weights)
+
+        self.steps += 1
+        if self.target_model is not None and self.steps % self.target_update_interval == 0:
+            self.target_model.set_weights(self.model.get_weights())
+        return float(np.ravel(loss)[0])
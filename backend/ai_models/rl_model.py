@@ -2,9 +2,90 @@ import numpy as np
 import random
 import logging
 
+from backend.data.indicators import rolling_mean
+
 logger = logging.getLogger(__name__)
 
+# Actions as in ReinforcementLearning: 0 sells (short), 1 holds (flat), 2 buys (long)
+ACTION_POSITIONS = np.array([-1.0, 0.0, 1.0])
+HOLD_ACTION = 1
+
+
+# -------- STATE DISCRETIZATION --------
+def ohlcv_features(values, window=20):
+    """
+    Per-candle features for tabular RL from (rows, 5) OHLCV ``values``.
+
+    Columns are the one-candle return, the close relative to its ``window``
+    SMA, the high-low range relative to the close, and volume relative to
+    its ``window`` average. The first ``window`` rows are NaN (warm-up).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    high, low, close, volume = values[:, 1], values[:, 2], values[:, 3], values[:, 4]
+    features = np.full((len(values), 4), np.nan)
+    features[1:, 0] = close[1:] / close[:-1] - 1.0
+    features[:, 1] = close / rolling_mean(close, window) - 1.0
+    features[:, 2] = (high - low) / close
+    with np.errstate(divide='ignore', invalid='ignore'):
+        features[:, 3] = volume / rolling_mean(volume, window)
+    features[:window] = np.nan
+    return features
+
+
+class StateDiscretizer:
+    """
+    Maps feature rows to Q-table state indices, all rows in one call.
+
+    ``fit`` places ``n_bins - 1`` quantile edges per feature, so each bin is
+    equally populated on the training data. ``transform`` finds every row's
+    bin per feature with ``np.searchsorted`` and packs the bins into one
+    index in base ``n_bins``. There are ``n_bins ** n_features`` states.
+    """
+
+    def __init__(self, n_bins=5):
+        self.n_bins = n_bins
+        self.edges = None
+
+    @property
+    def fitted(self):
+        return self.edges is not None
+
+    @property
+    def n_states(self):
+        return self.n_bins ** len(self.edges)
+
+    def fit(self, features):
+        features = np.asarray(features, dtype=np.float64)
+        features = features[~np.isnan(features).any(axis=1)]
+        if not len(features):
+            raise ValueError("No complete feature rows to fit the discretizer on.")
+        quantiles = np.linspace(0, 1, self.n_bins + 1)[1:-1]
+        self.edges = [np.quantile(features[:, k], quantiles) for k in range(features.shape[1])]
+        return self
+
+    def transform(self, features):
+        """int64 state index per row; rows containing NaN map to state 0."""
+        features = np.atleast_2d(np.asarray(features, dtype=np.float64))
+        states = np.zeros(len(features), dtype=np.int64)
+        for k in reversed(range(len(self.edges))):
+            states = states * self.n_bins + np.searchsorted(self.edges[k], features[:, k], side='right')
+        states[np.isnan(features).any(axis=1)] = 0
+        return states
+
+
+# -------- MODEL --------
 class RLTradingModel:
+    """
+    Tabular Q-learning over discrete market states.
+
+    The Q-table lives in a preallocated array whose capacity doubles when a
+    state index beyond it appears, so growth costs amortized O(1) per state.
+    ``q_table`` is the used part of it. ``choose_action`` and ``learn``
+    handle one transition. ``choose_actions`` and ``learn_batch`` handle
+    thousands per NumPy call, and ``train_on_candles`` uses them to train
+    on OHLCV history.
+    """
+
     def __init__(
         self,
         state_size,
@@ -13,7 +94,8 @@ class RLTradingModel:
         discount_factor=0.95,
         exploration_rate=1.0,
         exploration_decay=0.995,
-        exploration_min=0.01
+        exploration_min=0.01,
+        discretizer=None
     ):
         self.state_size = state_size
         self.action_size = action_size
@@ -22,14 +104,31 @@ class RLTradingModel:
         self.exploration_rate = exploration_rate
         self.exploration_decay = exploration_decay
         self.exploration_min = exploration_min
-        self.q_table = np.zeros((state_size, action_size))
+        self.discretizer = discretizer
+        self._q = np.zeros((state_size, action_size))
+        self._n_states = state_size
         logger.info("Initialized RLTradingModel with state_size=%d, action_size=%d", state_size, action_size)
 
+    @property
+    def q_table(self):
+        return self._q[:self._n_states]
+
+    @q_table.setter
+    def q_table(self, table):
+        self._q = np.array(table, dtype=np.float64)
+        self._n_states = len(self._q)
+
     def _validate_state(self, state):
-        if state >= self.q_table.shape[0]:
-            extra_rows = state - self.q_table.shape[0] + 1
-            logger.debug("Expanding Q-table by %d rows for new state: %d", extra_rows, state)
-            self.q_table = np.vstack([self.q_table, np.zeros((extra_rows, self.action_size))])
+        """Make room for state indices up to ``state`` (an int or the max of a batch)."""
+        state = int(state)
+        if state >= self._n_states:
+            if state >= len(self._q):
+                capacity = max(state + 1, 2 * len(self._q))
+                logger.debug("Growing Q-table capacity to %d rows for new state: %d", capacity, state)
+                grown = np.zeros((capacity, self.action_size))
+                grown[:self._n_states] = self._q[:self._n_states]
+                self._q = grown
+            self._n_states = state + 1
 
     def choose_action(self, state):
         self._validate_state(state)
@@ -37,18 +136,17 @@ class RLTradingModel:
             action = random.randint(0, self.action_size - 1)
             logger.debug("Exploration: chose random action %d", action)
         else:
-            action = int(np.argmax(self.q_table[state]))
+            action = int(self._greedy(self._q[state]))
             logger.debug("Exploitation: chose best action %d", action)
         return action
 
     def learn(self, state, action, reward, next_state):
-        self._validate_state(state)
-        self._validate_state(next_state)
+        self._validate_state(max(state, next_state))
 
-        best_next_action = np.argmax(self.q_table[next_state])
-        td_target = reward + self.discount_factor * self.q_table[next_state][best_next_action]
-        td_error = td_target - self.q_table[state][action]
-        self.q_table[state][action] += self.learning_rate * td_error
+        best_next_action = np.argmax(self._q[next_state])
+        td_target = reward + self.discount_factor * self._q[next_state][best_next_action]
+        td_error = td_target - self._q[state][action]
+        self._q[state][action] += self.learning_rate * td_error
 
         logger.debug(
             "Updated Q-table at state=%d, action=%d | Reward=%.4f, TD Error=%.4f",
@@ -56,8 +154,108 @@ class RLTradingModel:
         )
         self._decay_exploration()
 
+    def _greedy(self, q):
+        """Best action per Q row; ties that include HOLD_ACTION go to it, so a never-updated state holds."""
+        actions = np.argmax(q, axis=-1)
+        if self.action_size > HOLD_ACTION:
+            actions = np.where(q[..., HOLD_ACTION] == q.max(axis=-1), HOLD_ACTION, actions)
+        return actions
+
+    # -------- BATCHED --------
+    def choose_actions(self, states, rng=None, explore=True):
+        """Epsilon-greedy actions for an array of states."""
+        states = np.asarray(states, dtype=np.int64)
+        if len(states):
+            self._validate_state(states.max())
+        actions = self._greedy(self._q[states])
+        if explore and self.exploration_rate > 0:
+            rng = rng or np.random.default_rng()
+            explore_mask = rng.random(len(states)) < self.exploration_rate
+            actions[explore_mask] = rng.integers(0, self.action_size, explore_mask.sum())
+        return actions
+
+    def learn_batch(self, states, actions, rewards, next_states, dones=None):
+        """
+        One Q-learning step for a batch of transitions.
+
+        TD targets are taken from the table as it was before the batch.
+        Transitions that share a (state, action) pair have their TD errors
+        averaged, so a pair seen k times moves by ``learning_rate`` times its
+        mean error instead of k steps. Exploration decays once per batch;
+        decaying once per transition would use up the whole schedule within
+        the first few thousand-candle batches.
+
+        Returns:
+            float: Mean absolute TD error of the batch.
+        """
+        states = np.asarray(states, dtype=np.int64)
+        actions = np.asarray(actions, dtype=np.int64)
+        next_states = np.asarray(next_states, dtype=np.int64)
+        if not len(states):
+            return 0.0
+        self._validate_state(max(states.max(), next_states.max()))
+
+        bootstrap = self.discount_factor * self._q[next_states].max(axis=1)
+        if dones is not None:
+            bootstrap = np.where(dones, 0.0, bootstrap)
+        td_errors = np.asarray(rewards, dtype=np.float64) + bootstrap - self._q[states, actions]
+
+        pairs, inverse = np.unique(states * self.action_size + actions, return_inverse=True)
+        mean_errors = np.bincount(inverse, weights=td_errors) / np.bincount(inverse)
+        self._q.reshape(-1)[pairs] += self.learning_rate * mean_errors
+
+        self._decay_exploration()
+        return float(np.abs(td_errors).mean())
+
+    def train_on_candles(self, values, epochs=10, batch_size=4096, fee_rate=0.001, seed=None):
+        """
+        Train on (rows, 5) OHLCV history.
+
+        The action at a candle sets the position held to the next close (see
+        ACTION_POSITIONS). The reward is that position's return, less
+        ``fee_rate`` when it differs from the previous candle's greedy
+        position. States come from ``ohlcv_features`` through the discretizer,
+        which is fitted here on first use.
+
+        Returns:
+            list: Mean absolute TD error per epoch.
+        """
+        features = ohlcv_features(values)
+        valid = ~np.isnan(features).any(axis=1)
+        if self.discretizer is None:
+            self.discretizer = StateDiscretizer()
+        if not self.discretizer.fitted:
+            self.discretizer.fit(features[valid])
+        self._validate_state(self.discretizer.n_states - 1)
+
+        rows = np.flatnonzero(valid[:-1] & valid[1:])
+        states = self.discretizer.transform(features)
+        close = np.asarray(values, dtype=np.float64)[:, 3]
+        returns = close[1:] / close[:-1] - 1.0
+
+        rng = np.random.default_rng(seed)
+        history = []
+        for epoch in range(epochs):
+            errors = []
+            for lo in range(0, len(rows), batch_size):
+                t = rows[lo:lo + batch_size]
+                actions = self.choose_actions(states[t], rng)
+                previous = ACTION_POSITIONS[self.choose_actions(states[t - 1], explore=False)]
+                positions = ACTION_POSITIONS[actions]
+                rewards = positions * returns[t] - fee_rate * np.abs(positions - previous)
+                errors.append(self.learn_batch(states[t], actions, rewards, states[t + 1]))
+            history.append(float(np.mean(errors)) if errors else 0.0)
+            logger.info("RL epoch %d/%d: mean |TD error| %.6f", epoch + 1, epochs, history[-1])
+        return history
+
+    def predict_candles(self, values):
+        """Greedy action for every candle of (rows, 5) OHLCV ``values``; needs a fitted discretizer."""
+        if self.discretizer is None or not self.discretizer.fitted:
+            raise ValueError("RLTradingModel has no fitted state discretizer; train it on candles first.")
+        return self.choose_actions(self.discretizer.transform(ohlcv_features(values)), explore=False)
+
     def _decay_exploration(self):
         if self.exploration_rate > self.exploration_min:
             self.exploration_rate *= self.exploration_decay
             self.exploration_rate = max(self.exploration_rate, self.exploration_min)
-            logger.debug("Decayed exploration rate to %.4f", self.exploration_rate)
\ No newline at end of file
+            logger.debug("Decayed exploration rate to %.4f", self.exploration_rate)
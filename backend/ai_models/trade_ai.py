@@ -1,9 +1,11 @@
 import logging
+import numpy as np
 import pandas as pd
 from backend.ai_models.lstm_model import LSTMTradingModel
 from backend.ai_models.gru_model import GRUTradingModel
 from backend.ai_models.transformer_model import TransformerTradingModel
 from backend.ai_models.rl_model import RLTradingModel
+from backend.ai_models.windowing import as_feature_array, sliding_windows
 
 logger = logging.getLogger(__name__)
 
@@ -36,13 +38,12 @@ class TradingAI:
                 logger.warning("Dropping datetime columns from input data: %s", datetime_cols)
             data = data.select_dtypes(exclude=['datetime64[ns]', 'datetime64'])
 
-        # Ensuring data is reshaped correctly (batch_size, time_steps, n_features)
-        data = np.array(data)
+        # Ensuring data is windowed correctly (batch_size, time_steps, n_features)
+        data = as_feature_array(data)
         if data.shape[0] < time_steps:
             logger.error("Not enough data points to reshape. Returning empty array.")
             return np.array([])  # Returning empty array if not enough data
-        reshaped_data = data.reshape((data.shape[0] - time_steps, time_steps, n_features))
-        return reshaped_data
+        return sliding_windows(data, time_steps, n_features, contiguous=True)
 
     def predict(self, data):
         data = self._prepare_input(data, self.model.time_steps, self.model.n_features)
@@ -2,13 +2,10 @@ import logging
 import pandas as pd
 import numpy as np
 
-from backend.ai_models.lstm_model import LSTMTradingModel
-from backend.ai_models.gru_model import GRUTradingModel
-from backend.ai_models.transformer_model import TransformerTradingModel
 from backend.ai_models.rl_model import RLTradingModel
-from backend.exchange_api import ExchangeClient  # Adjust to your client
+from backend.ai_models.registry import get_model_registry
+from backend.ai_models.windowing import as_feature_array, sliding_windows
 from backend.exchange.exchange_data import fetch_ohlcv_data as external_ohlcv_data  # Import external data fetch
-from sklearn.preprocessing import StandardScaler  # For scaling
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -23,26 +20,36 @@ class TradingAI:
         self.n_features = n_features
         self.use_external = use_external  # Flag to use external data source
         self.scale_data = scale_data  # Flag for scaling data
-        self.exchange = ExchangeClient(api_key, api_secret)
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self._exchange = None
         logger.info("Initializing TradingAI with model_type=%s", self.model_type)
         self.model = self._init_model(self.model_type, time_steps, n_features, api_key, api_secret)
-        self.scaler = StandardScaler() if scale_data else None  # Initialize scaler if required
+        self.scaler = None
+        if scale_data:
+            from sklearn.preprocessing import StandardScaler  # deferred: sklearn is slow to import
+            self.scaler = StandardScaler()
+
+    @property
+    def exchange(self):
+        """Exchange client, created on first trade so prediction-only users need no credentials."""
+        if self._exchange is None:
+            from backend.ai_models.exchange_api import ExchangeClient
+            self._exchange = ExchangeClient(self.api_key, self.api_secret)
+        return self._exchange
 
     def _init_model(self, model_type, time_steps, n_features, api_key, api_secret):
         """
-        Initialize the model based on the specified model type.
+        Fetch the shared, pre-warmed model for this configuration from the model registry.
         """
-        if model_type == 'LSTM':
-            return LSTMTradingModel(time_steps, n_features)
-        elif model_type == 'GRU':
-            return GRUTradingModel(time_steps, n_features)
-        elif model_type == 'TRANSFORMER':
-            return TransformerTradingModel(time_steps, n_features)
-        elif model_type in ['REINFORCEMENTLEARNING', 'REINFORCEMENT']:
-            return RLTradingModel(state_size=100, action_size=3)
-        else:
+        registry = get_model_registry()
+        if model_type in ['REINFORCEMENTLEARNING', 'REINFORCEMENT']:
+            return registry.get('RL', time_steps, n_features)
+        try:
+            return registry.get(model_type, time_steps, n_features)
+        except ValueError:
             logger.warning("Invalid model_type '%s'. Defaulting to LSTM.", model_type)
-            return LSTMTradingModel(time_steps, n_features)
+            return registry.get('LSTM', time_steps, n_features)
 
     def _prepare_input(self, data, time_steps, n_features):
         """
@@ -59,7 +66,7 @@ class TradingAI:
         if self.scaler:
             data = self.scaler.fit_transform(data)
 
-        data = np.asarray(data).astype(np.float32)
+        data = as_feature_array(data)
         original_len = len(data)
 
         if original_len < time_steps:
@@ -67,8 +74,7 @@ class TradingAI:
             return np.empty((0, time_steps, n_features))
 
         try:
-            reshaped_data = np.array([data[i:i + time_steps] for i in range(original_len - time_steps + 1)])
-            reshaped_data = reshaped_data.reshape((-1, time_steps, n_features))
+            reshaped_data = sliding_windows(data, time_steps, n_features, contiguous=True)
             logger.debug("Reshaped input to %s", reshaped_data.shape)
             return reshaped_data
         except Exception as e:
@@ -78,6 +84,9 @@ class TradingAI:
     def predict(self, data):
         """
         Predict the next market movement using the trained model.
+
+        Returns one prediction per ``time_steps`` window of ``data``, oldest
+        first, so ``len(data) - time_steps + 1`` values; None on failure.
         """
         if isinstance(self.model, RLTradingModel):
             logger.warning("Predict called on RLTradingModel. Returning dummy action.")
@@ -117,14 +126,28 @@ class TradingAI:
         except Exception as e:
             logger.error("Trade execution failed: %s", str(e))
 
-# Global instance (optional singleton)
-trading_ai_instance = TradingAI(model_type="LSTM", time_steps=60, n_features=1, use_external=False)
+# Global instance (optional singleton), built on first use rather than at import
+_trading_ai_instance = None
+
+
+def get_trading_ai():
+    global _trading_ai_instance
+    if _trading_ai_instance is None:
+        _trading_ai_instance = TradingAI(model_type="LSTM", time_steps=60, n_features=1, use_external=False)
+    return _trading_ai_instance
+
+
+def __getattr__(name):
+    if name == 'trading_ai_instance':
+        return get_trading_ai()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def run_trading_job():
     """
     Run the trading job by fetching market data, making predictions, and executing trades.
     """
     try:
+        trading_ai_instance = get_trading_ai()
         if trading_ai_instance.use_external:
             logger.info("Using external data for trading job.")
             df = external_ohlcv_data(symbol="BTCUSDT", interval="1m", limit=100)  # External data fetch
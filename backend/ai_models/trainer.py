@@ -13,10 +13,10 @@ def train_model(model, data, labels, epochs=10, batch_size=32):
 
     Parameters:
     - model: The trading model to train (LSTM, GRU, etc.)
-    - data: Input data for training
-    - labels: Labels (targets) for training
+    - data: Input data for training ((rows, 5) OHLCV candles for RLTradingModel)
+    - labels: Labels (targets) for training; ignored for RLTradingModel
     - epochs: Number of epochs to train
-    - batch_size: Batch size for training
+    - batch_size: Batch size for training; RLTradingModel keeps its own candle batch size
 
     Returns:
     - Trained model
@@ -36,20 +36,14 @@ def train_model(model, data, labels, epochs=10, batch_size=32):
         return model
 
     elif isinstance(model, RLTradingModel):
-        # In the case of reinforcement learning, training is handled differently
+        # Tabular Q-learning on the candles themselves; labels are not used
+        data = np.asarray(data, dtype=np.float64)
+        if data.ndim != 2 or data.shape[1] != 5:
+            raise ValueError(f"RLTradingModel trains on (rows, 5) OHLCV candles, got shape {data.shape}")
         print("Training Reinforcement Learning model...")
-
-        # Placeholder for RL model training (update with your RL logic)
-        for epoch in range(epochs):
-            # Simulate some environment and training loop for RL (this is just a dummy loop)
-            for state in range(100):  # Assuming 100 states as an example
-                action = model.choose_action(state)
-                reward = np.random.rand()  # Example reward (replace with real reward logic)
-                next_state = (state + 1) % 100
-                model.learn(state, action, reward, next_state)
-
+        model.train_on_candles(data, epochs=epochs)
         print(f"Reinforcement Learning model training complete.")
-        
+
         return model
 
     else:
@@ -3,6 +3,8 @@
 import tensorflow as tf
 from tensorflow.keras import layers, models
 
+from .inference_server import get_inference_server
+
 class TransformerTradingModel:
     def __init__(self, time_steps=60, d_model=64, n_heads=2, ff_dim=128):
         self.time_steps = time_steps
@@ -31,4 +33,4 @@ class TransformerTradingModel:
         return self.model.fit(x_train, y_train, epochs=epochs, batch_size=batch_size)
 
     def predict(self, x_input):
-        return self.model.predict(x_input)
\ No newline at end of file
+        return get_inference_server(self.model).predict(x_input)
\ No newline at end of file
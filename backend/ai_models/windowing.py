@@ -0,0 +1,56 @@
+# backend/ai_models/windowing.py
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def as_feature_array(data, dtype=np.float32):
+    """
+    Convert model input (DataFrame, list or ndarray) to a numeric ndarray.
+
+    Datetime and other non-numeric DataFrame columns are dropped. No copy is
+    made when ``data`` is already an ndarray of the requested dtype.
+    """
+    if isinstance(data, pd.DataFrame):
+        data = data.select_dtypes(include=[np.number]).to_numpy()
+    return np.asarray(data, dtype=dtype)
+
+
+def sliding_windows(data, time_steps, n_features=None, contiguous=False, dtype=np.float32):
+    """
+    Build overlapping windows of shape (samples, time_steps, n_features).
+
+    Windows are strided views onto ``data`` rather than per-window copies, so
+    building them is O(1) regardless of history length. Pass ``contiguous=True``
+    right before handing the result to Keras, which needs a dense buffer; that
+    costs a single bulk copy instead of one allocation per window.
+
+    Args:
+        data (DataFrame or ndarray): Rows ordered oldest to newest, either
+            (rows,) for a single feature or (rows, n_features).
+        time_steps (int): Window length.
+        n_features (int, optional): Expected feature count; validated if given.
+        contiguous (bool): Return a C-contiguous copy instead of a view.
+        dtype: Target dtype for the windows (default float32).
+
+    Returns:
+        np.ndarray: Array of shape (rows - time_steps + 1, time_steps, n_features).
+    """
+    data = as_feature_array(data, dtype=dtype)
+
+    if data.ndim == 1:
+        data = data[:, np.newaxis]
+    if data.ndim != 2:
+        raise ValueError(f"Expected 1D or 2D input for windowing, got shape {data.shape}.")
+    if n_features is not None and data.shape[1] != n_features:
+        raise ValueError(f"Expected {n_features} features per row, got {data.shape[1]}.")
+    if data.shape[0] < time_steps:
+        raise ValueError(f"Not enough data: got {data.shape[0]} rows, need at least {time_steps}.")
+
+    # sliding_window_view appends the window axis last: (samples, features, time_steps)
+    windows = sliding_window_view(data, time_steps, axis=0).transpose(0, 2, 1)
+    if contiguous:
+        return np.ascontiguousarray(windows)
+    return windows
+
@@ -0,0 +1,19 @@
+# backend/backtesting/__init__.py
+
+from backend._lazy import lazy_attributes
+
+_LAZY_ATTRIBUTES = {
+    "Backtester": ".engine",
+    "BacktestResult": ".engine",
+    "run_backtest": ".engine",
+    "ParameterSweep": ".sweep",
+    "grid": ".sweep",
+    "random_samples": ".sweep",
+    "walk_forward_splits": ".sweep",
+    "leaderboard": ".sweep",
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
+
+__all__ = ["Backtester", "BacktestResult", "run_backtest", "ParameterSweep", "grid", "random_samples",
+           "walk_forward_splits", "leaderboard"]
@@ -0,0 +1,324 @@
+# backend/backtesting/engine.py
+
+import logging
+from collections import namedtuple
+
+import numpy as np
+
+from backend.core.status_manager import StatusManager
+from backend.data.indicators import hold_last_signal, rolling_mean, sma_crossover_positions
+from backend.ai_models.windowing import sliding_windows
+from backend.data.kline_sources import interval_to_ms
+
+logger = logging.getLogger(__name__)
+
+YEAR_MS = 365 * 86_400_000
+CLOSE_COLUMN = 3  # index of close in CandleStore's (open, high, low, close, volume) values
+MAX_BACKTEST_CANDLES = 2_000_000  # about four years of 1m candles
+
+# metrics: the /api/run_simulation summary; equity: account value after each candle;
+# positions: exposure held after each candle's close (-1, 0, 1); trades: candle indices of position changes
+BacktestResult = namedtuple('BacktestResult', ['metrics', 'equity', 'positions', 'trades'])
+
+
+# -------- SIGNALS --------
+def sma_confidence(close, short_window=50, long_window=200, full_spread=0.005):
+    """
+    Confidence of the crossover signal: the SMA spread as a fraction of ``full_spread``
+    (relative to the long SMA), clipped to [0, 1]. Zero until both averages exist.
+    """
+    long_sma = rolling_mean(close, long_window)
+    spread = np.abs(rolling_mean(close, short_window) - long_sma) / long_sma
+    return np.clip(np.nan_to_num(spread / full_spread), 0.0, 1.0)
+
+
+def standardized_windows(features, time_steps):
+    """Model windows over ``features``, each standardised per column with only its own rows."""
+    windows = sliding_windows(features, time_steps, dtype=np.float64)
+    std = windows.std(axis=1, keepdims=True)
+    windows = (windows - windows.mean(axis=1, keepdims=True)) / np.where(std > 0, std, 1.0)
+    return windows.astype(np.float32)
+
+
+def model_positions(predictions, time_steps, n_rows):
+    """
+    Target positions from per-window model predictions.
+
+    ``predictions[k]`` is the model output for the window ending at row
+    ``k + time_steps - 1``. As in ``TradingAI.execute_trade``, a rising
+    prediction means buy and a falling one means sell.
+    """
+    predictions = np.asarray(predictions, dtype=np.float64).reshape(-1)
+    signal = np.zeros(n_rows, dtype=np.int8)
+    signal[time_steps:time_steps + len(predictions) - 1] = np.sign(np.diff(predictions))
+    return hold_last_signal(signal)
+
+
+def first_stop(close, entry, position, stop_loss, chunk=256):
+    """
+    Index of the first close after ``entry`` that has moved ``stop_loss`` percent
+    against ``position``, or None. Scans in growing chunks, so an early stop
+    costs little and a late one needs O(log n) slices.
+    """
+    limit = close[entry] * (1.0 - position * stop_loss / 100.0)
+    start = entry + 1
+    while start < len(close):
+        window = close[start:start + chunk]
+        hit = np.flatnonzero(window <= limit if position > 0 else window >= limit)
+        if len(hit):
+            return start + int(hit[0])
+        start += chunk
+        chunk *= 2
+    return None
+
+
+def apply_status_gate(timestamps, desired, cooldown_ms, confidence=None, threshold=0.0, close=None, stop_loss=None):
+    """
+    Follow ``desired`` positions subject to ``StatusManager`` rules.
+
+    A position change may only happen when ``confidence >= threshold`` and
+    more than ``cooldown_ms`` has passed since the previous change. A blocked
+    change is taken at the first candle where it becomes allowed, if the
+    target still differs by then. The loop jumps between candidate candles
+    with binary searches, so its cost grows with the number of signal changes
+    rather than the number of candles.
+
+    With ``stop_loss`` (percent) and ``close``, a position is closed at the
+    first close that has moved ``stop_loss`` percent against its entry, also
+    when the gate has kept it open past the end of its signal run. It stays
+    flat until the signal changes; stop exits bypass the gate.
+
+    Returns:
+        tuple: (positions held after each candle, int64 indices of the candles that traded).
+    """
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    n = len(desired)
+    run_starts = np.flatnonzero(np.diff(desired)) + 1
+    eligible = None if confidence is None else np.flatnonzero(np.asarray(confidence) >= threshold)
+
+    trades, values = [], []
+    position, last_trade, stop_at = 0, None, None
+    i = 0
+    while True:
+        if stop_at is not None and stop_at < i:
+            # The position stayed open until the stop, whether or not the signal changed before it
+            position, last_trade = 0, int(timestamps[stop_at])
+            trades.append(stop_at)
+            values.append(0)
+            k = np.searchsorted(run_starts, stop_at, side='right')
+            i, stop_at = int(run_starts[k]) if k < len(run_starts) else n, None
+            continue
+        if i >= n:
+            break
+        if desired[i] == position:
+            k = np.searchsorted(run_starts, i, side='right')
+            i = int(run_starts[k]) if k < len(run_starts) else n
+            continue
+        if last_trade is not None:
+            ready = int(np.searchsorted(timestamps, last_trade + cooldown_ms, side='right'))
+            if ready > i:
+                i = ready
+                continue
+        if eligible is not None:
+            k = np.searchsorted(eligible, i)
+            if k == len(eligible) or eligible[k] > i:
+                i = int(eligible[k]) if k < len(eligible) else n
+                continue
+        position, last_trade = int(desired[i]), int(timestamps[i])
+        trades.append(i)
+        values.append(position)
+        stop_at = first_stop(close, i, position, stop_loss) if stop_loss and position else None
+        i += 1
+
+    trades = np.asarray(trades, dtype=np.int64)
+    positions = np.zeros(n, dtype=np.int8)
+    if len(trades):
+        change = np.zeros(n, dtype=np.int8)
+        change[trades] = np.diff(np.concatenate(([0], values)))
+        positions = np.cumsum(change, dtype=np.int8)
+    return positions, trades
+
+
+# -------- METRICS --------
+def performance_metrics(timestamps, close, positions, fee_rate=0.001, initial_capital=10_000.0):
+    """
+    P&L, Sharpe ratio, win rate and max drawdown of holding ``positions``.
+
+    The position taken at a candle's close earns the return to the next
+    close. A change of ``d`` units costs ``fee_rate * |d|`` of equity. The
+    Sharpe ratio is annualised from the candle interval. The win rate counts
+    round trips (one per run of a non-zero position) that were profitable
+    after entry and exit fees.
+
+    Returns:
+        tuple: (metrics dict, equity curve with one value per candle).
+    """
+    close = np.asarray(close, dtype=np.float64)
+    positions = np.asarray(positions, dtype=np.float64)
+    if len(close) < 2:
+        raise ValueError("A backtest needs at least two candles.")
+
+    turnover = np.abs(np.diff(np.concatenate(([0.0], positions))))
+    returns = positions[:-1] * (close[1:] / close[:-1] - 1.0) - fee_rate * turnover[:-1]
+    equity = initial_capital * np.concatenate(([1.0], np.cumprod(1.0 + returns)))
+
+    step = float(np.median(np.diff(timestamps)))
+    std = returns.std()
+    sharpe = returns.mean() / std * np.sqrt(YEAR_MS / step) if std > 0 and step > 0 else 0.0
+    drawdown = equity / np.maximum.accumulate(equity) - 1.0
+
+    # Round trips: each run of a constant non-zero position, entered and exited at a close
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(positions)) + 1))
+    ends = np.concatenate((starts[1:], [len(positions) - 1]))
+    held = positions[starts]
+    open_trades = held != 0
+    trade_returns = (held * (close[ends] / close[starts] - 1.0) - 2 * fee_rate * np.abs(held))[open_trades]
+    win_rate = 100.0 * (trade_returns > 0).mean() if len(trade_returns) else 0.0
+
+    metrics = {
+        "P&L": round(float(equity[-1] - initial_capital), 2),
+        "Return %": round(float(100.0 * (equity[-1] / initial_capital - 1.0)), 2),
+        "Sharpe Ratio": round(float(sharpe), 2),
+        "Win Rate": round(float(win_rate), 2),
+        "Max Drawdown": round(float(100.0 * drawdown.min()), 2),
+        "Trades": int(len(trade_returns)),
+        "Candles": int(len(close)),
+    }
+    return metrics, equity
+
+
+# -------- ENGINE --------
+class Backtester:
+    """
+    Replays historical candles through a strategy, entirely with array operations.
+
+    Signals for every candle are computed at once. They are passed through the
+    ``StatusManager`` confidence threshold and cooldown that gate live trades,
+    then scored with ``performance_metrics``. Years of 1m candles take
+    well under a second for the SMA strategy. For the model strategy the time
+    is dominated by one batched forward pass over all windows.
+
+    Args:
+        fee_rate (float): Fraction of notional paid per unit of position change.
+        initial_capital (float): Starting equity.
+        status_manager (StatusManager): Supplies ``confidence_threshold`` and
+            ``cooldown_seconds``; defaults to the live trading defaults.
+        allow_short (bool): If False, sell signals go flat instead of short.
+        position_size (float): Fraction of equity held per unit of position.
+        stop_loss (float): Percent adverse move from entry that closes a position.
+    """
+
+    def __init__(self, fee_rate=0.001, initial_capital=10_000.0, status_manager=None, allow_short=True,
+                 position_size=1.0, stop_loss=None):
+        self.fee_rate = fee_rate
+        self.initial_capital = initial_capital
+        self.status_manager = status_manager or StatusManager()
+        self.allow_short = allow_short
+        self.position_size = position_size
+        self.stop_loss = stop_loss
+
+    def run(self, timestamps, close, desired, confidence=None):
+        """
+        Score target positions ``desired`` (one per candle, -1/0/1).
+
+        Args:
+            confidence (array, optional): Per-candle signal confidence; changes on
+                candles below the status manager's threshold are held back.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        desired = np.asarray(desired, dtype=np.int8)
+        if len(desired) != len(timestamps) or len(close) != len(timestamps):
+            raise ValueError("timestamps, close and positions must have the same length.")
+        if not self.allow_short:
+            desired = np.maximum(desired, 0)
+
+        close = np.asarray(close, dtype=np.float64)
+        positions, trades = apply_status_gate(
+            timestamps, desired, int(self.status_manager.cooldown_seconds * 1000),
+            confidence=confidence, threshold=self.status_manager.confidence_threshold,
+            close=close, stop_loss=self.stop_loss)
+        metrics, equity = performance_metrics(timestamps, close, positions * self.position_size,
+                                              self.fee_rate, self.initial_capital)
+        return BacktestResult(metrics, equity, positions, trades)
+
+    def run_sma(self, timestamps, close, short_window=50, long_window=200, confidence=None):
+        return self.run(timestamps, close, sma_crossover_positions(close, short_window, long_window), confidence)
+
+    def run_model(self, trading_ai, timestamps, values, confidence=None):
+        """
+        Backtest ``TradingAI`` signals over (rows, 5) OHLCV ``values``.
+
+        Single-feature models see closes; wider models see the first
+        ``n_features`` OHLCV columns. A TradingAI with a scaler would fit it
+        over the whole history, leaking later prices into every window, so
+        each window is standardised with its own rows instead.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        features = values[:, CLOSE_COLUMN:CLOSE_COLUMN + 1] if trading_ai.n_features == 1 \
+            else values[:, :trading_ai.n_features]
+        if trading_ai.scaler is not None and len(features) >= trading_ai.time_steps:
+            predictions = trading_ai.model.predict(standardized_windows(features, trading_ai.time_steps))
+        else:
+            predictions = trading_ai.predict(features)
+        if predictions is None:
+            raise ValueError(f"{trading_ai.model_type} model produced no predictions for the backtest.")
+        desired = model_positions(predictions, trading_ai.time_steps, len(values))
+        return self.run(timestamps, values[:, CLOSE_COLUMN], desired, confidence=confidence)
+
+
+def check_backtest_range(interval, start, end, max_candles=MAX_BACKTEST_CANDLES):
+    """
+    Reject a [start, end) range that is empty or spans more than ``max_candles`` candles of ``interval``.
+
+    Raises:
+        ValueError: For an unknown interval or an out-of-range request.
+    """
+    step = interval_to_ms(interval)
+    if end <= start:
+        raise ValueError("end must be after start.")
+    if (end - start) // step > max_candles:
+        raise ValueError(f"Backtests are limited to {max_candles} {interval} candles; "
+                         f"{start}..{end} spans {(end - start) // step}.")
+
+
+def run_backtest(symbol='BTCUSDT', interval='1h', start=None, end=None, strategy='sma', store=None, source=None,
+                 short_window=50, long_window=200, fee_rate=0.001, initial_capital=10_000.0,
+                 status_manager=None, allow_short=True, trading_ai=None):
+    """
+    Backtest stored candles of ``symbol`` in [start, end) (epoch ms).
+
+    Candles come from the candle store. With a kline ``source`` any gaps are
+    downloaded first; without one only what is already on disk is used.
+
+    Args:
+        strategy (str): 'sma' for the SMA crossover or 'model' for TradingAI signals.
+        trading_ai (TradingAI): Model to use for 'model'; defaults to the shared instance.
+
+    Raises:
+        ValueError: For an unknown strategy, a range over MAX_BACKTEST_CANDLES,
+            or when fewer than two candles are available.
+    """
+    if strategy not in ('sma', 'model'):
+        raise ValueError(f"Unknown backtest strategy: {strategy}")
+    if end is None or start is None:
+        raise ValueError("start and end are required.")
+    check_backtest_range(interval, start, end)  # validate before touching the store
+    if store is None:
+        from backend.data.candle_store import get_candle_store
+        store = get_candle_store()
+
+    if source is not None:
+        timestamps, values = store.history(symbol, interval, start, end, source=source)
+    else:
+        timestamps, values = store.load(symbol, interval, start, end)
+    if len(timestamps) < 2:
+        raise ValueError(f"Not enough {symbol} {interval} candles stored between {start} and {end}.")
+    logger.info("Backtesting %s on %d %s %s candles", strategy, len(timestamps), symbol, interval)
+
+    backtester = Backtester(fee_rate, initial_capital, status_manager, allow_short)
+    if strategy == 'sma':
+        return backtester.run_sma(timestamps, values[:, CLOSE_COLUMN], short_window, long_window)
+    if trading_ai is None:
+        from backend.ai_models.trading_ai import get_trading_ai
+        trading_ai = get_trading_ai()
+    return backtester.run_model(trading_ai, timestamps, values)
@@ -0,0 +1,264 @@
+# backend/backtesting/sweep.py
+
+import hashlib
+import itertools
+import json
+import logging
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from backend.backtesting.engine import Backtester, sma_confidence
+from backend.core.status_manager import StatusManager
+
+logger = logging.getLogger(__name__)
+
+# Strategy knobs from TradingLogic (SMA windows) and ai_trading.TradingAI's config, with their defaults
+DEFAULT_PARAMS = {
+    'short_window': 50,
+    'long_window': 200,
+    'aggressiveness': 3,   # 1-5; below 3 only trades confident signals
+    'stop_loss': 5,        # percent
+    'risk_per_trade': 2,   # percent of equity per position
+    'trade_cooldown': 5,   # minutes
+    'fee_rate': 0.001,
+}
+
+# As in ai_trading.TradingAI.predict_action: cautious settings need 0.7 confidence
+CAUTIOUS_CONFIDENCE = 0.7
+
+
+# -------- PARAMETER SPACES --------
+def grid(space):
+    """Every combination of ``space`` ({name: [values]}), skipping short_window >= long_window."""
+    names = list(space)
+    combos = (dict(zip(names, values)) for values in itertools.product(*(space[n] for n in names)))
+    return [params for params in combos if _valid(params)]
+
+
+def random_samples(space, n, seed=None):
+    """``n`` distinct random combinations from ``space`` ({name: sequence of values})."""
+    rng = random.Random(seed)
+    total = int(np.prod([len(values) for values in space.values()]))
+    samples, seen = [], set()
+    for _ in range(n * 20):
+        if len(samples) == n or len(seen) == total:
+            break
+        params = {name: rng.choice(list(values)) for name, values in space.items()}
+        key = _params_key(params)
+        if key not in seen:
+            seen.add(key)
+            if _valid(params):
+                samples.append(params)
+    return samples
+
+
+def walk_forward_splits(n_rows, n_splits=4, train_fraction=0.7, anchored=False):
+    """
+    Consecutive (train, test) row ranges for walk-forward optimisation.
+
+    The history is cut into ``n_splits`` windows, each split into a training
+    part and the test part that follows it. ``anchored=True`` starts every
+    training range at row 0 so it grows over time.
+
+    Returns:
+        list: [((train_start, train_end), (test_start, test_end)), ...] with exclusive ends.
+    """
+    bounds = np.linspace(0, n_rows, n_splits + 1).astype(int)
+    splits = []
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        cut = lo + int((hi - lo) * train_fraction)
+        if cut - lo < 2 or hi - cut < 2:
+            raise ValueError(f"{n_rows} rows are too few for {n_splits} walk-forward splits.")
+        splits.append(((0 if anchored else int(lo), int(cut)), (int(cut), int(hi))))
+    return splits
+
+
+def _valid(params):
+    merged = dict(DEFAULT_PARAMS, **params)
+    return merged['short_window'] < merged['long_window']
+
+
+def _params_key(params):
+    return json.dumps(params, sort_keys=True, default=float)
+
+
+# -------- EVALUATION --------
+def evaluate_params(timestamps, close, params):
+    """Backtest the SMA crossover over ``close`` with ``params`` overriding DEFAULT_PARAMS; returns metrics."""
+    p = dict(DEFAULT_PARAMS, **params)
+    threshold = CAUTIOUS_CONFIDENCE if p['aggressiveness'] < 3 else 0.0
+    backtester = Backtester(
+        fee_rate=p['fee_rate'],
+        status_manager=StatusManager(confidence_threshold=threshold, cooldown_seconds=p['trade_cooldown'] * 60),
+        position_size=p['risk_per_trade'] / 100.0,
+        stop_loss=p['stop_loss'],
+    )
+    confidence = sma_confidence(close, p['short_window'], p['long_window']) if threshold else None
+    return backtester.run_sma(timestamps, close, p['short_window'], p['long_window'], confidence).metrics
+
+
+class SharedCandles:
+    """
+    Candle timestamps and closes in ``multiprocessing.shared_memory``.
+
+    Pool workers attach to the blocks by name, so each worker reads the same
+    physical pages instead of unpickling its own copy of the history. The
+    creating process owns the blocks and unlinks them on ``close``.
+    """
+
+    def __init__(self, timestamps, close):
+        self.length = len(timestamps)
+        self._blocks = {}
+        for name, array in (('timestamps', np.asarray(timestamps, dtype=np.int64)),
+                            ('close', np.asarray(close, dtype=np.float64))):
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, array.dtype, buffer=block.buf)[:] = array
+            self._blocks[name] = block
+
+    @property
+    def spec(self):
+        """Picklable description a worker passes to ``attach``."""
+        return self.length, self._blocks['timestamps'].name, self._blocks['close'].name
+
+    def close(self):
+        for block in self._blocks.values():
+            block.close()
+            block.unlink()
+        self._blocks.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_worker_data = {}
+
+
+def _attach(spec):
+    length, timestamps_name, close_name = spec
+    for key, name, dtype in (('timestamps', timestamps_name, np.int64), ('close', close_name, np.float64)):
+        block = shared_memory.SharedMemory(name=name)
+        _worker_data[key + '_block'] = block  # keep the mapping alive for the worker's lifetime
+        _worker_data[key] = np.ndarray((length,), dtype, buffer=block.buf)
+
+
+def _evaluate_task(task):
+    params, (lo, hi) = task
+    return evaluate_params(_worker_data['timestamps'][lo:hi], _worker_data['close'][lo:hi], params)
+
+
+class ParameterSweep:
+    """
+    Evaluates strategy parameter sets over one candle history, in parallel.
+
+    Workers in a process pool attach to the history in shared memory. Each
+    task is one (parameters, row range) backtest, so throughput scales with
+    the number of cores. Results are cached per (history, row range,
+    parameters). A repeated sweep, or a walk-forward run that revisits a
+    range, only evaluates what is new. With ``cache_path`` the cache is also
+    kept in a JSON file across runs.
+
+    Args:
+        timestamps (array): Candle open times (epoch ms).
+        close (array): Closing prices.
+        max_workers (int): Pool size; defaults to the CPU count. 1 runs in-process.
+        cache_path (str): Optional JSON file backing the result cache.
+    """
+
+    def __init__(self, timestamps, close, max_workers=None, cache_path=None):
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.close = np.asarray(close, dtype=np.float64)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.cache_path = cache_path
+        self.evaluations = 0
+
+        digest = hashlib.blake2b(self.timestamps.tobytes(), digest_size=16)
+        digest.update(self.close.tobytes())
+        self.fingerprint = digest.hexdigest()
+
+        self._cache = {}
+        if cache_path and os.path.exists(cache_path):
+            with open(cache_path) as f:
+                self._cache = json.load(f)
+
+    def _cache_key(self, params, rows):
+        return f"{self.fingerprint}:{rows[0]}-{rows[1]}:{_params_key(params)}"
+
+    def evaluate(self, param_sets, rows=None):
+        """
+        Backtest every parameter set over rows [start, end) of the history (all rows by default).
+
+        Returns:
+            list: One {'params': ..., 'metrics': ...} dict per parameter set, in input order.
+        """
+        rows = tuple(rows or (0, len(self.close)))
+        keys = [self._cache_key(params, rows) for params in param_sets]
+        pending = {key: params for key, params in zip(keys, param_sets) if key not in self._cache}
+
+        if pending:
+            tasks = [(params, rows) for params in pending.values()]
+            logger.info("Evaluating %d parameter sets over rows %d-%d (%d cached)",
+                        len(tasks), rows[0], rows[1], len(param_sets) - len(tasks))
+            for key, metrics in zip(pending, self._run(tasks)):
+                self._cache[key] = metrics
+            self.evaluations += len(tasks)
+            self._save_cache()
+        return [{'params': params, 'metrics': self._cache[key]} for key, params in zip(keys, param_sets)]
+
+    def _run(self, tasks):
+        if self.max_workers == 1 or len(tasks) == 1:
+            return [evaluate_params(self.timestamps[lo:hi], self.close[lo:hi], params) for params, (lo, hi) in tasks]
+        with SharedCandles(self.timestamps, self.close) as shared:
+            with ProcessPoolExecutor(self.max_workers, initializer=_attach, initargs=(shared.spec,)) as pool:
+                chunksize = max(1, len(tasks) // (self.max_workers * 4))
+                return list(pool.map(_evaluate_task, tasks, chunksize=chunksize))
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self._cache, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def walk_forward(self, param_sets, n_splits=4, train_fraction=0.7, anchored=False, metric='Sharpe Ratio'):
+        """
+        Pick the best parameters on each training range and score them on the following test range.
+
+        Returns:
+            list: Per split, {'train': rows, 'test': rows, 'params': best params,
+            'train_metrics': ..., 'test_metrics': ...}.
+        """
+        report = []
+        for train, test in walk_forward_splits(len(self.close), n_splits, train_fraction, anchored):
+            best = leaderboard(self.evaluate(param_sets, train), metric, top=1)[0]
+            report.append({
+                'train': train,
+                'test': test,
+                'params': best['params'],
+                'train_metrics': best['metrics'],
+                'test_metrics': self.evaluate([best['params']], test)[0]['metrics'],
+            })
+        return report
+
+
+def leaderboard(results, metric='Sharpe Ratio', top=10):
+    """The ``top`` results ordered best first by ``metric`` (ties broken by P&L)."""
+    ranked = sorted(results, key=lambda r: (r['metrics'][metric], r['metrics']['P&L']), reverse=True)
+    return ranked[:top]
+
+
+def format_leaderboard(results, metric='Sharpe Ratio', top=10):
+    lines = []
+    for rank, result in enumerate(leaderboard(results, metric, top), 1):
+        m = result['metrics']
+        params = ", ".join(f"{k}={v}" for k, v in sorted(result['params'].items()))
+        lines.append(f"{rank:>3}. {metric}={m[metric]:>7.2f}  P&L={m['P&L']:>10.2f}  "
+                     f"win={m['Win Rate']:>5.1f}%  dd={m['Max Drawdown']:>6.2f}%  trades={m['Trades']:>5}  {params}")
+    return "\n".join(lines)
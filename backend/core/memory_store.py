@@ -0,0 +1,196 @@
+# backend/core/memory_store.py
+
+import fcntl
+import json
+import logging
+import os
+import struct
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Index entries are the little-endian uint64 byte offset of each record in the data file
+_OFFSET = struct.Struct('<Q')
+
+
+class ConversationStore:
+    """
+    Append-only conversation log: one JSON object per line, plus an offset index.
+
+    ``path`` holds the records as JSON lines. ``<path>.idx`` holds the byte
+    offset of every record as a fixed-width uint64, so record ``i`` starts at
+    index byte ``8 * i``. An append writes one line and one index entry.
+    A page or the last N turns reads one slice of the index and one
+    contiguous range of the data file. No operation reads the whole history.
+
+    Writers hold an exclusive ``flock`` on the index file, so appends from
+    several Gunicorn workers never interleave. Readers hold a shared lock.
+    A record's index entry is written only after the record itself. If a
+    writer dies between the two writes, the next writer indexes the orphan
+    record, or truncates it if the line is incomplete, before appending.
+
+    Args:
+        path (str): JSON lines data file; created on first use.
+        index_path (str): Offset index; defaults to ``path + '.idx'``.
+    """
+
+    def __init__(self, path, index_path=None):
+        self.path = path
+        self.index_path = index_path or f"{path}.idx"
+        self._lock = threading.Lock()
+        self._pid = None
+        self._data_fd = None
+        self._index_fd = None
+
+    # -------- FILES --------
+    def _fds(self):
+        # flock belongs to the open file description, which a forked worker shares with its parent.
+        # Each process therefore opens its own descriptors so the workers really exclude each other.
+        if self._pid != os.getpid():
+            self._data_fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            self._index_fd = os.open(self.index_path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            self._pid = os.getpid()
+        return self._data_fd, self._index_fd
+
+    def close(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                os.close(self._data_fd)
+                os.close(self._index_fd)
+            self._pid = self._data_fd = self._index_fd = None
+
+    @contextmanager
+    def _locked(self, exclusive):
+        with self._lock:
+            data_fd, index_fd = self._fds()
+            fcntl.flock(index_fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield data_fd, index_fd
+            finally:
+                fcntl.flock(index_fd, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _count(index_fd):
+        return os.fstat(index_fd).st_size // _OFFSET.size
+
+    @staticmethod
+    def _offsets(index_fd, start, stop):
+        raw = os.pread(index_fd, (stop - start) * _OFFSET.size, start * _OFFSET.size)
+        return [offset for (offset,) in _OFFSET.iter_unpack(raw)]
+
+    def _repair(self, data_fd, index_fd):
+        """Bring the index level with the data file after an interrupted append; exclusive lock held."""
+        size = os.fstat(index_fd).st_size
+        if size % _OFFSET.size:
+            os.ftruncate(index_fd, size - size % _OFFSET.size)
+        count = self._count(index_fd)
+        tail_start = self._offsets(index_fd, count - 1, count)[0] if count else 0
+        tail = os.pread(data_fd, os.fstat(data_fd).st_size - tail_start, tail_start)
+        complete = tail.rfind(b'\n') + 1
+        if complete < len(tail):
+            logger.warning("Truncating an incomplete record at the end of %s.", self.path)
+            os.ftruncate(data_fd, tail_start + complete)
+        # The last indexed record is the first line of the tail; any further lines are unindexed
+        if count:
+            if not complete:
+                logger.warning("Dropping the index entry of a lost record in %s.", self.path)
+                os.ftruncate(index_fd, (count - 1) * _OFFSET.size)
+                return
+            pos = tail.index(b'\n') + 1
+        else:
+            pos = 0
+        entries = bytearray()
+        while pos < complete:
+            entries += _OFFSET.pack(tail_start + pos)
+            pos = tail.index(b'\n', pos) + 1
+        if entries:
+            logger.warning("Indexing %d unindexed record(s) in %s.", len(entries) // _OFFSET.size, self.path)
+            os.write(index_fd, bytes(entries))
+
+    @staticmethod
+    def _write(data_fd, index_fd, turns):
+        """Append ``turns`` with one write to each file; exclusive lock held."""
+        lines = [json.dumps(turn, separators=(',', ':')).encode() + b'\n' for turn in turns]
+        offset, entries = os.fstat(data_fd).st_size, bytearray()
+        for line in lines:
+            entries += _OFFSET.pack(offset)
+            offset += len(line)
+        if lines:
+            os.write(data_fd, b''.join(lines))
+            os.write(index_fd, bytes(entries))
+
+    # -------- WRITES --------
+    def append(self, turn):
+        """Append one turn (a JSON-serializable dict); returns its position in the log."""
+        return self.extend([turn])
+
+    def extend(self, turns):
+        """
+        Append ``turns`` in one write; returns the position of the first.
+
+        Raises:
+            TypeError: If a turn is not JSON-serializable (nothing is written).
+        """
+        with self._locked(exclusive=True) as (data_fd, index_fd):
+            self._repair(data_fd, index_fd)
+            first = self._count(index_fd)
+            self._write(data_fd, index_fd, turns)
+            return first
+
+    def reset(self):
+        with self._locked(exclusive=True) as (data_fd, index_fd):
+            os.ftruncate(data_fd, 0)
+            os.ftruncate(index_fd, 0)
+
+    # -------- READS --------
+    def __len__(self):
+        with self._locked(exclusive=False) as (_, index_fd):
+            return self._count(index_fd)
+
+    def read(self, start=0, limit=None):
+        """Turns ``start`` up to ``start + limit`` (to the end if ``limit`` is None), oldest first."""
+        with self._locked(exclusive=False) as (data_fd, index_fd):
+            return self._read(data_fd, index_fd, start, limit)
+
+    def last(self, n):
+        """The newest ``n`` turns, oldest first."""
+        if n <= 0:
+            return []
+        with self._locked(exclusive=False) as (data_fd, index_fd):
+            return self._read(data_fd, index_fd, max(0, self._count(index_fd) - n), n)
+
+    def _read(self, data_fd, index_fd, start, limit):
+        count = self._count(index_fd)
+        start = max(0, min(start, count))
+        stop = count if limit is None else min(count, start + max(0, limit))
+        if start >= stop:
+            return []
+        offsets = self._offsets(index_fd, start, min(stop + 1, count))
+        end = offsets[-1] if stop < count else os.fstat(data_fd).st_size
+        raw = os.pread(data_fd, end - offsets[0], offsets[0])
+        return [json.loads(line) for line in raw.split(b'\n', stop - start)[:stop - start]]
+
+    # -------- MIGRATION --------
+    def migrate_json(self, legacy_path):
+        """
+        Import a legacy ``conversation_memory.json`` (a JSON list of turns) into an empty store.
+
+        The legacy file is renamed to ``<legacy_path>.migrated`` afterwards,
+        so the import runs once even with several workers starting together.
+
+        Returns:
+            int: Number of turns imported (0 if there was nothing to import).
+        """
+        with self._locked(exclusive=True) as (data_fd, index_fd):
+            if not os.path.exists(legacy_path):
+                return 0
+            if self._count(index_fd) or os.fstat(data_fd).st_size:
+                logger.warning("Not migrating %s: %s already has conversation turns.", legacy_path, self.path)
+                return 0
+            with open(legacy_path, 'r') as f:
+                turns = json.load(f)
+            self._write(data_fd, index_fd, turns)
+            os.replace(legacy_path, f"{legacy_path}.migrated")
+        logger.info("Migrated %d conversation turns from %s to %s.", len(turns), legacy_path, self.path)
+        return len(turns)
@@ -0,0 +1,322 @@
+# backend/core/response_cache.py
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Seconds each read-only route may serve a cached result for
+ROUTE_TTLS = {
+    'market_data': 1.0,
+    'order_book': 1.0,
+    'ohlcv': 5.0,
+    'balance': 5.0,
+    'health': 10.0,
+}
+
+_MISSING = object()
+
+
+# -------- BACKENDS --------
+class MemoryBackend:
+    """Per-process cache: a dict of key -> (expiry, value)."""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            return entry[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def acquire(self, key):
+        return True  # the ResponseCache already coalesces within the process
+
+    def release(self, key, token):
+        pass
+
+    def wait(self, key, timeout):
+        return _MISSING
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisBackend:
+    """
+    Cache shared by every worker process, stored in Redis as JSON with a PX expiry.
+
+    Single-flight across processes uses a ``SET NX PX`` lock per key. The
+    process that wins the lock computes the value. The others poll for the
+    value until the lock is released or expires.
+
+    Args:
+        client: A redis-py client (or ``FakeRedis`` in tests); built from REDIS_HOST/REDIS_PORT if None.
+        prefix (str): Key prefix for cached values and their locks.
+        lock_timeout (float): Seconds before an abandoned lock expires.
+        poll_interval (float): Seconds between polls while another process computes.
+    """
+
+    def __init__(self, client=None, prefix='simtwo:cache:', lock_timeout=10.0, poll_interval=0.02):
+        if client is None:
+            import redis  # deferred: only needed when the Redis backend is selected
+            client = redis.Redis(host=os.getenv('REDIS_HOST', 'simtwo_redis'),
+                                 port=int(os.getenv('REDIS_PORT', 6379)),
+                                 socket_timeout=1.0, socket_connect_timeout=1.0)
+        self.client = client
+        self.prefix = prefix
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return _MISSING if raw is None else json.loads(raw)
+
+    def set(self, key, value, ttl):
+        self.client.set(self.prefix + key, json.dumps(value), px=max(int(ttl * 1000), 1))
+
+    def acquire(self, key):
+        token = uuid.uuid4().hex
+        ok = self.client.set(f"{self.prefix}lock:{key}", token, nx=True, px=int(self.lock_timeout * 1000))
+        return token if ok else None
+
+    def release(self, key, token):
+        lock_key = f"{self.prefix}lock:{key}"
+        held = self.client.get(lock_key)
+        if held is not None and (held.decode() if isinstance(held, bytes) else held) == token:
+            self.client.delete(lock_key)
+
+    def wait(self, key, timeout):
+        """Poll for ``key`` while another process holds its lock; _MISSING if it never appears."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            value = self.get(key)
+            if value is not _MISSING:
+                return value
+            if self.client.get(f"{self.prefix}lock:{key}") is None:
+                return self.get(key)
+            time.sleep(self.poll_interval)
+        return _MISSING
+
+
+class FakeRedis:
+    """In-memory stand-in for the few redis-py calls RedisBackend and TickGuard make; for tests."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+        self.commands = 0
+
+    def _live(self, name):
+        entry = self._data.get(name)
+        if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+            del self._data[name]
+            return None
+        return entry
+
+    def get(self, name):
+        with self._lock:
+            self.commands += 1
+            entry = self._live(name)
+            return None if entry is None else entry[0]
+
+    def set(self, name, value, px=None, nx=False):
+        with self._lock:
+            self.commands += 1
+            if nx and self._live(name) is not None:
+                return None
+            value = value.encode() if isinstance(value, str) else value
+            self._data[name] = (value, None if px is None else time.monotonic() + px / 1000)
+            return True
+
+    def delete(self, *names):
+        with self._lock:
+            self.commands += 1
+            return sum(self._data.pop(name, None) is not None for name in names)
+
+    def pexpire(self, name, px):
+        with self._lock:
+            self.commands += 1
+            entry = self._live(name)
+            if entry is None:
+                return False
+            self._data[name] = (entry[0], time.monotonic() + px / 1000)
+            return True
+
+    # Sorted sets, as used by TickGuard's stamps
+    def zadd(self, name, mapping, gt=False):
+        with self._lock:
+            self.commands += 1
+            entry = self._live(name)
+            members, expires = (dict(entry[0]), entry[1]) if entry is not None else ({}, None)
+            added = 0
+            for member, score in mapping.items():
+                member = member.encode() if isinstance(member, str) else member
+                if member not in members:
+                    added += 1
+                elif gt and score <= members[member]:
+                    continue
+                members[member] = float(score)
+            self._data[name] = (members, expires)
+            return added
+
+    def zscore(self, name, member):
+        with self._lock:
+            self.commands += 1
+            entry = self._live(name)
+            member = member.encode() if isinstance(member, str) else member
+            return None if entry is None else entry[0].get(member)
+
+
+# -------- CACHE --------
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResponseCache:
+    """
+    Read-through cache for read-only API routes, with request coalescing.
+
+    ``get_or_compute(key, ttl, compute)`` returns a cached value while it is
+    younger than ``ttl``. On a miss only one caller runs ``compute``. Other
+    threads asking for the same key wait for that result instead of calling
+    the exchange again (single-flight). With the Redis backend this also
+    holds across worker processes. Errors are passed to everyone waiting on
+    that flight and are never cached. If the backend itself fails (e.g.
+    Redis is down), the request falls back to calling ``compute`` directly.
+
+    Args:
+        backend: MemoryBackend (default) or RedisBackend.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or MemoryBackend()
+        self.requests = 0
+        self.hits = 0
+        self.coalesced = 0
+        self.upstream_calls = 0
+        self.backend_errors = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, ttl, compute):
+        with self._lock:
+            self.requests += 1
+        value = self._backend_call(self.backend.get, key)
+        if value is not _MISSING:
+            with self._lock:
+                self.hits += 1
+            return value
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = self._compute_shared(key, ttl, compute)
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.value
+
+    def _compute_shared(self, key, ttl, compute):
+        token = self._backend_call(self.backend.acquire, key, default=True)
+        if not token:
+            # Another process is computing this key; use its result if it lands in time
+            value = self._backend_call(self.backend.wait, key, self.backend.lock_timeout)
+            if value is not _MISSING:
+                with self._lock:
+                    self.coalesced += 1
+                return value
+        try:
+            if token is not True:
+                # The previous lock holder may have stored the value between our miss and the lock
+                value = self._backend_call(self.backend.get, key)
+                if value is not _MISSING:
+                    with self._lock:
+                        self.coalesced += 1
+                    return value
+            with self._lock:
+                self.upstream_calls += 1
+            value = compute()
+            self._backend_call(self.backend.set, key, value, ttl)
+            return value
+        finally:
+            if token:
+                self._backend_call(self.backend.release, key, token)
+
+    def _backend_call(self, method, *args, default=_MISSING):
+        try:
+            return method(*args)
+        except Exception as e:
+            with self._lock:
+                self.backend_errors += 1
+            logger.warning("Response cache backend error in %s: %s", method.__name__, e)
+            return default
+
+    def metrics(self):
+        with self._lock:
+            return {
+                'backend': type(self.backend).__name__,
+                'requests': self.requests,
+                'hits': self.hits,
+                'coalesced': self.coalesced,
+                'upstream_calls': self.upstream_calls,
+                'upstream_calls_saved': self.requests - self.upstream_calls,
+                'hit_ratio': round(self.hits / self.requests, 4) if self.requests else 0.0,
+                'backend_errors': self.backend_errors,
+            }
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache(backend=None):
+    """
+    Process-wide ResponseCache for ``backend`` ('memory' or 'redis').
+
+    Defaults to the RESPONSE_CACHE environment variable, or 'memory' if that is unset.
+    """
+    backend = backend or os.getenv('RESPONSE_CACHE', 'memory')
+    with _caches_lock:
+        cache = _caches.get(backend)
+        if cache is None:
+            if backend == 'redis':
+                cache = ResponseCache(RedisBackend())
+            elif backend == 'memory':
+                cache = ResponseCache(MemoryBackend())
+            else:
+                raise ValueError(f"Unknown response cache backend: {backend}")
+            _caches[backend] = cache
+        return cache
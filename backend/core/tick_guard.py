@@ -0,0 +1,174 @@
+# backend/core/tick_guard.py
+
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+
+from backend.core.response_cache import RedisBackend
+
+logger = logging.getLogger(__name__)
+
+# status: 'ran', 'stale' (older than max_age), 'superseded' (a newer tick exists) or 'overlap'
+# (the previous tick for the key is still running); value: what the job returned when it ran
+TickResult = namedtuple('TickResult', ['status', 'value'])
+
+
+class TickGuard:
+    """
+    Deadline-aware gate for scheduled trading ticks.
+
+    A tick for ``key`` (usually a symbol) carries the time it was scheduled.
+    ``run`` executes it only if all of the following hold:
+
+    - it is no older than ``max_age`` seconds, so ticks that waited out an
+      exchange slowdown in a queue are discarded;
+    - no newer tick for the key has been ``stamp``-ed, so a backlog collapses
+      into its newest tick;
+    - no other tick for the key is running (single-flight per key).
+
+    Single-flight uses a non-blocking in-process lock. With a Redis client
+    it also uses a ``SET NX PX`` lock that every worker process and host
+    shares, and stamps are shared there too.
+
+    Args:
+        redis: Optional redis-py client (or FakeRedis) for cross-process locks and stamps.
+        max_age (float): Seconds after scheduling past which a tick is dropped.
+        late_after (float): Ticks starting later than this are counted as late.
+        lock_timeout (float): Seconds before an abandoned Redis lock expires.
+    """
+
+    def __init__(self, redis=None, max_age=60.0, late_after=5.0, lock_timeout=300.0, prefix='simtwo:tick:'):
+        self.max_age = max_age
+        self.late_after = late_after
+        self.redis = redis
+        self.prefix = prefix
+        self._redis_locks = RedisBackend(redis, prefix=prefix, lock_timeout=lock_timeout) if redis else None
+        self._locks = {}
+        self._latest = {}
+        self._lock = threading.Lock()
+        self.counts = {'ran': 0, 'stale': 0, 'superseded': 0, 'overlap': 0, 'late': 0, 'failed': 0}
+        self.max_lateness = 0.0
+
+    # -------- STAMPS --------
+    def stamp(self, key, scheduled_at=None):
+        """Record a tick for ``key`` as scheduled; older ticks still queued become superseded."""
+        scheduled_at = time.time() if scheduled_at is None else scheduled_at
+        with self._lock:
+            self._latest[key] = max(scheduled_at, self._latest.get(key, 0.0))
+        if self.redis is not None:
+            try:
+                # ZADD GT keeps the newest stamp when ticks are stamped out of order by several schedulers
+                name = f"{self.prefix}latest:{key}"
+                self.redis.zadd(name, {'latest': scheduled_at}, gt=True)
+                self.redis.pexpire(name, int(self.max_age * 2000))
+            except Exception as e:
+                logger.warning("Could not stamp tick %s in Redis: %s", key, e)
+        return scheduled_at
+
+    def latest(self, key):
+        with self._lock:
+            latest = self._latest.get(key, 0.0)
+        if self.redis is not None:
+            try:
+                stamped = self.redis.zscore(f"{self.prefix}latest:{key}", 'latest')
+                if stamped is not None:
+                    latest = max(latest, float(stamped))
+            except Exception as e:
+                logger.warning("Could not read tick stamp %s from Redis: %s", key, e)
+        return latest
+
+    # -------- RUNNING --------
+    def _count(self, status):
+        with self._lock:
+            self.counts[status] += 1
+        return status
+
+    def run(self, key, job, scheduled_at=None):
+        """
+        Run ``job()`` as the tick for ``key`` scheduled at ``scheduled_at`` (epoch seconds; now if None).
+
+        Returns:
+            TickResult: The status and, if it ran, the job's return value.
+            Exceptions from the job propagate after being counted.
+        """
+        scheduled_at = time.time() if scheduled_at is None else scheduled_at
+        lateness = time.time() - scheduled_at
+        if lateness > self.max_age:
+            logger.warning("Dropping tick %s: %.1fs old (max %.1fs)", key, lateness, self.max_age)
+            return TickResult(self._count('stale'), None)
+        if scheduled_at < self.latest(key):
+            logger.info("Dropping tick %s: superseded by a newer tick", key)
+            return TickResult(self._count('superseded'), None)
+
+        with self._lock:
+            local = self._locks.setdefault(key, threading.Lock())
+        if not local.acquire(blocking=False):
+            logger.warning("Skipping tick %s: previous tick still running", key)
+            return TickResult(self._count('overlap'), None)
+        token = None
+        try:
+            if self._redis_locks is not None:
+                try:
+                    token = self._redis_locks.acquire(key)
+                except Exception as e:
+                    token = True  # Redis down: fall back to the in-process lock alone
+                    logger.warning("Tick lock for %s unavailable in Redis: %s", key, e)
+                if not token:
+                    logger.warning("Skipping tick %s: running in another process", key)
+                    return TickResult(self._count('overlap'), None)
+
+            with self._lock:
+                self.max_lateness = max(self.max_lateness, lateness)
+                if lateness > self.late_after:
+                    self.counts['late'] += 1
+            try:
+                value = job()
+            except Exception:
+                self._count('failed')
+                raise
+            return TickResult(self._count('ran'), value)
+        finally:
+            if token and token is not True:
+                try:
+                    self._redis_locks.release(key, token)
+                except Exception as e:
+                    logger.warning("Could not release tick lock %s: %s", key, e)
+            local.release()
+
+    def metrics(self):
+        with self._lock:
+            return dict(self.counts, max_lateness=round(self.max_lateness, 3),
+                        backend='redis' if self.redis is not None else 'memory')
+
+
+_guards = {}
+_guards_lock = threading.Lock()
+
+
+def get_tick_guard(backend=None, **kwargs):
+    """
+    Process-wide TickGuard for ``backend`` ('memory' or 'redis').
+
+    Defaults to the TICK_GUARD environment variable, or 'memory' if that is
+    unset. Multi-process deployments (Celery workers, or several Gunicorn
+    workers each running the scheduler) need 'redis' to share locks and
+    stamps; ``backend.tasks.tick_guard`` picks it for Celery by default.
+    """
+    backend = backend or os.getenv('TICK_GUARD', 'memory')
+    with _guards_lock:
+        guard = _guards.get(backend)
+        if guard is None:
+            if backend == 'redis':
+                import redis  # deferred: only needed when the Redis backend is selected
+                client = redis.Redis(host=os.getenv('REDIS_HOST', 'simtwo_redis'),
+                                     port=int(os.getenv('REDIS_PORT', 6379)),
+                                     socket_timeout=1.0, socket_connect_timeout=1.0)
+                guard = TickGuard(client, **kwargs)
+            elif backend == 'memory':
+                guard = TickGuard(**kwargs)
+            else:
+                raise ValueError(f"Unknown tick guard backend: {backend}")
+            _guards[backend] = guard
+        return guard
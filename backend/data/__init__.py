@@ -1,3 +1,12 @@
 # backend/data/__init__.py
-from .data_fetcher import DataFetcher
-from .data_fetcher import get_market_data
+
+from backend._lazy import lazy_attributes
+
+_LAZY_ATTRIBUTES = {
+    "DataFetcher": ".data_fetcher",
+    "get_market_data": ".data_fetcher",
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
+
+__all__ = ["DataFetcher", "get_market_data"]
@@ -0,0 +1,283 @@
+# backend/data/candle_store.py
+
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+
+from backend.data.kline_sources import MAX_KLINES_PER_REQUEST, interval_to_ms
+from backend.data.ring_buffer import PRICE_FIELDS, arrays_to_frame, klines_to_arrays
+
+logger = logging.getLogger(__name__)
+
+CANDLE_DTYPE = np.dtype([('timestamp', '<i8')] + [(f, '<f8') for f in PRICE_FIELDS])
+DAY_MS = 86_400_000
+# Each cached memmap holds a file descriptor, so only the most recently read partitions stay mapped
+MAX_OPEN_PARTITIONS = 64
+# A range the exchange returned nothing for is remembered as empty only once it is this old,
+# so candles that were merely slow to appear are asked for again
+EMPTY_RANGE_MIN_AGE_MS = 3_600_000
+
+
+def _day_label(day):
+    return time.strftime('%Y-%m-%d', time.gmtime(day * DAY_MS / 1000))
+
+
+def _contiguous_runs(timestamps, step):
+    """Split sorted timestamps into [start, end) ranges of consecutive candles."""
+    if not len(timestamps):
+        return []
+    breaks = np.flatnonzero(np.diff(timestamps) != step) + 1
+    return [(int(run[0]), int(run[-1]) + step) for run in np.split(timestamps, breaks)]
+
+
+class CandleStore:
+    """
+    On-disk store of closed candles, partitioned as ``root/SYMBOL/INTERVAL/YYYY-MM-DD.npy``.
+
+    Each partition is a structured NumPy array (timestamp, open, high, low,
+    close, volume) opened with ``mmap_mode='r'``, so repeat reads touch only the
+    pages they slice. ``history`` works out which candles are missing from the
+    requested range and downloads just those ranges, so warm queries never hit
+    the network. Only closed candles are persisted; the open candle is left to
+    the live buffers.
+
+    Partitions are plain ``.npy`` files rather than parquet to avoid adding a
+    pyarrow dependency; they are memory-mappable without any extra library.
+    At most ``max_open`` partitions stay mapped (least recently read are
+    unmapped first). Ranges the exchange has no candles for (before listing,
+    maintenance) are recorded in ``_empty.json`` next to the partitions, so
+    they are not downloaded again. Writers from several processes serialize
+    on an ``flock`` of the ``.lock`` file in each symbol/interval directory.
+    Downloads are serialized per (symbol, interval) only, so a long backfill
+    of one symbol does not hold up reads or writes of any other.
+    """
+
+    def __init__(self, root, source=None, clock=time.time, max_open=MAX_OPEN_PARTITIONS):
+        self.root = root
+        self.source = source
+        self.clock = clock
+        self.max_open = max_open
+        self._maps = OrderedDict()
+        self._empty = {}
+        self._lock = threading.RLock()  # guards the partition and empty-range maps only
+        self._key_locks = {}
+
+    def _dir(self, symbol, interval):
+        return os.path.join(self.root, symbol.upper(), interval)
+
+    def _path(self, symbol, interval, day):
+        return os.path.join(self._dir(symbol, interval), f"{_day_label(day)}.npy")
+
+    def _key_lock(self, kind, symbol, interval):
+        """In-process lock of ``kind`` ('write' or 'backfill') for one (symbol, interval)."""
+        key = (kind, symbol.upper(), interval)
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+    @contextmanager
+    def _file_lock(self, symbol, interval):
+        """Exclusive lock on the (symbol, interval) directory across threads and processes."""
+        directory = self._dir(symbol, interval)
+        os.makedirs(directory, exist_ok=True)
+        with self._key_lock('write', symbol, interval), open(os.path.join(directory, '.lock'), 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _read_day(self, symbol, interval, day):
+        path = self._path(symbol, interval, day)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        signature = (st.st_mtime_ns, st.st_ino)
+        with self._lock:
+            cached = self._maps.get(path)
+            if cached is None or cached[0] != signature:
+                cached = self._maps[path] = (signature, np.load(path, mmap_mode='r'))
+            self._maps.move_to_end(path)
+            while len(self._maps) > self.max_open:
+                self._maps.popitem(last=False)
+            return cached[1]
+
+    # -------- EMPTY RANGES --------
+    def _empty_path(self, symbol, interval):
+        return os.path.join(self._dir(symbol, interval), '_empty.json')
+
+    def empty_ranges(self, symbol, interval):
+        """[(start_ms, end_ms), ...] the exchange was asked for and had no candles in."""
+        path = self._empty_path(symbol, interval)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return []
+        signature = (st.st_mtime_ns, st.st_ino)
+        with self._lock:
+            cached = self._empty.get(path)
+            if cached is None or cached[0] != signature:
+                with open(path, 'r') as f:
+                    cached = self._empty[path] = (signature, [tuple(r) for r in json.load(f)])
+            return cached[1]
+
+    def _record_empty(self, symbol, interval, ranges):
+        """Merge ``ranges`` into the empty-range file; the directory lock is held."""
+        merged = []
+        for start, end in sorted(self.empty_ranges(symbol, interval) + ranges):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        path = self._empty_path(symbol, interval)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(merged, f)
+        os.replace(tmp_path, path)
+
+    def _write_day(self, symbol, interval, day, rows):
+        path = self._path(symbol, interval, day)
+
+        merged = np.concatenate([self._read_day(symbol, interval, day), rows])
+        # np.unique keeps the first occurrence, so search the reversed array to let new rows win
+        _, idx = np.unique(merged['timestamp'][::-1], return_index=True)
+        merged = merged[len(merged) - 1 - idx]
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, merged)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._maps.pop(path, None)
+
+    def _closed_end(self, step):
+        """Exclusive upper bound on open times of candles that have closed."""
+        return (int(self.clock() * 1000) // step) * step
+
+    def write(self, symbol, interval, timestamps, values):
+        """Persist closed candles, merging them into their day partitions."""
+        step = interval_to_ms(interval)
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        closed = timestamps < self._closed_end(step)
+        if not closed.any():
+            return 0
+
+        rows = np.empty(int(closed.sum()), dtype=CANDLE_DTYPE)
+        rows['timestamp'] = timestamps[closed]
+        for i, field in enumerate(PRICE_FIELDS):
+            rows[field] = np.asarray(values)[closed, i]
+
+        days = rows['timestamp'] // DAY_MS
+        with self._file_lock(symbol, interval):
+            for day in np.unique(days):
+                self._write_day(symbol, interval, int(day), rows[days == day])
+        return len(rows)
+
+    def missing_ranges(self, symbol, interval, start, end):
+        """
+        Ranges of closed candles in [start, end) that are neither on disk nor known to be empty.
+
+        Returns:
+            list: [(start_ms, end_ms), ...] with exclusive ends, aligned to the interval.
+        """
+        step = interval_to_ms(interval)
+        first = -(-start // step) * step
+        stop = min(end, self._closed_end(step))
+        if first >= stop:
+            return []
+
+        expected = np.arange(first, stop, step, dtype=np.int64)
+        # Copies, not views: a view would keep every day's map (and its descriptor) open until the concatenate
+        present = [np.array(self._read_day(symbol, interval, int(day))['timestamp'])
+                   for day in range(first // DAY_MS, (stop - 1) // DAY_MS + 1)]
+        missing = expected[~np.isin(expected, np.concatenate(present))]
+        for empty_start, empty_end in self.empty_ranges(symbol, interval):
+            missing = missing[(missing < empty_start) | (missing >= empty_end)]
+        return _contiguous_runs(missing, step)
+
+    def backfill(self, symbol, interval, start, end, source=None):
+        """
+        Download only the missing ranges of [start, end) and store them. Returns candles written.
+
+        Concurrent backfills of one (symbol, interval) run one after another,
+        so the second finds the first's candles on disk. No store-wide lock is
+        held while downloading.
+        """
+        source = source or self.source
+        step = interval_to_ms(interval)
+        written = 0
+        with self._key_lock('backfill', symbol, interval):
+            for gap_start, gap_end in self.missing_ranges(symbol, interval, start, end):
+                if source is None:
+                    raise ValueError(f"No kline source to backfill {symbol} {interval} from.")
+                logger.info("Backfilling %s %s candles from %d to %d", symbol, interval, gap_start, gap_end)
+                cursor = gap_start
+                while cursor < gap_end:
+                    klines = source.get_klines(symbol=symbol, interval=interval, startTime=cursor,
+                                               endTime=gap_end - 1, limit=MAX_KLINES_PER_REQUEST)
+                    timestamps, values = klines_to_arrays(klines)
+                    if not len(timestamps):
+                        break  # the exchange has no candles here (listing gap or maintenance)
+                    written += self.write(symbol, interval, timestamps, values)
+                    cursor = int(timestamps[-1]) + step
+                self._remember_empty(symbol, interval, gap_start, gap_end)
+        return written
+
+    def _remember_empty(self, symbol, interval, start, end):
+        """After downloading [start, end), record whatever is still missing there as empty on the exchange."""
+        step = interval_to_ms(interval)
+        end = min(end, self._closed_end(step) - EMPTY_RANGE_MIN_AGE_MS)
+        if start >= end:
+            return
+        with self._file_lock(symbol, interval):
+            empty = self.missing_ranges(symbol, interval, start, end)
+            if empty:
+                logger.info("No %s %s candles on the exchange in %s; not asking again.", symbol, interval, empty)
+                self._record_empty(symbol, interval, empty)
+
+    def load(self, symbol, interval, start, end):
+        """
+        Read stored candles with open times in [start, end) without touching the network.
+
+        Returns:
+            tuple: (int64 timestamps, float64 (rows, 5) OHLCV values).
+        """
+        pieces = []
+        for day in range(start // DAY_MS, (max(end, start + 1) - 1) // DAY_MS + 1):
+            data = self._read_day(symbol, interval, day)
+            lo, hi = np.searchsorted(data['timestamp'], [start, end], side='left')
+            pieces.append(np.array(data[lo:hi]))  # a copy, so the map can be unmapped once evicted
+        rows = np.concatenate(pieces) if pieces else np.empty(0, dtype=CANDLE_DTYPE)
+        values = np.column_stack([rows[f] for f in PRICE_FIELDS]) if len(rows) else np.empty((0, len(PRICE_FIELDS)))
+        return np.asarray(rows['timestamp']), values
+
+    def history(self, symbol, interval, start, end, source=None):
+        """Backfill any gaps in [start, end), then load the range from disk."""
+        self.backfill(symbol, interval, start, end, source=source)
+        return self.load(symbol, interval, start, end)
+
+    def history_frame(self, symbol, interval, start, end, source=None):
+        return arrays_to_frame(*self.history(symbol, interval, start, end, source=source))
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_candle_store():
+    """Process-wide store rooted at $CANDLE_STORE_DIR (default ./candle_store)."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = CandleStore(os.getenv('CANDLE_STORE_DIR', os.path.join(os.getcwd(), 'candle_store')))
+        return _default_store
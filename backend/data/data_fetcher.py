@@ -1,59 +1,61 @@
 import logging
-from binance.client import Client
-import pandas as pd
-import numpy as np
-from collections import deque
-from datetime import datetime
 import random
 
-from backend.exchange.exchange_data import fetch_ohlcv_data as external_ohlcv_data
+from backend.data.indicators import rsi_series, macd_series
+from backend.data.market_hub import get_market_hub
 
 logging.basicConfig(level=logging.DEBUG)
 
 class DataFetcher:
-    def __init__(self, api_key, api_secret, trade_symbol=None, buffer_limit=120, use_external=False):
+    """
+    Per-symbol view onto the process-wide MarketDataHub.
+
+    Constructing a DataFetcher is cheap: the exchange client, candle buffers
+    and indicator state are owned by the hub and shared by every fetcher built
+    with the same credentials. ``buffer_limit`` is the minimum candle capacity
+    of the hub's buffers (the hub's default if None).
+    """
+
+    def __init__(self, api_key, api_secret, trade_symbol=None, buffer_limit=None, use_external=False, hub=None):
         self.api_key = api_key
         self.api_secret = api_secret
         self.trade_symbol = trade_symbol
-        self.buffer_limit = buffer_limit
-        self.ohlcv_buffer = deque(maxlen=self.buffer_limit)
         self.use_external = use_external
+        self.interval = '1h'
 
         if not self.use_external:
             if not self.api_key or not self.api_secret:
                 logging.error("API Key or Secret is missing!")
                 raise ValueError("API key and secret must be provided")
-
-            logging.info("Initializing Binance Client with provided API keys.")
-            self.client = Client(self.api_key, self.api_secret)
         else:
             logging.info("DataFetcher using external (mock/simulated) data source.")
 
+        hub_options = {} if buffer_limit is None else {'buffer_limit': buffer_limit}
+        self.hub = hub or get_market_hub(self.api_key, self.api_secret, use_external=self.use_external, **hub_options)
+        if buffer_limit is not None and buffer_limit > self.hub.buffer_limit:
+            self.hub.buffer_limit = buffer_limit
+        self.buffer_limit = self.hub.buffer_limit
+
+    @property
+    def client(self):
+        return self.hub.client
+
+    @property
+    def ohlcv_buffer(self):
+        return self.hub.stream(self.trade_symbol, self.interval).buffer
+
+    @property
+    def indicators(self):
+        return self.hub.stream(self.trade_symbol, self.interval).indicators
+
     def fetch_ohlcv_data(self, symbol=None, interval='1h', limit=100):
         symbol = symbol or self.trade_symbol
         logging.debug(f"Fetching OHLCV data for {symbol}, interval {interval}, limit {limit}")
 
         try:
-            if self.use_external:
-                df = external_ohlcv_data(symbol=symbol, interval=interval, limit=limit)
-            else:
-                klines = self.client.get_historical_klines(symbol, interval, limit=limit)
-                data = [
-                    [
-                        pd.to_datetime(k[0], unit='ms'),
-                        float(k[1]),
-                        float(k[2]),
-                        float(k[3]),
-                        float(k[4]),
-                        float(k[5])
-                    ]
-                    for k in klines
-                ]
-                df = pd.DataFrame(data, columns=['Timestamp', 'Open', 'High', 'Low', 'Close', 'Volume'])
-
-            for _, row in df.iterrows():
-                self.ohlcv_buffer.append(row.to_dict())
-
+            df = self.hub.fetch_ohlcv_data(symbol, interval=interval, limit=limit)
+            if symbol == self.trade_symbol:
+                self.interval = interval
             logging.info(f"Fetched {len(df)} OHLCV records.")
             return df
         except Exception as e:
@@ -61,60 +63,32 @@ class DataFetcher:
             raise
 
     def get_latest_feature_frame(self):
-        if len(self.ohlcv_buffer) < 20:
-            logging.warning("Not enough data in buffer for feature frame.")
-            return None
-
-        df = pd.DataFrame(list(self.ohlcv_buffer)).copy()
-        df.set_index('Timestamp', inplace=True)
-
-        df['EMA_10'] = df['Close'].ewm(span=10, adjust=False).mean()
-        df['RSI_14'] = self.calculate_rsi(df['Close'], period=14)
-        df['MACD'], df['MACD_signal'] = self.calculate_macd(df['Close'])
-
-        df.dropna(inplace=True)
-        latest = df.iloc[-1]
-        features = latest[['Close', 'EMA_10', 'RSI_14', 'MACD', 'MACD_signal']]
-
-        logging.debug(f"Feature vector for model: {features.to_dict()}")
-        return features.values.reshape(1, -1)
+        return self.hub.get_latest_feature_frame(self.trade_symbol, self.interval)
 
     def calculate_rsi(self, series, period=14):
-        delta = series.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        return 100 - (100 / (1 + rs))
+        return rsi_series(series, period=period)
 
     def calculate_macd(self, series, fast=12, slow=26, signal=9):
-        exp1 = series.ewm(span=fast, adjust=False).mean()
-        exp2 = series.ewm(span=slow, adjust=False).mean()
-        macd = exp1 - exp2
-        signal_line = macd.ewm(span=signal, adjust=False).mean()
-        return macd, signal_line
+        return macd_series(series, fast=fast, slow=slow, signal=signal)
 
     def fetch_order_book(self, symbol=None):
         symbol = symbol or self.trade_symbol
         if self.use_external:
             logging.warning("Order book is not available in simulated mode.")
             return {}
+        streamed = self.hub.order_book(symbol)
+        if streamed is not None:
+            return streamed
         try:
-            return self.client.get_order_book(symbol=symbol)
+            return self.hub.rate_limiter.call('order_book', self.client.get_order_book, symbol=symbol)
         except Exception as e:
             logging.error(f"Error fetching order book: {str(e)}")
             raise
 
     def fetch_ticker(self, symbol=None):
         symbol = symbol or self.trade_symbol
-        if self.use_external:
-            return {
-                'symbol': symbol,
-                'priceChange': str(round(random.uniform(-50, 50), 2)),
-                'lastPrice': str(round(random.uniform(25000, 30000), 2)),
-                'volume': str(round(random.uniform(100, 1000), 2))
-            }
         try:
-            return self.client.get_symbol_ticker(symbol=symbol)
+            return self.hub.fetch_ticker(symbol)
         except Exception as e:
             logging.error(f"Error fetching ticker: {str(e)}")
             raise
@@ -123,28 +97,28 @@ class DataFetcher:
         if self.use_external:
             return {'USDT': {'free': round(random.uniform(50, 1500), 2)}}
         try:
-            return self.client.get_account()
+            return self.hub.rate_limiter.call('account', self.client.get_account)
         except Exception as e:
             logging.error(f"Error fetching balance: {str(e)}")
             raise
 
     def fetch_chart_data(self, symbol=None, interval='1m', limit=20):
         symbol = symbol or self.trade_symbol
-        if self.use_external:
-            df = external_ohlcv_data(symbol=symbol, interval=interval, limit=limit)
-            return df.to_dict(orient='records')
         try:
-            klines = self.client.get_klines(symbol=symbol, interval=interval, limit=limit)
+            stream = self.hub.refresh_ohlcv(symbol, interval=interval, limit=limit)
+            with stream.lock:
+                timestamps, values = stream.buffer.view()
+                timestamps, values = timestamps[-limit:].tolist(), values[-limit:].tolist()
             return [
                 {
-                    "timestamp": k[0],
-                    "open": float(k[1]),
-                    "high": float(k[2]),
-                    "low": float(k[3]),
-                    "close": float(k[4]),
-                    "volume": float(k[5])
+                    "timestamp": ts,
+                    "open": v[0],
+                    "high": v[1],
+                    "low": v[2],
+                    "close": v[3],
+                    "volume": v[4]
                 }
-                for k in klines
+                for ts, v in zip(timestamps, values)
             ]
         except Exception as e:
             logging.error(f"Error fetching chart data: {str(e)}")
@@ -0,0 +1,299 @@
+# backend/data/indicators.py
+
+import copy
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+FEATURE_COLUMNS = ['Close', 'EMA_10', 'RSI_14', 'MACD', 'MACD_signal']
+
+
+# ===========================
+# Batch (pandas) reference implementations
+# ===========================
+def ema_series(series, span):
+    return series.ewm(span=span, adjust=False).mean()
+
+
+def rsi_series(series, period=14):
+    """Wilder RSI: gains and losses smoothed with alpha = 1 / period."""
+    delta = series.diff()
+    gain = delta.clip(lower=0)
+    loss = -delta.clip(upper=0)
+    avg_gain = gain.ewm(alpha=1.0 / period, adjust=False, min_periods=period).mean()
+    avg_loss = loss.ewm(alpha=1.0 / period, adjust=False, min_periods=period).mean()
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+
+def macd_series(series, fast=12, slow=26, signal=9):
+    macd = ema_series(series, fast) - ema_series(series, slow)
+    signal_line = ema_series(macd, signal)
+    return macd, signal_line
+
+
+def feature_frame(closes):
+    """Full-history feature frame, the batch counterpart of IndicatorEngine."""
+    close = pd.Series(closes, dtype=float)
+    df = pd.DataFrame({'Close': close})
+    df['EMA_10'] = ema_series(close, 10)
+    df['RSI_14'] = rsi_series(close, 14)
+    df['MACD'], df['MACD_signal'] = macd_series(close)
+    return df
+
+
+def rolling_mean(values, window):
+    """Trailing mean over ``window`` rows from cumulative sums; the first ``window - 1`` entries are NaN."""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        sums = np.cumsum(np.concatenate(([0.0], values)))
+        out[window - 1:] = (sums[window:] - sums[:-window]) / window
+    return out
+
+
+def hold_last_signal(signal):
+    """Carry the last non-zero signal forward over zeros (ties and missing values mean "no new signal")."""
+    last = np.where(signal != 0, np.arange(len(signal)), 0)
+    np.maximum.accumulate(last, out=last)
+    return signal[last]
+
+
+def sma_crossover_positions(closes, short_window=50, long_window=200):
+    """
+    Target position after every close for the SMA crossover, in one pass.
+
+    Long (1) while the short SMA is above the long SMA, short (-1) while it is
+    below, unchanged when they are equal, and flat (0) until both averages
+    exist. The batch counterpart of :class:`SMACrossover`.
+    """
+    spread = rolling_mean(closes, short_window) - rolling_mean(closes, long_window)
+    return hold_last_signal(np.sign(np.nan_to_num(spread)).astype(np.int8))
+
+
+# ===========================
+# Streaming (O(1) per candle) implementations
+# ===========================
+class StreamingEMA:
+    """Exponential moving average matching ``Series.ewm(adjust=False)``."""
+
+    __slots__ = ('alpha', 'value')
+
+    def __init__(self, span=None, alpha=None):
+        self.alpha = alpha if alpha is not None else 2.0 / (span + 1.0)
+        self.value = None
+
+    def update(self, x):
+        if self.value is None:
+            self.value = float(x)
+        else:
+            # Same arithmetic as pandas' ewm kernel with adjust=False
+            old_wt = 1.0 - self.alpha
+            self.value = (old_wt * self.value + self.alpha * x) / (old_wt + self.alpha)
+        return self.value
+
+
+class StreamingSMA:
+    """
+    Simple moving average over the last ``window`` values, kept as a running sum.
+
+    The sum is recomputed exactly once per ``window`` updates so floating-point
+    drift from the add/subtract pairs cannot accumulate.
+    """
+
+    __slots__ = ('window', 'values', 'total', 'updates')
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.updates = 0
+
+    def update(self, x):
+        x = float(x)
+        if len(self.values) == self.window:
+            self.total -= self.values[0]
+        self.values.append(x)
+        self.total += x
+        self.updates += 1
+        if self.updates % self.window == 0:
+            self.total = math.fsum(self.values)
+        return self.value
+
+    @property
+    def value(self):
+        if len(self.values) < self.window:
+            return None
+        return self.total / self.window
+
+
+class SMACrossover:
+    """
+    Short/long SMA crossover signal for one close stream, matching :func:`sma_crossover_positions`.
+
+    ``update`` takes the next close and returns the target position
+    (1 long, -1 short, 0 until both averages exist).
+    """
+
+    __slots__ = ('short', 'long', 'position')
+
+    def __init__(self, short_window=50, long_window=200):
+        self.short = StreamingSMA(short_window)
+        self.long = StreamingSMA(long_window)
+        self.position = 0
+
+    def update(self, close):
+        short_sma = self.short.update(close)
+        long_sma = self.long.update(close)
+        if short_sma is not None and long_sma is not None:
+            if short_sma > long_sma:
+                self.position = 1
+            elif short_sma < long_sma:
+                self.position = -1
+        return self.position
+
+    def update_many(self, closes):
+        for close in closes:
+            self.update(close)
+        return self.position
+
+    @property
+    def ready(self):
+        return self.long.value is not None and self.short.value is not None
+
+    @property
+    def short_sma(self):
+        return self.short.value
+
+    @property
+    def long_sma(self):
+        return self.long.value
+
+
+class StreamingRSI:
+    """Wilder RSI over closes, matching :func:`rsi_series`."""
+
+    __slots__ = ('period', 'prev_close', 'avg_gain', 'avg_loss', 'count', 'value')
+
+    def __init__(self, period=14):
+        self.period = period
+        self.prev_close = None
+        self.avg_gain = StreamingEMA(alpha=1.0 / period)
+        self.avg_loss = StreamingEMA(alpha=1.0 / period)
+        self.count = 0
+        self.value = math.nan
+
+    def __copy__(self):
+        clone = StreamingRSI.__new__(StreamingRSI)
+        clone.period = self.period
+        clone.prev_close = self.prev_close
+        clone.avg_gain = copy.copy(self.avg_gain)
+        clone.avg_loss = copy.copy(self.avg_loss)
+        clone.count = self.count
+        clone.value = self.value
+        return clone
+
+    def update(self, close):
+        if self.prev_close is None:
+            self.prev_close = float(close)
+            return self.value
+
+        delta = close - self.prev_close
+        self.prev_close = float(close)
+        gain = self.avg_gain.update(delta if delta > 0 else 0.0)
+        loss = self.avg_loss.update(-delta if delta < 0 else 0.0)
+        self.count += 1
+
+        if self.count < self.period:
+            self.value = math.nan
+        elif loss == 0:
+            self.value = 100.0 if gain > 0 else math.nan
+        else:
+            self.value = 100 - (100 / (1 + gain / loss))
+        return self.value
+
+
+class StreamingMACD:
+    """MACD line and signal line, matching :func:`macd_series`."""
+
+    __slots__ = ('fast', 'slow', 'signal', 'macd', 'signal_value')
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = StreamingEMA(fast)
+        self.slow = StreamingEMA(slow)
+        self.signal = StreamingEMA(signal)
+        self.macd = None
+        self.signal_value = None
+
+    def __copy__(self):
+        clone = StreamingMACD.__new__(StreamingMACD)
+        clone.fast = copy.copy(self.fast)
+        clone.slow = copy.copy(self.slow)
+        clone.signal = copy.copy(self.signal)
+        clone.macd = self.macd
+        clone.signal_value = self.signal_value
+        return clone
+
+    def update(self, close):
+        self.macd = self.fast.update(close) - self.slow.update(close)
+        self.signal_value = self.signal.update(self.macd)
+        return self.macd, self.signal_value
+
+
+class IndicatorEngine:
+    """
+    Keeps EMA_10, RSI_14 and MACD/signal state for one candle stream.
+
+    Each closed candle costs O(1), so reading the latest feature vector no
+    longer requires rebuilding a DataFrame over the whole buffer. The most
+    recent candle can be revised in place (Binance keeps updating the open
+    candle) via ``update(close, replace_last=True)``.
+    """
+
+    def __init__(self, min_periods=20):
+        self.min_periods = min_periods
+        self.ema = StreamingEMA(10)
+        self.rsi = StreamingRSI(14)
+        self.macd = StreamingMACD()
+        self.close = None
+        self.count = 0
+        self._checkpoint = None
+
+    def _components(self):
+        return self.ema, self.rsi, self.macd, self.close, self.count
+
+    def update(self, close, replace_last=False):
+        close = float(close)
+        if replace_last and self._checkpoint is not None:
+            self.ema, self.rsi, self.macd, self.close, self.count = self._checkpoint
+        self._checkpoint = tuple(copy.copy(c) for c in self._components())
+
+        self.ema.update(close)
+        self.rsi.update(close)
+        self.macd.update(close)
+        self.close = close
+        self.count += 1
+
+    def update_many(self, closes):
+        for close in closes:
+            self.update(close)
+
+    @property
+    def ready(self):
+        return self.count >= self.min_periods and not math.isnan(self.rsi.value)
+
+    def latest(self):
+        """Latest features as a dict keyed by FEATURE_COLUMNS, or None if not ready."""
+        if not self.ready:
+            return None
+        values = (self.close, self.ema.value, self.rsi.value, self.macd.macd, self.macd.signal_value)
+        return dict(zip(FEATURE_COLUMNS, values))
+
+    def latest_features(self):
+        """Latest features shaped (1, len(FEATURE_COLUMNS)), or None if not ready."""
+        latest = self.latest()
+        if latest is None:
+            return None
+        return np.array([list(latest.values())], dtype=float)
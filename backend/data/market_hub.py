@@ -0,0 +1,353 @@
+# backend/data/market_hub.py
+
+import json
+import logging
+import random
+import threading
+import time
+
+import numpy as np
+
+from backend.exchange.exchange_data import fetch_ohlcv_data as external_ohlcv_data
+from backend.exchange.rate_limiter import get_rate_limiter, order_book_weight, tickers_weight
+from backend.data.indicators import IndicatorEngine
+from backend.data.order_book import OrderBook
+from backend.data.candle_store import get_candle_store
+from backend.data.kline_sources import MAX_KLINES_PER_REQUEST, BinanceKlineSource, interval_to_ms
+from backend.data.ring_buffer import OHLCVRingBuffer, frame_to_arrays, klines_to_arrays
+
+logger = logging.getLogger(__name__)
+
+
+class MarketStream:
+    """
+    Candle buffer plus streaming indicator state for one (symbol, interval).
+
+    ``lock`` guards the buffer and indicators and is only held while they are
+    read or merged into, never across a download, so pushed candles are never
+    stuck behind a REST call. ``refresh_lock`` lets one REST refresh run at a
+    time.
+    """
+
+    def __init__(self, symbol, interval, capacity):
+        self.symbol = symbol
+        self.interval = interval
+        self.buffer = OHLCVRingBuffer(capacity)
+        self.indicators = IndicatorEngine()
+        self.refreshed_at = 0.0
+        self.lock = threading.RLock()
+        self.refresh_lock = threading.Lock()
+
+    def reset(self):
+        self.buffer.clear()
+        self.indicators = IndicatorEngine()
+
+    def ingest(self, timestamps, values):
+        """Append candles to the buffer and advance indicator state for the rows it accepted."""
+        appended = self.buffer.append_arrays(timestamps, values)
+        closes = values[appended.first:, 3]
+        if appended.revised:
+            # The still-open candle was revised; roll its indicator step back and redo it
+            self.indicators.update(closes[0], replace_last=True)
+            closes = closes[1:]
+        self.indicators.update_many(closes)
+        return appended
+
+    def ingest_frame(self, df):
+        return self.ingest(*frame_to_arrays(df))
+
+    def merge(self, timestamps, values):
+        """
+        Ingest downloaded candles.
+
+        Candles pushed while a download ran (or before a short buffer was
+        backfilled) would make the older downloaded rows look stale. When the
+        download reaches further back than the buffer, the buffer is rebuilt
+        from it with the newer buffered rows on top.
+        """
+        buffered_timestamps, buffered_values = self.buffer.view()
+        if len(buffered_timestamps) and len(timestamps) and timestamps[0] < buffered_timestamps[0]:
+            keep = buffered_timestamps >= timestamps[-1]
+            pushed_timestamps, pushed_values = buffered_timestamps[keep].copy(), buffered_values[keep].copy()
+            self.reset()
+            self.ingest(timestamps, values)
+            return self.ingest(pushed_timestamps, pushed_values)
+        return self.ingest(timestamps, values)
+
+    def latest_feature_frame(self):
+        if len(self.buffer) < 20:
+            logger.warning("Not enough data in %s %s buffer for feature frame.", self.symbol, self.interval)
+            return None
+        features = self.indicators.latest()
+        if features is None:
+            logger.warning("Indicator state for %s %s not ready for feature frame.", self.symbol, self.interval)
+            return None
+        logger.debug("Feature vector for model (%s %s): %s", self.symbol, self.interval, features)
+        return self.indicators.latest_features()
+
+
+class MarketDataHub:
+    """
+    Process-wide market data cache for many symbols and intervals.
+
+    One exchange client is shared by every caller. Candles live in one
+    MarketStream per (symbol, interval) and are topped up incrementally from
+    the newest buffered candle, so repeated reads inside ``ohlcv_ttl`` are
+    served from memory. When a CandleStore is attached, cold buffers are seeded
+    from disk and only missing history is downloaded. Tickers for every
+    tracked symbol are refreshed with a single request. A symbol stays tracked
+    until nobody has asked for it for ``ticker_retention`` seconds. Every
+    request waits on the shared spot rate limiter, behind any pending order
+    traffic.
+    """
+
+    def __init__(self, api_key=None, api_secret=None, use_external=False,
+                 buffer_limit=MAX_KLINES_PER_REQUEST, ticker_ttl=2.0, ohlcv_ttl=5.0, store=None, rate_limiter=None,
+                 ticker_retention=60.0):
+        if not use_external and (not api_key or not api_secret):
+            logger.error("API Key or Secret is missing!")
+            raise ValueError("API key and secret must be provided")
+
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.use_external = use_external
+        self.buffer_limit = buffer_limit
+        self.ticker_ttl = ticker_ttl
+        self.ticker_retention = ticker_retention
+        self.ohlcv_ttl = ohlcv_ttl
+        self.store = store
+        self.rate_limiter = rate_limiter or get_rate_limiter('spot')
+        self.kline_source = BinanceKlineSource(lambda: self.client, rate_limiter=self.rate_limiter)
+
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._streams = {}
+        self._streams_lock = threading.Lock()
+        self._tickers = {}
+        self._tickers_fetched_at = 0.0
+        self._tickers_requested = {}  # symbol -> monotonic time it was last asked for
+        self._tickers_lock = threading.Lock()
+        self._tickers_fetch_lock = threading.Lock()
+        self._streamed_at = {}  # symbol -> monotonic time of its last pushed trade
+        self._order_books = {}  # symbol -> OrderBook kept current by the WebSocket ingestor
+        self._order_books_lock = threading.Lock()
+
+    @property
+    def client(self):
+        """The shared Binance client, constructed on first use (its constructor pings the API)."""
+        if self.use_external:
+            return None
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from binance.client import Client  # deferred: python-binance takes ~0.8s to import
+                    logger.info("Initializing shared Binance Client for market data hub.")
+                    self._client = Client(self.api_key, self.api_secret)
+        return self._client
+
+    def stream(self, symbol, interval='1h'):
+        key = (symbol, interval)
+        stream = self._streams.get(key)
+        if stream is None:
+            with self._streams_lock:
+                stream = self._streams.get(key)
+                if stream is None:
+                    stream = self._streams[key] = MarketStream(symbol, interval, self.buffer_limit)
+        return stream
+
+    # -------- OHLCV --------
+    def _download_klines(self, stream, limit):
+        """
+        Download the candles the (symbol, interval) buffer is missing, without holding its lock.
+
+        Returns:
+            tuple: (int64 timestamps, (rows, 5) float64 values).
+        """
+        step = interval_to_ms(stream.interval)
+        now = int(time.time() * 1000)
+        with stream.lock:
+            last_ts = stream.buffer.last_timestamp
+            if last_ts is not None and (now - last_ts) // step + 1 > MAX_KLINES_PER_REQUEST:
+                stream.reset()
+                last_ts = None
+            buffered = len(stream.buffer)
+
+        stored_timestamps, stored_values = klines_to_arrays([])
+        if last_ts is None and self.store is not None:
+            # Closed history comes from the local store, which only downloads ranges it is missing
+            stored_timestamps, stored_values = self.store.history(stream.symbol, stream.interval, now - limit * step,
+                                                                  now, source=self.kline_source)
+            if len(stored_timestamps):
+                last_ts = int(stored_timestamps[-1])
+                buffered = min(len(stored_timestamps), stream.buffer.capacity)
+
+        if last_ts is not None and buffered >= limit:
+            # Top up from the newest buffered (possibly still open) candle onwards
+            klines = self.kline_source.get_klines(stream.symbol, stream.interval,
+                                                  startTime=last_ts, limit=MAX_KLINES_PER_REQUEST)
+        else:
+            klines = self.kline_source.get_klines(stream.symbol, stream.interval,
+                                                  limit=min(max(limit, 1), MAX_KLINES_PER_REQUEST))
+        timestamps, values = klines_to_arrays(klines)
+        if len(stored_timestamps):
+            older = stored_timestamps < timestamps[0] if len(timestamps) else slice(None)
+            timestamps = np.concatenate((stored_timestamps[older], timestamps))
+            values = np.concatenate((stored_values[older], values))
+        return timestamps, values
+
+    def refresh_ohlcv(self, symbol, interval='1h', limit=100, force=False):
+        """
+        Bring the (symbol, interval) buffer up to date unless it is fresher than ``ohlcv_ttl``.
+
+        One refresh per stream runs at a time. The stream lock is only taken to
+        check freshness and to merge the result, so pushed candles are applied
+        while the download is in flight.
+        """
+        stream = self.stream(symbol, interval)
+        with stream.refresh_lock:
+            now = time.monotonic()
+            with stream.lock:
+                fresh = now - stream.refreshed_at < self.ohlcv_ttl and len(stream.buffer) >= min(limit, stream.buffer.capacity)
+                if fresh and not force:
+                    return stream
+
+            if self.use_external:
+                timestamps, values = frame_to_arrays(external_ohlcv_data(self.api_key, self.api_secret, symbol=symbol,
+                                                                         interval=interval, limit=limit))
+            else:
+                timestamps, values = self._download_klines(stream, limit)
+            with stream.lock:
+                stream.merge(timestamps, values)
+                stream.refreshed_at = now
+        return stream
+
+    def fetch_ohlcv_data(self, symbol, interval='1h', limit=100):
+        stream = self.refresh_ohlcv(symbol, interval, limit)
+        with stream.lock:
+            df = stream.buffer.to_frame()
+        return df.iloc[-limit:].reset_index(drop=True)
+
+    def get_latest_feature_frame(self, symbol, interval='1h'):
+        stream = self.stream(symbol, interval)
+        with stream.lock:
+            return stream.latest_feature_frame()
+
+    # -------- PUSHED UPDATES --------
+    # Called by the WebSocket ingestor; data pushed here is served without REST calls while fresh.
+    def apply_kline(self, symbol, interval, open_time, ohlcv):
+        """Merge one streamed candle (possibly the still-open one) into the buffer and indicators."""
+        stream = self.stream(symbol, interval)
+        with stream.lock:
+            stream.ingest(np.array([open_time], dtype=np.int64), np.array([ohlcv], dtype=np.float64))
+            stream.refreshed_at = time.monotonic()
+
+    def apply_trade(self, symbol, price):
+        with self._tickers_lock:
+            self._tickers[symbol] = {'symbol': symbol, 'price': str(price)}
+            self._streamed_at[symbol] = time.monotonic()
+
+    def local_order_book(self, symbol):
+        """The OrderBook for ``symbol``, created (unsynced) on first use."""
+        book = self._order_books.get(symbol)
+        if book is None:
+            with self._order_books_lock:
+                book = self._order_books.setdefault(symbol, OrderBook(symbol))
+        return book
+
+    def fetch_depth_snapshot(self, symbol, limit=1000):
+        """REST depth snapshot used to (re)synchronise a local order book."""
+        self.rate_limiter.acquire('order_book', weight=order_book_weight(limit))
+        return self.client.get_order_book(symbol=symbol, limit=limit)
+
+    def order_book(self, symbol, limit=20):
+        """Top levels of the local book in REST depth format, or None if it is not synced."""
+        book = self._order_books.get(symbol)
+        return None if book is None else book.depth(limit)
+
+    # -------- TICKERS --------
+    def _download_tickers(self, symbols):
+        if self.use_external:
+            return [
+                {
+                    'symbol': s,
+                    'priceChange': str(round(random.uniform(-50, 50), 2)),
+                    'lastPrice': str(round(random.uniform(25000, 30000), 2)),
+                    'volume': str(round(random.uniform(100, 1000), 2))
+                }
+                for s in symbols
+            ]
+        if len(symbols) == 1:
+            return [self.rate_limiter.call('ticker', self.client.get_symbol_ticker, symbol=symbols[0])]
+        return self.rate_limiter.call('tickers', self.client.get_symbol_ticker, weight=tickers_weight(len(symbols)),
+                                      symbols=json.dumps(symbols, separators=(',', ':')))
+
+    def _tickers_due(self):
+        """Symbols to download now, or None when the cached tickers will do. Call with ``_tickers_lock`` held."""
+        now = time.monotonic()
+        live = {s for s, at in self._streamed_at.items() if now - at < self.ticker_ttl}
+        tracked = set(self._tickers_requested) - live
+        stale = now - self._tickers_fetched_at >= self.ticker_ttl
+        if tracked and (stale or not tracked.issubset(self._tickers)):
+            return sorted(tracked)
+        return None
+
+    def fetch_tickers(self, symbols):
+        """
+        Latest prices for ``symbols``; all tracked symbols are refreshed in one request.
+
+        Symbols with a trade pushed by the WebSocket ingestor within ``ticker_ttl``
+        are served from that and left out of the request. Symbols not asked for
+        within ``ticker_retention`` are dropped from the request. One download
+        runs at a time and ``_tickers_lock`` is not held across it, so pushed
+        trades are applied meanwhile.
+        """
+        with self._tickers_lock:
+            now = time.monotonic()
+            for s in symbols:
+                self._tickers_requested[s] = now
+            for s in [s for s, at in self._tickers_requested.items() if now - at >= self.ticker_retention]:
+                del self._tickers_requested[s]
+                self._tickers.pop(s, None)
+            due = self._tickers_due()
+            if due is None:
+                return {s: self._tickers.get(s) for s in symbols}
+
+        with self._tickers_fetch_lock:
+            with self._tickers_lock:
+                due = self._tickers_due()  # another caller may have refreshed them meanwhile
+            if due is not None:
+                downloaded = self._download_tickers(due)
+                with self._tickers_lock:
+                    for ticker in downloaded:
+                        if ticker['symbol'] not in self._streamed_at or \
+                                time.monotonic() - self._streamed_at[ticker['symbol']] >= self.ticker_ttl:
+                            self._tickers[ticker['symbol']] = ticker
+                    self._tickers_fetched_at = time.monotonic()
+        with self._tickers_lock:
+            return {s: self._tickers.get(s) for s in symbols}
+
+    def fetch_ticker(self, symbol):
+        return self.fetch_tickers([symbol])[symbol]
+
+
+_hubs = {}
+_hubs_lock = threading.Lock()
+
+
+def get_market_hub(api_key=None, api_secret=None, use_external=False, **kwargs):
+    """
+    Return the process-wide hub for these credentials, creating it on first use.
+
+    ``kwargs`` configure a new hub. For an existing hub only a larger
+    ``buffer_limit`` is applied, to the streams it creates from then on.
+    """
+    key = (api_key, bool(use_external))
+    with _hubs_lock:
+        hub = _hubs.get(key)
+        if hub is None:
+            if not use_external:
+                kwargs.setdefault('store', get_candle_store())
+            hub = _hubs[key] = MarketDataHub(api_key, api_secret, use_external=use_external, **kwargs)
+        elif kwargs.get('buffer_limit', 0) > hub.buffer_limit:
+            hub.buffer_limit = kwargs['buffer_limit']
+        return hub
@@ -0,0 +1,208 @@
+# backend/data/order_book.py
+
+import logging
+import threading
+from bisect import bisect_left, insort
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Diff events buffered while waiting for a snapshot; older ones are dropped (forcing a new snapshot)
+MAX_PENDING_EVENTS = 2000
+
+
+class OrderBookGap(Exception):
+    """Raised when a diff-depth event does not follow the previous one; the book needs a new snapshot."""
+
+
+class OrderBook:
+    """
+    In-memory L2 order book for one symbol, kept current from diff-depth events.
+
+    Follows Binance's local order book procedure. Diff events that arrive
+    before a snapshot are buffered. ``load_snapshot`` replays those newer
+    than the snapshot. After that each event must start at the previous
+    event's final update id + 1. On a gap the book marks itself unsynced and
+    raises ``OrderBookGap``, and reads return None until a new snapshot is
+    loaded.
+
+    Each side is a dict of price -> quantity plus a sorted list of prices
+    (negated for bids so index 0 is always the best level). Updates and
+    depth-at-price lookups are a dict operation plus a bisect. Best bid/ask
+    reads are O(1), and VWAP walks only the levels it consumes.
+    """
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.last_update_id = None
+        self.synced = False
+        self.updates = 0
+        self._bids, self._bid_keys = {}, []
+        self._asks, self._ask_keys = {}, []
+        self._pending = deque(maxlen=MAX_PENDING_EVENTS)
+        self._lock = threading.RLock()
+
+    # -------- UPDATES --------
+    def _set(self, is_bid, price, quantity):
+        levels, keys = (self._bids, self._bid_keys) if is_bid else (self._asks, self._ask_keys)
+        key = -price if is_bid else price
+        if quantity == 0.0:
+            if levels.pop(price, None) is not None:
+                del keys[bisect_left(keys, key)]
+        else:
+            if price not in levels:
+                insort(keys, key)
+            levels[price] = quantity
+
+    def _apply_levels(self, bids, asks):
+        for price, quantity in bids:
+            self._set(True, float(price), float(quantity))
+        for price, quantity in asks:
+            self._set(False, float(price), float(quantity))
+
+    def load_snapshot(self, snapshot):
+        """
+        Replace the book with a REST depth snapshot and replay buffered diff events.
+
+        Raises:
+            OrderBookGap: If the buffered events do not connect to the snapshot.
+        """
+        with self._lock:
+            self._bids, self._bid_keys = {}, []
+            self._asks, self._ask_keys = {}, []
+            self._apply_levels(snapshot['bids'], snapshot['asks'])
+            self.last_update_id = int(snapshot['lastUpdateId'])
+            self.synced = True
+
+            pending, self._pending = list(self._pending), deque(maxlen=MAX_PENDING_EVENTS)
+            pending = [event for event in pending if event['u'] > self.last_update_id]  # rest is in the snapshot
+            if pending and pending[0]['U'] > self.last_update_id + 1:
+                self.synced = False
+                self._pending.extend(pending)  # kept for a newer snapshot
+                raise OrderBookGap(f"{self.symbol} snapshot {self.last_update_id} is older than buffered "
+                                   f"updates starting at {pending[0]['U']}.")
+            for i, event in enumerate(pending):
+                try:
+                    self._apply_event(event)
+                except OrderBookGap:
+                    self._pending.extend(pending[i:])
+                    raise
+
+    def _apply_event(self, event):
+        if event['U'] > self.last_update_id + 1:
+            self.synced = False
+            raise OrderBookGap(f"{self.symbol} update {event['U']} does not follow {self.last_update_id}.")
+        self._apply_levels(event['b'], event['a'])
+        self.last_update_id = event['u']
+        self.updates += 1
+
+    def apply_diff(self, event):
+        """
+        Apply one ``depthUpdate`` event (keys U, u, b, a).
+
+        Returns:
+            bool: True if applied, False if buffered (no snapshot yet) or stale.
+
+        Raises:
+            OrderBookGap: If updates were missed; the event is buffered for the next snapshot.
+        """
+        with self._lock:
+            if not self.synced:
+                self._pending.append(event)
+                return False
+            if event['u'] <= self.last_update_id:
+                return False
+            try:
+                self._apply_event(event)
+            except OrderBookGap:
+                self._pending.append(event)
+                raise
+            return True
+
+    def invalidate(self):
+        """Mark the book stale (e.g. after the stream disconnected) until the next snapshot."""
+        with self._lock:
+            self.synced = False
+            self._pending.clear()
+
+    # -------- QUERIES --------
+    def best_bid(self):
+        """(price, quantity) of the highest bid, or None."""
+        with self._lock:
+            if not self.synced or not self._bid_keys:
+                return None
+            price = -self._bid_keys[0]
+            return price, self._bids[price]
+
+    def best_ask(self):
+        """(price, quantity) of the lowest ask, or None."""
+        with self._lock:
+            if not self.synced or not self._ask_keys:
+                return None
+            price = self._ask_keys[0]
+            return price, self._asks[price]
+
+    def spread(self):
+        with self._lock:
+            bid, ask = self.best_bid(), self.best_ask()
+            if bid is None or ask is None:
+                return None
+            return ask[0] - bid[0]
+
+    def mid(self):
+        with self._lock:
+            bid, ask = self.best_bid(), self.best_ask()
+            if bid is None or ask is None:
+                return None
+            return (ask[0] + bid[0]) / 2
+
+    def depth_at(self, price):
+        """Resting quantity at ``price`` on either side (0.0 if no level)."""
+        with self._lock:
+            price = float(price)
+            return self._bids.get(price) or self._asks.get(price) or 0.0
+
+    def vwap(self, side, size):
+        """
+        Average fill price of a market order for ``size`` (base asset) against the book.
+
+        Args:
+            side (str): 'BUY' walks the asks, 'SELL' walks the bids.
+            size (float): Order size; must be positive.
+
+        Returns:
+            float | None: The VWAP, or None if the book is unsynced or too thin.
+
+        Raises:
+            ValueError: If ``size`` is not positive.
+        """
+        if size <= 0:
+            raise ValueError(f"vwap size must be positive, got {size}")
+        is_buy = side.upper() == 'BUY'
+        with self._lock:
+            if not self.synced:
+                return None
+            levels, keys = (self._asks, self._ask_keys) if is_buy else (self._bids, self._bid_keys)
+            remaining, cost = float(size), 0.0
+            for key in keys:
+                price = key if is_buy else -key
+                take = min(remaining, levels[price])
+                cost += take * price
+                remaining -= take
+                if remaining <= 0:
+                    return cost / size
+            return None
+
+    def depth(self, limit=20):
+        """Top ``limit`` levels per side in the REST /api/v3/depth format, or None while unsynced."""
+        with self._lock:
+            if not self.synced:
+                return None
+            return {
+                'lastUpdateId': self.last_update_id,
+                'bids': [[f"{-k:.8f}", f"{self._bids[-k]:.8f}"] for k in self._bid_keys[:limit]],
+                'asks': [[f"{k:.8f}", f"{self._asks[k]:.8f}"] for k in self._ask_keys[:limit]],
+            }
+
+    def __len__(self):
+        return len(self._bids) + len(self._asks)
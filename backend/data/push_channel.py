@@ -0,0 +1,232 @@
+# backend/data/push_channel.py
+
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = '/market'
+
+
+class _Topic:
+    """Subscribers of one symbol and what its room was last sent."""
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.subscribers = set()
+        self.price = None
+        self.sent_timestamp = None  # open time of the newest candle pushed to the room
+        self.sent_row = None        # its OHLCV values at the time, to spot revisions
+
+
+class MarketPushChannel:
+    """
+    Publish/subscribe market data for dashboards over Flask-SocketIO.
+
+    A client emits ``subscribe`` ({"symbol": ...}) on the ``/market``
+    namespace. It joins that symbol's room and receives one
+    ``chart_snapshot`` with the last ``chart_limit`` candles plus the latest
+    price. After that, ``publish`` runs every ``period`` seconds on a
+    background task. Each run reads the hub once per subscribed symbol (one
+    ticker request covers all of them) and emits one event per room with
+    only what changed since the previous run. That is a ``chart_delta`` of
+    new or revised candles and a ``price`` if it moved, so upstream load does
+    not grow with the number of dashboards. Updates that arrive between runs
+    are coalesced, and every client gets at most one event of each kind per
+    period. With ``autostart`` the background task starts on the first
+    subscription in each process, so it also runs in workers forked from a
+    preloaded app. Candles are keyed by open time. A client that joins between runs
+    may see a row in both its snapshot and the next delta, and upserting by
+    open time makes that harmless.
+
+    Args:
+        socketio (SocketIO): The app's Flask-SocketIO instance.
+        hub (MarketDataHub): Source of candles and tickers; fed by REST or the stream ingestor.
+        symbol (str): Default symbol for subscriptions that name none.
+        interval (str): Candle interval pushed to charts.
+        chart_limit (int): Candles in a snapshot.
+        period (float): Seconds between publish runs.
+        balance (callable): Optional zero-argument function returning the account
+            balance; pushed to subscribers every ``balance_period`` seconds when it changes.
+        balance_period (float): Seconds between balance reads.
+        autostart (bool): Call ``start`` on the first subscription.
+    """
+
+    def __init__(self, socketio, hub, symbol='BTCUSDT', interval='1m', chart_limit=200, period=1.0,
+                 balance=None, balance_period=5.0, namespace=NAMESPACE, autostart=False):
+        self.socketio = socketio
+        self.hub = hub
+        self.symbol = symbol
+        self.interval = interval
+        self.chart_limit = chart_limit
+        self.period = period
+        self.balance = balance
+        self.balance_period = balance_period
+        self.namespace = namespace
+        self.autostart = autostart
+
+        self.events = {'chart_snapshot': 0, 'chart_delta': 0, 'price': 0, 'balance': 0}
+        self.publishes = 0
+        self._topics = {}
+        self._lock = threading.Lock()
+        self._balance = None
+        self._balance_read_at = 0.0
+        self._running = False
+        self._started_pid = None
+
+    # -------- SUBSCRIPTIONS --------
+    def register(self):
+        """Attach the subscribe/unsubscribe/disconnect handlers to the SocketIO namespace."""
+        from flask import request  # deferred: only the web process needs Flask
+        from flask_socketio import join_room, leave_room
+
+        @self.socketio.on('subscribe', namespace=self.namespace)
+        def on_subscribe(data=None):
+            symbol = ((data or {}).get('symbol') or self.symbol).upper()
+            join_room(self._room(symbol))
+            self.subscribe(request.sid, symbol)
+
+        @self.socketio.on('unsubscribe', namespace=self.namespace)
+        def on_unsubscribe(data=None):
+            symbol = ((data or {}).get('symbol') or self.symbol).upper()
+            leave_room(self._room(symbol))
+            self.unsubscribe(request.sid, symbol)
+
+        @self.socketio.on('disconnect', namespace=self.namespace)
+        def on_disconnect(*args):
+            self.unsubscribe(request.sid)
+
+        return self
+
+    @staticmethod
+    def _room(symbol):
+        return f"market:{symbol}"
+
+    def subscribe(self, sid, symbol):
+        """Track ``sid`` under ``symbol`` and send it a snapshot (the caller has joined the room)."""
+        if self.autostart:
+            self.start()
+        with self._lock:
+            topic = self._topics.setdefault(symbol, _Topic(symbol))
+            topic.subscribers.add(sid)
+        timestamps, values = self._candles(symbol)
+        with self._lock:
+            if topic.sent_timestamp is None and len(timestamps):
+                topic.sent_timestamp, topic.sent_row = int(timestamps[-1]), values[-1].copy()
+            price = topic.price
+        self._emit('chart_snapshot', {'symbol': symbol, 'interval': self.interval,
+                                      'candles': _rows(timestamps[-self.chart_limit:], values[-self.chart_limit:])},
+                   to=sid)
+        if price is not None:
+            self._emit('price', {'symbol': symbol, 'price': price}, to=sid)
+        if self._balance is not None:
+            self._emit('balance', self._balance, to=sid)
+
+    def unsubscribe(self, sid, symbol=None):
+        """Stop tracking ``sid`` for ``symbol`` (all symbols if None); topics left without subscribers are dropped."""
+        with self._lock:
+            topics = [self._topics[symbol]] if symbol in self._topics else \
+                [] if symbol is not None else list(self._topics.values())
+            for topic in topics:
+                topic.subscribers.discard(sid)
+                if not topic.subscribers:
+                    del self._topics[topic.symbol]
+
+    def subscribers(self):
+        with self._lock:
+            return {symbol: len(topic.subscribers) for symbol, topic in self._topics.items() if topic.subscribers}
+
+    # -------- PUBLISHING --------
+    def _candles(self, symbol):
+        stream = self.hub.refresh_ohlcv(symbol, self.interval, self.chart_limit)
+        with stream.lock:
+            timestamps, values = stream.buffer.view()
+            return timestamps.copy(), values.copy()
+
+    def _emit(self, event, data, to):
+        self.socketio.emit(event, data, to=to, namespace=self.namespace)
+        self.events[event] += 1
+
+    def publish(self):
+        """Push what changed since the previous run to every subscribed room."""
+        with self._lock:
+            topics = [topic for topic in self._topics.values() if topic.subscribers]
+        self.publishes += 1
+        if not topics:
+            return
+
+        tickers = self.hub.fetch_tickers([topic.symbol for topic in topics])
+        for topic in topics:
+            room = self._room(topic.symbol)
+            candles = self._delta(topic)
+            if candles:
+                self._emit('chart_delta', {'symbol': topic.symbol, 'interval': self.interval, 'candles': candles},
+                           to=room)
+            ticker = tickers.get(topic.symbol) or {}
+            price = ticker.get('price') or ticker.get('lastPrice')
+            with self._lock:
+                moved = price is not None and price != topic.price
+                if moved:
+                    topic.price = price
+            if moved:
+                self._emit('price', {'symbol': topic.symbol, 'price': price}, to=room)
+
+        if self.balance is not None and time.monotonic() - self._balance_read_at >= self.balance_period:
+            self._balance_read_at = time.monotonic()
+            balance = self.balance()
+            if balance != self._balance:
+                self._balance = balance
+                self._emit('balance', balance, to=None)  # whole namespace, once per client
+
+    def _delta(self, topic):
+        """Candles newer than, or revising, the last one sent to ``topic``'s room."""
+        timestamps, values = self._candles(topic.symbol)
+        if not len(timestamps):
+            return []
+        with self._lock:
+            start = 0 if topic.sent_timestamp is None else int(np.searchsorted(timestamps, topic.sent_timestamp))
+            start = max(start, len(timestamps) - self.chart_limit)
+            if start < len(timestamps) and timestamps[start] == topic.sent_timestamp \
+                    and np.array_equal(values[start], topic.sent_row):
+                start += 1  # unchanged since last sent
+            topic.sent_timestamp, topic.sent_row = int(timestamps[-1]), values[-1].copy()
+        return _rows(timestamps[start:], values[start:])
+
+    # -------- BACKGROUND TASK --------
+    def start(self):
+        """
+        Run ``publish`` every ``period`` seconds on a SocketIO background task.
+
+        Idempotent within a process. A forked child does not inherit the
+        parent's task, so there ``start`` launches its own.
+        """
+        with self._lock:
+            if self._running and self._started_pid == os.getpid():
+                return self
+            self._running, self._started_pid = True, os.getpid()
+        self.socketio.start_background_task(self._run)
+        return self
+
+    def stop(self):
+        self._running = False
+        self._started_pid = None
+
+    def _run(self):
+        while self._running:
+            try:
+                self.publish()
+            except Exception as e:
+                logger.warning("Market push failed: %s", e)
+            self.socketio.sleep(self.period)
+
+    def metrics(self):
+        return {'subscribers': self.subscribers(), 'events': dict(self.events), 'publishes': self.publishes}
+
+
+def _rows(timestamps, values):
+    """[[open_time, open, high, low, close, volume], ...] for JSON."""
+    return [[int(ts)] + row for ts, row in zip(timestamps.tolist(), values.tolist())]
@@ -0,0 +1,157 @@
+# backend/data/ring_buffer.py
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+OHLCV_FIELDS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+PRICE_FIELDS = OHLCV_FIELDS[1:]
+
+# first: index of the first input row that was applied; revised: whether that row replaced the buffer tail
+AppendResult = namedtuple('AppendResult', ['first', 'revised'])
+
+
+def klines_to_arrays(klines):
+    """
+    Parse raw Binance klines in one vectorized pass.
+
+    Returns:
+        tuple: (int64 epoch-ms timestamps, float64 (rows, 5) OHLCV values).
+    """
+    if not len(klines):
+        return np.empty(0, dtype=np.int64), np.empty((0, len(PRICE_FIELDS)), dtype=np.float64)
+    rows = np.asarray([k[:6] for k in klines], dtype=np.float64)
+    return rows[:, 0].astype(np.int64), rows[:, 1:6]
+
+
+def frame_to_arrays(df):
+    """Inverse of arrays_to_frame; accepts timestamp/open/high/low/close/volume columns in any case."""
+    columns = {c.lower(): c for c in df.columns}
+    timestamps = df[columns['timestamp']]
+    if pd.api.types.is_datetime64_any_dtype(timestamps):
+        timestamps = timestamps.astype('datetime64[ms]').astype(np.int64)
+    values = df[[columns[f] for f in PRICE_FIELDS]].to_numpy(dtype=np.float64)
+    return np.asarray(timestamps, dtype=np.int64), values
+
+
+def arrays_to_frame(timestamps, values):
+    """Build a DataFrame with the DataFetcher column names from timestamp/value arrays."""
+    df = pd.DataFrame(values, columns=[f.capitalize() for f in PRICE_FIELDS])
+    df.insert(0, 'Timestamp', pd.to_datetime(timestamps, unit='ms'))
+    return df
+
+
+class OHLCVRingBuffer:
+    """
+    Fixed-capacity columnar OHLCV buffer backed by NumPy arrays.
+
+    Timestamps are stored as int64 epoch milliseconds and prices/volume as a
+    float64 (rows, 5) block. Rows are written sequentially into storage that
+    is slightly larger than ``capacity``; when the slack runs out the newest
+    rows are moved back to the front in one memmove. The live rows are
+    therefore always a single contiguous slice, so ``view()`` returns ordered,
+    zero-copy arrays, and each append costs amortized O(1) row copies.
+    """
+
+    def __init__(self, capacity, slack=None):
+        if capacity <= 0:
+            raise ValueError("Ring buffer capacity must be positive.")
+        self.capacity = capacity
+        slack = slack if slack is not None else max(capacity // 8, 16)
+        self._timestamps = np.zeros(capacity + slack, dtype=np.int64)
+        self._values = np.zeros((capacity + slack, len(PRICE_FIELDS)), dtype=np.float64)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self):
+        return self._end - self._start
+
+    def __bool__(self):
+        return self._end > self._start
+
+    @property
+    def nbytes(self):
+        return self._timestamps.nbytes + self._values.nbytes
+
+    @property
+    def last_timestamp(self):
+        """Epoch-ms timestamp of the newest row, or None when empty."""
+        if not self:
+            return None
+        return int(self._timestamps[self._end - 1])
+
+    def view(self):
+        """Ordered (oldest to newest) zero-copy views: (timestamps, values)."""
+        window = slice(self._start, self._end)
+        return self._timestamps[window], self._values[window]
+
+    def column(self, name):
+        """Ordered zero-copy view of a single field."""
+        timestamps, values = self.view()
+        if name == 'timestamp':
+            return timestamps
+        return values[:, PRICE_FIELDS.index(name)]
+
+    def clear(self):
+        self._start = self._end = 0
+
+    def _write_rows(self, timestamps, values):
+        n = len(timestamps)
+        if n >= self.capacity:
+            timestamps, values = timestamps[-self.capacity:], values[-self.capacity:]
+            n = self.capacity
+            self._start = self._end = 0
+        elif self._end + n > len(self._timestamps):
+            keep = min(len(self), self.capacity - n)
+            self._timestamps[:keep] = self._timestamps[self._end - keep:self._end]
+            self._values[:keep] = self._values[self._end - keep:self._end]
+            self._start, self._end = 0, keep
+
+        self._timestamps[self._end:self._end + n] = timestamps
+        self._values[self._end:self._end + n] = values
+        self._end += n
+        self._start = max(self._start, self._end - self.capacity)
+
+    def append_arrays(self, timestamps, values):
+        """
+        Bulk-append rows in ascending timestamp order.
+
+        Rows older than the newest buffered row are ignored, and a row with the
+        same timestamp as the newest one replaces it (the exchange keeps
+        revising the candle that is still open).
+
+        Args:
+            timestamps (array-like): Epoch-ms timestamps, ascending.
+            values (array-like): (rows, 5) open/high/low/close/volume.
+
+        Returns:
+            AppendResult: Which input rows were applied.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64).reshape(len(timestamps), len(PRICE_FIELDS))
+
+        first, revised = 0, False
+        last = self.last_timestamp
+        if last is not None:
+            first = int(np.searchsorted(timestamps, last, side='left'))
+            revised = first < len(timestamps) and timestamps[first] == last
+
+        if revised:
+            self._values[self._end - 1] = values[first]
+            self._write_rows(timestamps[first + 1:], values[first + 1:])
+        else:
+            self._write_rows(timestamps[first:], values[first:])
+        return AppendResult(first, bool(revised))
+
+    def append_klines(self, klines):
+        """Append raw Binance klines ([open_time, open, high, low, close, volume, ...])."""
+        return self.append_arrays(*klines_to_arrays(klines))
+
+    def append_frame(self, df):
+        """Append a DataFrame with timestamp/open/high/low/close/volume columns (any case)."""
+        return self.append_arrays(*frame_to_arrays(df))
+
+    def to_frame(self):
+        """Materialise the buffer as a DataFrame with the DataFetcher column names."""
+        return arrays_to_frame(*self.view())
@@ -0,0 +1,236 @@
+# backend/data/stream_ingest.py
+
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+
+from backend.data.order_book import OrderBookGap
+
+logger = logging.getLogger(__name__)
+
+BINANCE_STREAM_URL = "wss://stream.binance.com:9443"
+# Binance accepts at most 1024 streams on one combined-stream connection
+MAX_STREAMS_PER_CONNECTION = 1024
+
+
+def stream_names(symbols, intervals=('1m',), trades=True, depth=True):
+    """Combined-stream names (``btcusdt@kline_1m``, ``btcusdt@trade``, ``btcusdt@depth@100ms``) for ``symbols``."""
+    names = []
+    for symbol in symbols:
+        symbol = symbol.lower()
+        names.extend(f"{symbol}@kline_{interval}" for interval in intervals)
+        if trades:
+            names.append(f"{symbol}@trade")
+        if depth:
+            names.append(f"{symbol}@depth@100ms")
+    return names
+
+
+class StreamIngestor:
+    """
+    Pushes Binance WebSocket market data into a MarketDataHub as it arrives.
+
+    Kline events are merged into the hub's candle buffers and indicator
+    state, and trades become the symbols' tickers. Diff-depth events keep
+    the hub's local order books current. A book fetches a REST snapshot
+    when it first syncs and again whenever a sequence gap is detected.
+    Callers reading through the hub or a DataFetcher get pushed data without
+    a REST request while it is fresh.
+
+    Streams are spread over as few combined-stream connections as Binance
+    allows. Each connection reconnects on its own with jittered exponential
+    backoff, and the delay resets once messages flow again. After a reconnect
+    the kline buffers are topped up over REST (``resync``) so candles missed
+    while disconnected do not leave a gap.
+
+    Args:
+        hub (MarketDataHub): Receives the updates.
+        symbols (list): Symbols such as 'BTCUSDT'.
+        intervals (tuple): Kline intervals to subscribe to.
+        trades (bool): Subscribe to the trade streams.
+        depth (bool): Subscribe to diff-depth streams and maintain local order books.
+        snapshot_limit (int): Levels per REST snapshot used to sync a book.
+        url (str): Stream endpoint base; point it at a StubStreamServer in tests.
+        backoff_initial (float): First reconnect delay in seconds.
+        backoff_max (float): Cap on the reconnect delay.
+        resync (bool): Top up kline buffers over REST after each (re)connect.
+    """
+
+    def __init__(self, hub, symbols, intervals=('1m',), trades=True, depth=True, snapshot_limit=1000,
+                 url=BINANCE_STREAM_URL, backoff_initial=1.0, backoff_max=60.0, resync=True,
+                 max_streams_per_connection=MAX_STREAMS_PER_CONNECTION):
+        self.hub = hub
+        self.symbols = [s.upper() for s in symbols]
+        self.intervals = tuple(intervals)
+        self.url = url.rstrip('/')
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.resync = resync
+        self.snapshot_limit = snapshot_limit
+
+        names = stream_names(self.symbols, self.intervals, trades, depth)
+        self.connection_streams = [names[i:i + max_streams_per_connection]
+                                   for i in range(0, len(names), max_streams_per_connection)]
+
+        self.messages = {'kline': 0, 'trade': 0, 'depth': 0}
+        self.connects = 0
+        self.reconnects = 0
+        self.errors = 0
+        self.book_resyncs = 0
+        self.last_message_at = None
+        self._snapshots_pending = set()
+        self._stopping = False
+        self._task = None
+        self._loop = None
+        self._thread = None
+
+    # -------- MESSAGE HANDLING --------
+    def handle_message(self, raw):
+        """Apply one combined-stream message ({"stream": ..., "data": ...}) to the hub."""
+        message = json.loads(raw)
+        stream, data = message.get('stream', ''), message.get('data', message)
+        event = data.get('e')
+        if event == 'kline':
+            k = data['k']
+            self.hub.apply_kline(k['s'], k['i'], int(k['t']),
+                                 [float(k['o']), float(k['h']), float(k['l']), float(k['c']), float(k['v'])])
+            self.messages['kline'] += 1
+        elif event == 'trade':
+            self.hub.apply_trade(data['s'], data['p'])
+            self.messages['trade'] += 1
+        elif event == 'depthUpdate':
+            book = self.hub.local_order_book(data['s'])
+            try:
+                book.apply_diff(data)
+            except OrderBookGap as e:
+                self.book_resyncs += 1
+                logger.warning("%s; resyncing order book", e)
+            if not book.synced:
+                self._schedule_snapshot(data['s'])
+            self.messages['depth'] += 1
+        else:
+            logger.debug("Ignoring stream message: %s", stream or event)
+            return
+        self.last_message_at = time.time()
+
+    def _schedule_snapshot(self, symbol):
+        """Fetch a REST snapshot for ``symbol``'s book off the event loop, once at a time per symbol."""
+        if symbol in self._snapshots_pending:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # called outside the ingestion loop (e.g. directly in a test)
+        self._snapshots_pending.add(symbol)
+        future = loop.run_in_executor(None, self._load_snapshot, symbol)
+        future.add_done_callback(lambda _: self._snapshots_pending.discard(symbol))
+
+    def _load_snapshot(self, symbol):
+        try:
+            self.hub.local_order_book(symbol).load_snapshot(
+                self.hub.fetch_depth_snapshot(symbol, self.snapshot_limit))
+            logger.info("%s order book synced", symbol)
+        except OrderBookGap as e:
+            logger.warning("%s; will retry with a newer snapshot", e)
+        except Exception as e:
+            logger.warning("Could not fetch %s depth snapshot: %s", symbol, e)
+
+    async def _resync(self, names):
+        loop = asyncio.get_running_loop()
+        for name in names:
+            symbol, _, kind = name.partition('@')
+            if not kind.startswith('kline_'):
+                continue
+            try:
+                await loop.run_in_executor(None, lambda: self.hub.refresh_ohlcv(
+                    symbol.upper(), kind[len('kline_'):], force=True))
+            except Exception as e:
+                logger.warning("Could not resync %s over REST: %s", name, e)
+
+    # -------- CONNECTIONS --------
+    async def _consume(self, names):
+        import websockets  # deferred: only the ingestion process needs it
+
+        url = f"{self.url}/stream?streams={'/'.join(names)}"
+        delay = self.backoff_initial
+        while not self._stopping:
+            try:
+                async with websockets.connect(url, ping_interval=20, ping_timeout=20, close_timeout=1) as ws:
+                    self.connects += 1
+                    logger.info("Market stream connected (%d streams)", len(names))
+                    if self.resync:
+                        await self._resync(names)
+                    async for raw in ws:
+                        delay = self.backoff_initial
+                        try:
+                            self.handle_message(raw)
+                        except (KeyError, TypeError, ValueError) as e:
+                            self.errors += 1
+                            logger.warning("Bad stream message: %s", e)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Market stream connection lost: %s", e)
+            # Diff events were missed while disconnected; books resync on the first new event
+            for name in names:
+                if '@depth' in name:
+                    self.hub.local_order_book(name.split('@', 1)[0].upper()).invalidate()
+            if self._stopping:
+                break
+            self.reconnects += 1
+            wait = delay * random.uniform(0.5, 1.0)
+            logger.info("Reconnecting market stream in %.1fs", wait)
+            await asyncio.sleep(wait)
+            delay = min(delay * 2, self.backoff_max)
+
+    async def run(self):
+        """Consume every connection until cancelled."""
+        self._task = asyncio.current_task()
+        await asyncio.gather(*(self._consume(names) for names in self.connection_streams))
+
+    # -------- BACKGROUND THREAD --------
+    def start(self):
+        """Run the ingestor on its own event loop in a daemon thread (for Flask and other sync hosts)."""
+        self._stopping = False
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="market-stream", daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.run(), self._loop)
+        return self
+
+    def stop(self, timeout=5.0):
+        self._stopping = True
+        if self._loop is None or self._loop.is_closed():
+            return
+
+        async def _cancel():
+            if self._task is not None:
+                self._task.cancel()
+                await asyncio.gather(self._task, return_exceptions=True)
+        try:
+            asyncio.run_coroutine_threadsafe(_cancel(), self._loop).result(timeout)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+            self._loop.close()
+
+    def metrics(self):
+        return {
+            'streams': sum(len(names) for names in self.connection_streams),
+            'connections': len(self.connection_streams),
+            'messages': dict(self.messages),
+            'connects': self.connects,
+            'reconnects': self.reconnects,
+            'errors': self.errors,
+            'book_resyncs': self.book_resyncs,
+            'last_message_at': self.last_message_at,
+        }
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,284 @@
+# backend/exchange/async_gateway.py
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import threading
+import time
+from urllib.parse import urlencode
+
+import httpx
+
+from backend.exchange.rate_limiter import get_rate_limiter, throttle_delay
+
+logger = logging.getLogger(__name__)
+
+SPOT_URL = "https://api.binance.com"
+FUTURES_URL = "https://fapi.binance.com"
+SPOT_TESTNET_URL = "https://testnet.binance.vision"
+FUTURES_TESTNET_URL = "https://testnet.binancefuture.com"
+
+
+class GatewayError(Exception):
+    """Raised when the exchange rejects a request or cannot be reached."""
+
+    def __init__(self, message, status=None, payload=None):
+        super().__init__(message)
+        self.status = status
+        self.payload = payload
+
+
+class AsyncExchangeGateway:
+    """
+    asyncio client for the Binance spot, margin and futures REST APIs.
+
+    All requests share one pooled ``httpx.AsyncClient``, so connections are
+    kept alive between calls and independent queries can be awaited together
+    (``get_tickers`` fans out one request per symbol). The operations mirror
+    ``ExchangeClient`` but raise ``GatewayError`` instead of returning None, so
+    callers using ``asyncio.gather(..., return_exceptions=True)`` can tell
+    which request failed. Each request first waits for its weight on the
+    shared spot or futures rate limiter. The limiter is kept in step with the
+    exchange's used-weight header and pauses after 429/418 responses.
+    """
+
+    def __init__(self, api_key=None, api_secret=None, use_testnet=False, use_futures=False,
+                 base_url=None, futures_url=None, max_connections=20, timeout=10.0, recv_window=5000,
+                 rate_limiter=None, futures_rate_limiter=None):
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.use_futures = use_futures
+        self.base_url = base_url or (SPOT_TESTNET_URL if use_testnet else SPOT_URL)
+        self.futures_url = futures_url or (FUTURES_TESTNET_URL if use_testnet else FUTURES_URL)
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.recv_window = recv_window
+        self.rate_limiter = rate_limiter or get_rate_limiter('spot')
+        self.futures_rate_limiter = futures_rate_limiter or get_rate_limiter('futures')
+        self._client = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    def _session(self):
+        # Created lazily so the pool binds to the loop that actually runs the requests
+        if self._client is None:
+            limits = httpx.Limits(max_connections=self.max_connections,
+                                  max_keepalive_connections=self.max_connections)
+            headers = {"X-MBX-APIKEY": self.api_key} if self.api_key else {}
+            self._client = httpx.AsyncClient(limits=limits, timeout=self.timeout, headers=headers)
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _sign(self, params):
+        if not self.api_key or not self.api_secret:
+            raise GatewayError("API key and secret are required for signed endpoints.")
+        params = dict(params, timestamp=int(time.time() * 1000), recvWindow=self.recv_window)
+        query = urlencode(params)
+        params['signature'] = hmac.new(self.api_secret.encode(), query.encode(), hashlib.sha256).hexdigest()
+        return params
+
+    async def _request(self, endpoint, method, base, path, params=None, signed=False):
+        limiter = self.futures_rate_limiter if path.startswith('/fapi/') else self.rate_limiter
+        await limiter.acquire_async(endpoint)
+
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        if signed:
+            params = self._sign(params)
+        try:
+            response = await self._session().request(method, base + path, params=params)
+        except httpx.HTTPError as e:
+            raise GatewayError(f"{method} {path} failed: {e}") from e
+
+        used = response.headers.get('X-MBX-USED-WEIGHT-1M')
+        if used is not None:
+            limiter.sync_used_weight(used)
+        retry_after = throttle_delay(response.status_code, response.headers)
+        if retry_after is not None:
+            limiter.penalize(retry_after)
+
+        try:
+            payload = response.json() if response.content else None
+        except ValueError:
+            # Proxies and load balancers answer 502/504 with HTML rather than the exchange's JSON
+            raise GatewayError(f"{method} {path} returned {response.status_code} with a non-JSON body: "
+                               f"{response.text[:200]}", status=response.status_code) from None
+        if response.status_code >= 400:
+            message = payload.get('msg') if isinstance(payload, dict) else response.text
+            raise GatewayError(f"{method} {path} returned {response.status_code}: {message}",
+                               status=response.status_code, payload=payload)
+        return payload
+
+    def _require_futures(self):
+        if not self.use_futures:
+            raise GatewayError("Futures trading not enabled for this client.")
+
+    # -------- MARKET DATA --------
+    async def ping(self):
+        return await self._request('ping', "GET", self.base_url, "/api/v3/ping")
+
+    async def get_ticker(self, symbol):
+        return await self._request('ticker', "GET", self.base_url, "/api/v3/ticker/price", {"symbol": symbol})
+
+    async def get_tickers(self, symbols):
+        """Fetch many tickers concurrently. Returns {symbol: ticker}; raises on the first failure."""
+        tickers = await asyncio.gather(*(self.get_ticker(s) for s in symbols))
+        return dict(zip(symbols, tickers))
+
+    # -------- SPOT --------
+    async def place_market_order(self, symbol, side, quantity):
+        logger.info("Placing spot market order: %s %s %f", side, symbol, quantity)
+        return await self._request('create_order', "POST", self.base_url, "/api/v3/order",
+                                   {"symbol": symbol, "side": side, "type": "MARKET", "quantity": quantity},
+                                   signed=True)
+
+    async def get_balance(self):
+        account = await self._request('account', "GET", self.base_url, "/api/v3/account", signed=True)
+        return account.get("balances", [])
+
+    # -------- MARGIN (Spot Margin Trading) --------
+    async def place_margin_order(self, symbol, side, quantity, order_type="MARKET"):
+        logger.info("Placing margin order: %s %s %f", side, symbol, quantity)
+        return await self._request('margin_order', "POST", self.base_url, "/sapi/v1/margin/order",
+                                   {"symbol": symbol, "side": side, "type": order_type, "quantity": quantity},
+                                   signed=True)
+
+    async def borrow_margin(self, asset, amount):
+        logger.info("Borrowing margin for %s: %f", asset, amount)
+        return await self._request('margin_loan', "POST", self.base_url, "/sapi/v1/margin/loan",
+                                   {"asset": asset, "amount": amount}, signed=True)
+
+    async def repay_margin(self, asset, amount):
+        logger.info("Repaying margin for %s: %f", asset, amount)
+        return await self._request('margin_repay', "POST", self.base_url, "/sapi/v1/margin/repay",
+                                   {"asset": asset, "amount": amount}, signed=True)
+
+    # -------- FUTURES --------
+    async def place_futures_order(self, symbol, side, quantity, order_type="MARKET", **extra):
+        self._require_futures()
+        logger.info("Placing futures %s order: %s %f", order_type, side, quantity)
+        return await self._request('futures_order', "POST", self.futures_url, "/fapi/v1/order",
+                                   dict(extra, symbol=symbol, side=side, type=order_type, quantity=quantity),
+                                   signed=True)
+
+    async def set_leverage(self, symbol, leverage):
+        self._require_futures()
+        logger.info("Setting leverage for %s to %dx", symbol, leverage)
+        return await self._request('leverage', "POST", self.futures_url, "/fapi/v1/leverage",
+                                   {"symbol": symbol, "leverage": leverage}, signed=True)
+
+    async def get_futures_balance(self):
+        return await self._request('futures_balance', "GET", self.futures_url, "/fapi/v2/balance", signed=True)
+
+    async def get_open_futures_positions(self):
+        return await self._request('futures_positions', "GET", self.futures_url, "/fapi/v2/positionRisk",
+                                   signed=True)
+
+    # -------- CONDITIONAL ORDERS --------
+    async def place_trailing_stop_order(self, symbol, side, quantity, activation_price, callback_rate):
+        """Futures stop-market order at ``activation_price``, priced ``callback_rate`` percent below it."""
+        self._require_futures()
+        logger.info("Placing trailing stop order: %s %s %f with activation at %f and callback rate of %f",
+                    side, symbol, quantity, activation_price, callback_rate)
+        return await self._request('futures_order', "POST", self.futures_url, "/fapi/v1/order",
+                                   {"symbol": symbol, "side": side, "type": "STOP_MARKET", "quantity": quantity,
+                                    "stopPrice": activation_price,
+                                    "price": activation_price * (1 - callback_rate / 100)}, signed=True)
+
+    async def place_take_profit_order(self, symbol, side, quantity, price):
+        """Futures GTC limit order at ``price``."""
+        self._require_futures()
+        logger.info("Placing take profit order: %s %s %f at price %f", side, symbol, quantity, price)
+        return await self._request('futures_order', "POST", self.futures_url, "/fapi/v1/order",
+                                   {"symbol": symbol, "side": side, "type": "LIMIT", "quantity": quantity,
+                                    "price": price, "timeInForce": "GTC"}, signed=True)
+
+    async def place_stop_loss_order(self, symbol, side, quantity, stop_price, is_futures=False):
+        """Stop-market order triggered at ``stop_price``; rate-limited as 'stop_loss_order' on either market."""
+        params = {"symbol": symbol, "side": side, "quantity": quantity, "stopPrice": stop_price}
+        if is_futures:
+            self._require_futures()
+            logger.info("Placing stop-loss order (Futures): %s %s %f at stop price %f",
+                        side, symbol, quantity, stop_price)
+            return await self._request('stop_loss_order', "POST", self.futures_url, "/fapi/v1/order",
+                                       dict(params, type="STOP_MARKET"), signed=True)
+        logger.info("Placing stop-loss order (Spot): %s %s %f at stop price %f", side, symbol, quantity, stop_price)
+        # Spot calls a stop that fills at market STOP_LOSS
+        return await self._request('stop_loss_order', "POST", self.base_url, "/api/v3/order",
+                                   dict(params, type="STOP_LOSS"), signed=True)
+
+    # -------- ORDERS --------
+    async def cancel_order(self, symbol, order_id, is_futures=False):
+        if is_futures:
+            self._require_futures()
+            return await self._request('futures_cancel_order', "DELETE", self.futures_url, "/fapi/v1/order",
+                                       {"symbol": symbol, "orderId": order_id}, signed=True)
+        return await self._request('cancel_order', "DELETE", self.base_url, "/api/v3/order",
+                                   {"symbol": symbol, "orderId": order_id}, signed=True)
+
+    async def get_order_status(self, symbol, order_id, is_futures=False):
+        if is_futures:
+            self._require_futures()
+            return await self._request('futures_order_status', "GET", self.futures_url, "/fapi/v1/order",
+                                       {"symbol": symbol, "orderId": order_id}, signed=True)
+        return await self._request('order_status', "GET", self.base_url, "/api/v3/order",
+                                   {"symbol": symbol, "orderId": order_id}, signed=True)
+
+
+class SyncExchangeGateway:
+    """
+    Blocking facade over AsyncExchangeGateway for Flask routes and other sync code.
+
+    The async gateway runs on a private event loop in a daemon thread, so its
+    connection pool survives between calls. Every gateway coroutine method is
+    exposed as a blocking method of the same name, and ``gather`` runs several
+    gateway calls concurrently and waits for all of them.
+
+    Example:
+        gateway = SyncExchangeGateway(AsyncExchangeGateway(key, secret))
+        ticker = gateway.get_ticker("BTCUSDT")
+        pong, balances = gateway.gather(gateway.aio.ping(), gateway.aio.get_balance())
+    """
+
+    def __init__(self, gateway, timeout=30.0):
+        self.aio = gateway
+        self.timeout = timeout
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="exchange-gateway", daemon=True)
+        self._thread.start()
+
+    def run(self, coro):
+        """Run a coroutine on the gateway loop and block until it finishes."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(self.timeout)
+
+    def gather(self, *coros, return_exceptions=True):
+        """Await ``coros`` concurrently; failures come back as exception objects by default."""
+        async def _gather():
+            return await asyncio.gather(*coros, return_exceptions=return_exceptions)
+        return self.run(_gather())
+
+    def __getattr__(self, name):
+        attr = getattr(self.aio, name)
+        if not asyncio.iscoroutinefunction(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            return self.run(attr(*args, **kwargs))
+        call.__name__ = name
+        return call
+
+    def close(self):
+        if self._loop.is_closed():
+            return
+        self.run(self.aio.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop.close()
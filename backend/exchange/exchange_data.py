@@ -1,4 +1,3 @@
-from binance.client import Client
 import pandas as pd
 from datetime import datetime
 
@@ -16,6 +15,8 @@ def fetch_ohlcv_data(api_key, api_secret, symbol="BTCUSDT", interval="1m", limit
     Returns:
         pd.DataFrame: DataFrame containing OHLCV data.
     """
+    from binance.client import Client  # deferred: python-binance is slow to import
+
     client = Client(api_key, api_secret)
     klines = client.get_klines(symbol=symbol, interval=interval, limit=limit)
 
@@ -0,0 +1,292 @@
+# backend/exchange/rate_limiter.py
+
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Lower values are served first
+PRIORITY_ORDER = 0
+PRIORITY_ACCOUNT = 1
+PRIORITY_MARKET_DATA = 2
+PRIORITY_NAMES = {PRIORITY_ORDER: 'order', PRIORITY_ACCOUNT: 'account', PRIORITY_MARKET_DATA: 'market_data'}
+
+# (request weight, priority) per endpoint, from the Binance REST API docs
+ENDPOINTS = {
+    # -------- MARKET DATA --------
+    'ping': (1, PRIORITY_MARKET_DATA),
+    'klines': (2, PRIORITY_MARKET_DATA),
+    'ticker': (2, PRIORITY_MARKET_DATA),
+    'tickers': (4, PRIORITY_MARKET_DATA),  # <= 20 symbols; see tickers_weight
+    'order_book': (5, PRIORITY_MARKET_DATA),  # limit <= 100
+    'exchange_info': (20, PRIORITY_MARKET_DATA),
+    # -------- ACCOUNT --------
+    'account': (20, PRIORITY_ACCOUNT),
+    'order_status': (4, PRIORITY_ACCOUNT),
+    'open_orders': (6, PRIORITY_ACCOUNT),
+    'margin_loan': (1, PRIORITY_ACCOUNT),
+    'margin_repay': (1, PRIORITY_ACCOUNT),
+    'futures_balance': (5, PRIORITY_ACCOUNT),
+    'futures_positions': (5, PRIORITY_ACCOUNT),
+    'futures_order_status': (1, PRIORITY_ACCOUNT),
+    # -------- ORDERS --------
+    'create_order': (1, PRIORITY_ORDER),
+    'cancel_order': (1, PRIORITY_ORDER),
+    'stop_loss_order': (1, PRIORITY_ORDER),
+    'margin_order': (6, PRIORITY_ORDER),
+    'futures_order': (1, PRIORITY_ORDER),
+    'futures_cancel_order': (1, PRIORITY_ORDER),
+    'leverage': (1, PRIORITY_ORDER),
+}
+
+# Request weight allowed per minute and per IP
+DEFAULT_LIMITS = {'spot': 6000, 'futures': 2400}
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a request could not be scheduled within its timeout."""
+
+
+def order_book_weight(limit):
+    for max_limit, weight in ((100, 5), (500, 25), (1000, 50)):
+        if limit <= max_limit:
+            return weight
+    return 250
+
+
+def tickers_weight(n_symbols):
+    """Weight of one multi-symbol ticker request, which Binance charges by the number of symbols."""
+    for max_symbols, weight in ((20, 4), (100, 40)):
+        if n_symbols <= max_symbols:
+            return weight
+    return 80
+
+
+class WeightedRateLimiter:
+    """
+    Token bucket for exchange request weight, shared by every caller in the process.
+
+    The bucket holds up to ``weight_per_minute`` tokens and refills at
+    ``weight_per_minute / 60`` per second. Each request takes its endpoint's
+    weight from ``ENDPOINTS``. When the bucket runs short, requests wait in a
+    priority queue. Order placement and cancellation go first, then account
+    queries, then market data. Requests of equal priority are served first in,
+    first out. A lower-priority request never overtakes a waiting
+    higher-priority one, so chart polling cannot starve order placement.
+
+    ``penalize`` stops all traffic after a 429/418 response until the exchange's
+    Retry-After has passed. ``sync_used_weight`` lines the bucket up with the
+    X-MBX-USED-WEIGHT-1M header. ``metrics`` reports queue depth and wait times
+    for each priority.
+    """
+
+    def __init__(self, weight_per_minute=DEFAULT_LIMITS['spot'], name='spot'):
+        self.name = name
+        self.capacity = float(weight_per_minute)
+        self.rate = weight_per_minute / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiters = []  # heap of (priority, sequence) tickets
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._throttled = 0
+        self._stats = {p: {'granted': 0, 'weight': 0, 'waited': 0, 'wait_total': 0.0, 'wait_max': 0.0}
+                       for p in PRIORITY_NAMES}
+
+    def _resolve(self, endpoint, weight, priority):
+        if endpoint is not None:
+            try:
+                default_weight, default_priority = ENDPOINTS[endpoint]
+            except KeyError:
+                raise ValueError(f"Unknown endpoint for rate limiting: {endpoint}")
+            weight = default_weight if weight is None else weight
+            priority = default_priority if priority is None else priority
+        weight = 1 if weight is None else weight
+        priority = PRIORITY_MARKET_DATA if priority is None else priority
+        if weight > self.capacity:
+            raise ValueError(f"Request weight {weight} exceeds the {self.name} limit of {self.capacity:.0f}.")
+        return weight, priority
+
+    def _try_take(self, ticket, weight):
+        """
+        Grant ``ticket`` if it is first in line and enough weight is available.
+
+        Returns:
+            float | None: 0.0 when granted, seconds until it may be granted, or
+            None when another request is ahead of it.
+        """
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        if self._waiters[0] != ticket:
+            return None
+        if self._tokens >= weight:
+            self._tokens -= weight
+            heapq.heappop(self._waiters)
+            return 0.0
+        return (weight - self._tokens) / self.rate
+
+    def _granted(self, priority, weight, waited):
+        stats = self._stats[priority]
+        stats['granted'] += 1
+        stats['weight'] += weight
+        if waited > 0.001:
+            stats['waited'] += 1
+        stats['wait_total'] += waited
+        stats['wait_max'] = max(stats['wait_max'], waited)
+        self._cond.notify_all()
+
+    def _abandon(self, ticket):
+        with self._cond:
+            if ticket in self._waiters:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+    def acquire(self, endpoint=None, weight=None, priority=None, timeout=None):
+        """
+        Block until the request may be sent.
+
+        Args:
+            endpoint (str): Key into ``ENDPOINTS``; supplies the default weight and priority.
+            weight (int): Overrides the endpoint weight.
+            priority (int): Overrides the endpoint priority.
+            timeout (float): Give up after this many seconds.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        weight, priority = self._resolve(endpoint, weight, priority)
+        ticket = (priority, next(self._sequence))
+        started = time.monotonic()
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+        try:
+            with self._cond:
+                while True:
+                    delay = self._try_take(ticket, weight)
+                    if delay == 0.0:
+                        break
+                    if timeout is not None:
+                        remaining = timeout - (time.monotonic() - started)
+                        if remaining <= 0:
+                            raise RateLimitTimeout(f"No {self.name} request weight available within {timeout}s.")
+                        delay = remaining if delay is None else min(delay, remaining)
+                    self._cond.wait(delay)
+                waited = time.monotonic() - started
+                self._granted(priority, weight, waited)
+                return waited
+        except BaseException:
+            self._abandon(ticket)
+            raise
+
+    async def acquire_async(self, endpoint=None, weight=None, priority=None, timeout=None):
+        """asyncio version of ``acquire``; waits without blocking the event loop."""
+        weight, priority = self._resolve(endpoint, weight, priority)
+        ticket = (priority, next(self._sequence))
+        started = time.monotonic()
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+        try:
+            while True:
+                with self._cond:
+                    delay = self._try_take(ticket, weight)
+                    if delay == 0.0:
+                        waited = time.monotonic() - started
+                        self._granted(priority, weight, waited)
+                        return waited
+                if timeout is not None and time.monotonic() - started >= timeout:
+                    raise RateLimitTimeout(f"No {self.name} request weight available within {timeout}s.")
+                # Not first in line: poll briefly until the request ahead is granted
+                await asyncio.sleep(0.005 if delay is None else min(delay, 0.05))
+        except BaseException:
+            self._abandon(ticket)
+            raise
+
+    def penalize(self, retry_after):
+        """Hold every request for ``retry_after`` seconds after a 429/418 from the exchange."""
+        with self._cond:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+            self._tokens = 0.0
+            self._throttled += 1
+            self._cond.notify_all()
+        logger.warning("%s rate limit hit; pausing requests for %.1fs", self.name, retry_after)
+
+    def sync_used_weight(self, used):
+        """Trust the exchange's count of weight used in the current minute if it is higher than ours."""
+        with self._cond:
+            self._tokens = min(self._tokens, max(self.capacity - float(used), 0.0))
+
+    def call(self, endpoint, fn, *args, weight=None, **kwargs):
+        """
+        Acquire weight for ``endpoint`` (or ``weight``, if given) and call ``fn(*args, **kwargs)``.
+
+        429/418 errors raised by ``fn`` (e.g. python-binance's BinanceAPIException)
+        pause the limiter for the exchange's Retry-After and are re-raised.
+        """
+        self.acquire(endpoint, weight=weight)
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            retry_after = throttle_delay(getattr(e, 'status_code', None),
+                                         getattr(getattr(e, 'response', None), 'headers', None))
+            if retry_after is not None:
+                self.penalize(retry_after)
+            raise
+
+    def metrics(self):
+        with self._cond:
+            self._tokens = min(self.capacity, self._tokens + (time.monotonic() - self._updated) * self.rate)
+            self._updated = time.monotonic()
+            depth = {name: 0 for name in PRIORITY_NAMES.values()}
+            for priority, _ in self._waiters:
+                depth[PRIORITY_NAMES[priority]] += 1
+            priorities = {}
+            for priority, stats in self._stats.items():
+                priorities[PRIORITY_NAMES[priority]] = {
+                    'granted': stats['granted'],
+                    'weight': stats['weight'],
+                    'waited': stats['waited'],
+                    'avg_wait': stats['wait_total'] / stats['granted'] if stats['granted'] else 0.0,
+                    'max_wait': stats['wait_max'],
+                }
+            return {
+                'name': self.name,
+                'available_weight': self._tokens,
+                'queue_depth': len(self._waiters),
+                'queue_depth_by_priority': depth,
+                'throttled': self._throttled,
+                'blocked_for': max(self._blocked_until - time.monotonic(), 0.0),
+                'priorities': priorities,
+            }
+
+
+def throttle_delay(status, headers=None):
+    """Seconds to back off for a 429 (rate limited) or 418 (IP banned) response, else None."""
+    if status not in (418, 429):
+        return None
+    headers = headers or {}
+    try:
+        return float(headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return 60.0 if status == 418 else 1.0
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name='spot'):
+    """Process-wide limiter for one API ('spot' or 'futures'); Binance counts weight per IP."""
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = _limiters[name] = WeightedRateLimiter(DEFAULT_LIMITS.get(name, DEFAULT_LIMITS['spot']), name=name)
+        return limiter
@@ -0,0 +1,269 @@
+# backend/exchange/stub_server.py
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+SIGNED_PREFIXES = ("/api/v3/account", "/api/v3/order", "/sapi/", "/fapi/")
+
+
+class StubExchangeServer:
+    """
+    Local stand-in for the Binance REST API, for tests and benchmarks.
+
+    Serves the endpoints AsyncExchangeGateway uses with canned responses on a
+    background ThreadingHTTPServer, so concurrent requests are handled
+    concurrently. ``latency`` adds a fixed delay to every response to mimic
+    the round trip to the exchange, and ``requests`` records (method, path)
+    for every call. Setting ``proxy_error`` to a status such as 502 answers
+    every request with that status and an HTML page, as a proxy in front of
+    the exchange does when the exchange is unreachable.
+
+    Example:
+        with StubExchangeServer(latency=0.05) as stub:
+            gateway = AsyncExchangeGateway("key", "secret", base_url=stub.url, futures_url=stub.url)
+    """
+
+    def __init__(self, latency=0.0, host="127.0.0.1", port=0):
+        self.latency = latency
+        self.requests = []
+        self.prices = {}
+        self.proxy_error = None
+        self._orders = {}
+        self._next_order_id = 1
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,),
+                                        name="stub-exchange", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # -------- ROUTES --------
+    def _price(self, symbol):
+        return self.prices.get(symbol, 100.0 + sum(map(ord, symbol)) % 900)
+
+    def _new_order(self, params):
+        with self._lock:
+            order_id = self._next_order_id
+            self._next_order_id += 1
+        order = {"orderId": order_id, "symbol": params.get("symbol"), "side": params.get("side"),
+                 "type": params.get("type"), "origQty": params.get("quantity"), "status": "FILLED"}
+        for field in ("price", "stopPrice", "timeInForce"):
+            if field in params:
+                order[field] = params[field]
+        self._orders[order_id] = order
+        return order
+
+    def _route(self, method, path, params):
+        if path == "/api/v3/ping":
+            return 200, {}
+        if path == "/api/v3/ticker/price":
+            symbol = params.get("symbol")
+            if not symbol:
+                return 400, {"code": -1102, "msg": "Mandatory parameter 'symbol' was not sent."}
+            return 200, {"symbol": symbol, "price": f"{self._price(symbol):.2f}"}
+        if path == "/api/v3/account":
+            return 200, {"balances": [{"asset": "USDT", "free": "1000.0", "locked": "0.0"},
+                                      {"asset": "BTC", "free": "0.5", "locked": "0.0"}]}
+        if path in ("/api/v3/order", "/sapi/v1/margin/order", "/fapi/v1/order"):
+            if method == "POST":
+                return 200, self._new_order(params)
+            order = self._orders.get(int(params.get("orderId", 0)))
+            if order is None:
+                return 400, {"code": -2013, "msg": "Order does not exist."}
+            if method == "DELETE":
+                order = dict(order, status="CANCELED")
+            return 200, order
+        if path in ("/sapi/v1/margin/loan", "/sapi/v1/margin/repay"):
+            return 200, {"tranId": int(time.time() * 1000)}
+        if path == "/fapi/v1/leverage":
+            return 200, {"symbol": params.get("symbol"), "leverage": int(params.get("leverage", 1))}
+        if path == "/fapi/v2/balance":
+            return 200, [{"asset": "USDT", "balance": "500.0", "availableBalance": "500.0"}]
+        if path == "/fapi/v2/positionRisk":
+            return 200, [{"symbol": "BTCUSDT", "positionAmt": "0.010", "entryPrice": "30000.0"}]
+        return 404, {"code": -1, "msg": f"Unknown endpoint {path}"}
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+            disable_nagle_algorithm = True
+
+            def _handle(self):
+                url = urlparse(self.path)
+                params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                stub.requests.append((self.command, url.path))
+                if stub.latency:
+                    time.sleep(stub.latency)
+
+                if stub.proxy_error:
+                    data = f"<html><body><h1>{stub.proxy_error} Bad Gateway</h1></body></html>".encode()
+                    self.send_response(stub.proxy_error)
+                    self.send_header("Content-Type", "text/html")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                    return
+
+                if url.path.startswith(SIGNED_PREFIXES) and not (
+                        self.headers.get("X-MBX-APIKEY") and "signature" in params):
+                    status, body = 401, {"code": -2015, "msg": "Invalid API-key or signature."}
+                else:
+                    status, body = stub._route(self.command, url.path, params)
+
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_DELETE = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+class StubStreamServer:
+    """
+    Local stand-in for the Binance combined WebSocket stream endpoint.
+
+    Clients connect to ``{url}/stream?streams=a/b/c`` as they would to
+    Binance. ``publish`` sends a combined-stream message to every client
+    subscribed to that stream, and ``drop_connections`` closes all of them to
+    exercise reconnect logic. The server runs on its own event loop in a
+    daemon thread, so tests drive it from ordinary synchronous code.
+
+    Example:
+        with StubStreamServer() as stub:
+            ingestor = StreamIngestor(hub, ["BTCUSDT"], url=stub.url, resync=False).start()
+            stub.publish_trade("BTCUSDT", 30000.0)
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.host = host
+        self.port = port
+        self.paths = []
+        self._clients = {}  # connection -> set of subscribed stream names
+        self._server = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="stub-stream", daemon=True)
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}"
+
+    def _run(self, coro, timeout=5.0):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    async def _handler(self, connection):
+        path = connection.request.path
+        self.paths.append(path)
+        streams = parse_qs(urlparse(path).query).get("streams", [""])[0]
+        self._clients[connection] = set(filter(None, streams.split("/")))
+        try:
+            await connection.wait_closed()
+        finally:
+            self._clients.pop(connection, None)
+
+    async def _start(self):
+        from websockets.asyncio.server import serve
+        self._server = await serve(self._handler, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    def start(self):
+        self._thread.start()
+        self._run(self._start())
+        return self
+
+    def stop(self):
+        async def _stop():
+            self._server.close()
+            await self._server.wait_closed()
+        self._run(_stop())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def connections(self):
+        return len(self._clients)
+
+    def wait_for_connections(self, count=1, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while self.connections < count:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Expected {count} stream connection(s), have {self.connections}.")
+            time.sleep(0.01)
+
+    # -------- PUBLISHING --------
+    def publish(self, stream, data):
+        """Send ``data`` on ``stream`` to subscribed clients. Returns how many received it."""
+        message = json.dumps({"stream": stream, "data": data})
+
+        async def _send():
+            targets = [c for c, streams in list(self._clients.items()) if stream in streams]
+            for connection in targets:
+                await connection.send(message)
+            return len(targets)
+        return self._run(_send())
+
+    def publish_kline(self, symbol, interval, open_time, open_, high, low, close, volume, closed=False):
+        return self.publish(f"{symbol.lower()}@kline_{interval}", {
+            "e": "kline", "E": int(time.time() * 1000), "s": symbol.upper(),
+            "k": {"t": open_time, "s": symbol.upper(), "i": interval, "o": str(open_), "h": str(high),
+                  "l": str(low), "c": str(close), "v": str(volume), "x": closed},
+        })
+
+    def publish_trade(self, symbol, price, quantity=1.0):
+        return self.publish(f"{symbol.lower()}@trade", {
+            "e": "trade", "E": int(time.time() * 1000), "s": symbol.upper(),
+            "p": str(price), "q": str(quantity), "T": int(time.time() * 1000),
+        })
+
+    def publish_depth_update(self, symbol, first_update_id, final_update_id, bids=(), asks=()):
+        return self.publish(f"{symbol.lower()}@depth@100ms", {
+            "e": "depthUpdate", "E": int(time.time() * 1000), "s": symbol.upper(),
+            "U": first_update_id, "u": final_update_id,
+            "b": [[str(p), str(q)] for p, q in bids],
+            "a": [[str(p), str(q)] for p, q in asks],
+        })
+
+    def drop_connections(self):
+        """Close every client connection, as Binance does on its 24-hour limit or maintenance."""
+        async def _drop():
+            for connection in list(self._clients):
+                await connection.close()
+        self._run(_drop())
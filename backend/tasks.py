@@ -1,46 +1,225 @@
+from celery import chord, group
+from celery.signals import worker_process_init
 from backend.celery_app import celery_app
-from backend.trading_logic.order_execution import OrderExecution
-from backend.data.data_fetcher import DataFetcher
-from backend.app import config  # Ensure config is correctly exposed in app.py
+from backend.core.tick_guard import get_tick_guard
+from backend.data.market_hub import get_market_hub
 import logging
+import os
+import threading
+import time
+import zlib
 
 # Set up logging for better traceability
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
-@celery_app.task
-def run_trading_job_task():
-    logger.info("Running trading job...")
-
-    # Initialize fetcher and executor using app configuration
-    fetcher = DataFetcher(
-        api_key=config.API_KEY,
-        api_secret=config.API_SECRET,
-        trade_symbol=config.TRADE_SYMBOL,
-        use_external=config.USE_EXTERNAL_DATA
-    )
-    
-    executor = OrderExecution(api_key=config.API_KEY, api_secret=config.API_SECRET)
+# Mirrors app.Config; read from the environment because app.py imports this module
+API_KEY = os.getenv('BITGET_API_KEY')
+API_SECRET = os.getenv('BITGET_SECRET_KEY')
+PASSPHRASE = os.getenv('BITGET_PASSPHRASE')
+USE_EXTERNAL_DATA = os.getenv('ENV', 'dev') == 'prod'
+TRADE_SYMBOLS = [s.strip().upper() for s in os.getenv('TRADE_SYMBOLS', 'BTCUSDT').split(',') if s.strip()]
+TRADE_QUANTITY = float(os.getenv('TRADE_QUANTITY', 0.01))
+
+# With N > 0, each symbol's tasks go to queue "symbols.<crc32(symbol) % N>". A worker bound to a
+# queue then keeps seeing the same symbols, so its candle buffers stay warm between ticks.
+SYMBOL_SHARDS = int(os.getenv('CELERY_SYMBOL_SHARDS', 0))
+
+
+# -------- WORKER-RESIDENT RESOURCES --------
+def model_signal(trading_ai, market_data):
+    """
+    'BUY', 'SELL' or 'HOLD' from the last two model predictions over the candles' closes.
+
+    ``trading_ai.predict`` returns one prediction per ``time_steps`` window,
+    so the last two are for the windows ending at the previous and the
+    newest candle.
+    """
+    predictions = trading_ai.predict(market_data[['Close']])
+    if not predictions or len(predictions) < 2:
+        return 'HOLD'
+    if predictions[-1] > predictions[-2]:
+        return 'BUY'
+    if predictions[-1] < predictions[-2]:
+        return 'SELL'
+    return 'HOLD'
+
+
+class WorkerResources:
+    """
+    Everything a trading tick needs, built once per worker process.
+
+    Args:
+        hub (MarketDataHub): Candle source, shared by all tasks in the process.
+        executor: Object with ``execute_trade(symbol, side, quantity)``; None disables order placement.
+        signal (callable): ``signal(market_data) -> 'BUY' | 'SELL' | 'HOLD'``.
+    """
+
+    def __init__(self, hub, executor, signal):
+        self.hub = hub
+        self.executor = executor
+        self.signal = signal
+        self.pid = os.getpid()
+
+
+_resources = None
+_resources_lock = threading.Lock()
+
+
+def init_worker_resources(resources=None):
+    """
+    Build (or install) this process's WorkerResources.
+
+    Runs from ``worker_process_init`` in every pool process. The prediction
+    model is built and warmed there, the exchange client is created there,
+    and the market data hub with its candle buffers is set up there, instead
+    of on every task.
+    """
+    global _resources
+    with _resources_lock:
+        if resources is None:
+            from backend.ai_models.trading_ai import get_trading_ai  # deferred: loads TensorFlow
+            hub = get_market_hub(api_key=API_KEY, api_secret=API_SECRET, use_external=USE_EXTERNAL_DATA)
+            trading_ai = get_trading_ai()
+            try:
+                from backend.trading_logic.order_execution import OrderExecution
+                executor = OrderExecution(API_KEY, API_SECRET, PASSPHRASE)
+            except Exception as e:
+                logger.error("Order execution unavailable in worker %d, signals only: %s", os.getpid(), e)
+                executor = None
+            resources = WorkerResources(hub, executor, lambda market_data: model_signal(trading_ai, market_data))
+        _resources = resources
+        logger.info("Worker %d resources ready.", os.getpid())
+        return resources
+
+
+def worker_resources():
+    """This process's resources, built on first use if the init signal did not run (eager mode)."""
+    return _resources or init_worker_resources()
+
+
+@worker_process_init.connect
+def _on_worker_process_init(**kwargs):
+    init_worker_resources()
+
 
+# -------- TICK GUARD --------
+_memory_guard_warned = False
+
+
+def tick_guard():
+    """
+    The TickGuard shared by the process that builds a tick's chord and the workers that run it.
+
+    ``trading_tick`` stamps ticks where the chord is built, and the prefork
+    workers read those stamps in other processes, so they can only meet in
+    Redis. TICK_GUARD picks the backend; if it is unset, tasks use Redis
+    unless Celery runs them eagerly in this process. An explicit 'memory'
+    guard with real workers is allowed but logged, since superseded ticks
+    then go undetected.
+    """
+    global _memory_guard_warned
+    eager = celery_app.conf.task_always_eager
+    backend = os.getenv('TICK_GUARD') or ('memory' if eager else 'redis')
+    if backend == 'memory' and not eager and not _memory_guard_warned:
+        _memory_guard_warned = True
+        logger.warning("TICK_GUARD=memory with Celery workers: stamps stay in process %d, so workers "
+                       "cannot drop superseded ticks. Use TICK_GUARD=redis.", os.getpid())
+    return get_tick_guard(backend)
+
+
+# -------- TASKS --------
+def symbol_queue(symbol, shards=None):
+    """Queue for ``symbol``'s tasks, or None to use the default queue when sharding is off."""
+    shards = SYMBOL_SHARDS if shards is None else shards
+    if shards <= 0:
+        return None
+    return f"symbols.{zlib.crc32(symbol.encode()) % shards}"
+
+
+def _evaluate_symbol(result, symbol, interval, limit, trade, quantity):
+    resources = worker_resources()
+    result['worker'] = resources.pid
+    market_data = resources.hub.fetch_ohlcv_data(symbol, interval=interval, limit=limit)
+    if market_data is None or market_data.empty:
+        raise ValueError(f"No market data received for {symbol}")
+    result['signal'] = resources.signal(market_data)
+    if trade and resources.executor is not None and result['signal'] in ('BUY', 'SELL'):
+        logger.info("%s signal for %s; placing order.", result['signal'], symbol)
+        result['order'] = resources.executor.execute_trade(symbol, result['signal'].lower(), quantity)
+
+
+@celery_app.task(name='backend.tasks.evaluate_symbol')
+def evaluate_symbol_task(symbol, interval='1h', limit=100, trade=True, quantity=TRADE_QUANTITY, scheduled_at=None):
+    """
+    One symbol's share of a trading tick: fetch candles, evaluate the signal and trade on it.
+
+    The tick guard drops the run if it is stale, superseded by a newer tick
+    for the symbol, or overlapping one still running; ``status`` says which.
+    Failures are reported in the result rather than raised, so one bad
+    symbol does not fail the whole chord.
+    """
+    began = time.perf_counter()
+    result = {'symbol': symbol, 'status': None, 'signal': None, 'order': None, 'error': None}
     try:
-        # Fetch market data
-        market_data = fetcher.fetch_ohlcv_data(symbol=config.TRADE_SYMBOL, interval='1h', limit=100)
-        if market_data is not None and not market_data.empty:
-            logger.info(f"Fetched {len(market_data)} market data points.")
-
-            # Evaluate market signal and execute trade
-            signal = executor.evaluate_market_signal(market_data)
-            if signal == "BUY":
-                logger.info("Market signal is BUY. Executing buy order.")
-                executor.execute_buy_order()
-            elif signal == "SELL":
-                logger.info("Market signal is SELL. Executing sell order.")
-                executor.execute_sell_order()
-            else:
-                logger.info("No clear market signal. Holding off on any trade.")
-        else:
-            logger.warning("No market data received or data is empty.")
+        result['status'] = tick_guard().run(
+            symbol, lambda: _evaluate_symbol(result, symbol, interval, limit, trade, quantity), scheduled_at).status
     except Exception as e:
-        logger.error(f"Error in trading job: {str(e)}")
-        # Optionally, log the exception traceback for more detailed debugging
-        logger.exception("Exception occurred during trading job execution.")
+        logger.exception("Trading tick failed for %s", symbol)
+        result['status'], result['error'] = 'failed', str(e)
+    result['elapsed'] = round(time.perf_counter() - began, 4)
+    return result
+
+
+@celery_app.task(name='backend.tasks.aggregate_results')
+def aggregate_results_task(results):
+    """Chord callback: one summary of every symbol's result for the tick."""
+    signals, statuses = {}, {}
+    for r in results:
+        if r['signal'] is not None:
+            signals[r['signal']] = signals.get(r['signal'], 0) + 1
+        statuses[r['status']] = statuses.get(r['status'], 0) + 1
+    summary = {
+        'symbols': len(results),
+        'statuses': statuses,
+        'signals': signals,
+        'orders': sum(r['order'] is not None for r in results),
+        'errors': {r['symbol']: r['error'] for r in results if r['error']},
+        'workers': len({r.get('worker') for r in results}),
+        'results': results,
+    }
+    logger.info("Trading tick: %d symbols, signals %s, %d orders, %d errors",
+                summary['symbols'], signals, summary['orders'], len(summary['errors']))
+    return summary
+
+
+def trading_tick(symbols=None, interval='1h', limit=100, trade=True, scheduled_at=None):
+    """
+    The chord for one tick: every symbol in parallel, then ``aggregate_results_task``.
+
+    The tick is stamped as each symbol's newest, so older ticks still queued are dropped as superseded.
+    """
+    scheduled_at = time.time() if scheduled_at is None else scheduled_at
+    guard = tick_guard()
+    signatures = []
+    for symbol in symbols or TRADE_SYMBOLS:
+        guard.stamp(symbol, scheduled_at)
+        signature = evaluate_symbol_task.s(symbol, interval, limit, trade, scheduled_at=scheduled_at)
+        queue = symbol_queue(symbol)
+        if queue:
+            signature.set(queue=queue)
+        signatures.append(signature)
+    return chord(group(signatures), aggregate_results_task.s())
+
+
+@celery_app.task
+def run_trading_job_task(symbols=None, interval='1h', limit=100, trade=True, scheduled_at=None):
+    """
+    Fan a trading tick out over ``symbols`` (TRADE_SYMBOLS by default); returns the chord's id.
+
+    ``scheduled_at`` (epoch seconds) is when the caller enqueued the tick; its
+    age is checked against the tick guard's ``max_age`` when each symbol runs.
+    """
+    symbols = symbols or TRADE_SYMBOLS
+    logger.info("Running trading job for %d symbols...", len(symbols))
+    return trading_tick(symbols, interval, limit, trade, scheduled_at).apply_async().id
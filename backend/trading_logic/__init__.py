@@ -1,4 +1,9 @@
-from .order_execution import OrderExecution
-from .logic import TradingLogic
+from backend._lazy import lazy_attributes
 
-__all__ = ["OrderExecution", "TradingLogic"]
\ No newline at end of file
+# OrderExecution needs the Bitget SDK; import it only when asked for
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    "OrderExecution": ".order_execution",
+    "TradingLogic": ".logic",
+})
+
+__all__ = ["OrderExecution", "TradingLogic"]
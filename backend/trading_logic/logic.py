@@ -1,9 +1,9 @@
 import logging
-from ..ai_models.trading_ai import TradingAI  # Correct import path
+from ..ai_models.trading_ai import get_trading_ai
 
 class TradingLogic:
     def __init__(self):
-        self.model = TradingAI()  # Initialize the TradingAI model
+        self.model = get_trading_ai()  # Shared TradingAI backed by the model registry
         logging.basicConfig(level=logging.INFO)
 
     def analyze_market(self, market_data):
@@ -2,10 +2,10 @@ import time
 import logging
 import numpy as np
 from bitget.rest_api import bitget  # Import Bitget SDK
-from backend.ai_models import TradingAI, ReinforcementLearning
+from backend.ai_models.registry import get_model_registry
 from backend.victorq.neutralizer import TradingHelper
 from .logic import TradingLogic
-from backend.ai_models.neural_network import NeuralNetwork
+from .symbol_filters import get_symbol_filter_registry
 
 class OrderExecution:
     def __init__(self, api_key, api_secret, passphrase):
@@ -13,32 +13,38 @@ class OrderExecution:
         self.logic = TradingLogic()
         logging.basicConfig(level=logging.INFO)
 
-        self.reinforcement_model = ReinforcementLearning(api_key, api_secret, time_steps=10, n_features=10)
-        self.nn_model = NeuralNetwork(input_dim=10, output_dim=1)
+        # Symbol filters are cached and refreshed in the background so validation never waits on the exchange;
+        # executors for the same account share one registry and one refresh thread
+        client = self.client
+        self.symbol_filters = get_symbol_filter_registry(api_key, lambda: client.get_market_symbol()['data'])
 
         self.X = None  # Replace with actual feature data
         self.y = None  # Replace with actual target data
 
+    # Shared, pre-warmed instances: every OrderExecution uses the same models. They are fetched from the
+    # registry on first use, so constructing an executor (e.g. at app import) does not load TensorFlow.
+    @property
+    def reinforcement_model(self):
+        return get_model_registry().get('REINFORCEMENT', time_steps=10, n_features=10)
+
+    @property
+    def nn_model(self):
+        return get_model_registry().get('NEURALNETWORK', time_steps=1, n_features=10)
+
     def _validate_order_parameters(self, symbol, quantity, price=None):
         try:
-            # For Bitget, we can use the /market/symbols endpoint to get symbol details (for validation)
-            exchange_info = self.client.get_market_symbol()
-            symbol_info = next(item for item in exchange_info['data'] if item['symbol'] == symbol)
-            min_qty = float(symbol_info['minQty'])
-            qty_step = float(symbol_info['stepSize'])
+            filters = self.symbol_filters.get(symbol)
+            if filters is None:
+                logging.error(f"Unknown symbol: {symbol}")
+                return False
 
-            if quantity < min_qty or quantity % qty_step != 0:
+            if not filters.quantity_ok(quantity):
                 logging.error(f"Invalid quantity for {symbol}: {quantity}")
                 return False
 
-            if price:
-                min_price = float(symbol_info['minPrice'])
-                max_price = float(symbol_info['maxPrice'])
-                tick_size = float(symbol_info['tickSize'])
-
-                if price < min_price or price > max_price or price % tick_size != 0:
-                    logging.error(f"Invalid price for {symbol}: {price}")
-                    return False
+            if price and not filters.price_ok(price):
+                logging.error(f"Invalid price for {symbol}: {price}")
+                return False
 
             return True
         except Exception as e:
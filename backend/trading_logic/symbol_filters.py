@@ -0,0 +1,149 @@
+# backend/trading_logic/symbol_filters.py
+
+import logging
+import threading
+import time
+from collections import namedtuple
+from decimal import Decimal, InvalidOperation
+
+logger = logging.getLogger(__name__)
+
+
+def _to_decimal(value, default='0'):
+    try:
+        return Decimal(str(value if value not in (None, '') else default))
+    except InvalidOperation:
+        return Decimal(default)
+
+
+def _on_grid(value, step):
+    """Exact check that ``value`` is a whole multiple of ``step`` (a zero step means no constraint)."""
+    if step <= 0:
+        return True
+    return value % step == 0
+
+
+class SymbolFilters(namedtuple('SymbolFilters', ['symbol', 'min_qty', 'step_size', 'min_price', 'max_price', 'tick_size'])):
+    """Order filters for one symbol, parsed once into Decimals."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_exchange(cls, info):
+        return cls(
+            symbol=info['symbol'],
+            min_qty=_to_decimal(info.get('minQty')),
+            step_size=_to_decimal(info.get('stepSize')),
+            min_price=_to_decimal(info.get('minPrice')),
+            max_price=_to_decimal(info.get('maxPrice')),
+            tick_size=_to_decimal(info.get('tickSize')),
+        )
+
+    def quantity_ok(self, quantity):
+        # str() gives the shortest repr of a float, so 0.3 is checked as exactly 0.3
+        quantity = _to_decimal(quantity)
+        return quantity >= self.min_qty and _on_grid(quantity, self.step_size)
+
+    def price_ok(self, price):
+        price = _to_decimal(price)
+        if price < self.min_price or (self.max_price > 0 and price > self.max_price):
+            return False
+        return _on_grid(price, self.tick_size)
+
+
+class SymbolFilterRegistry:
+    """
+    TTL-cached, dict-indexed symbol filters.
+
+    ``loader`` returns the exchange's symbol list (dicts with symbol, minQty,
+    stepSize, minPrice, maxPrice, tickSize). Lookups are a dict access while
+    the cache is fresh; with ``start_background_refresh`` the cache is renewed
+    before it expires, so order validation never waits on exchange info.
+    Concurrent callers that find the cache stale share one reload.
+    """
+
+    def __init__(self, loader, ttl=300.0, unknown_retry=30.0):
+        self.loader = loader
+        self.ttl = ttl
+        self.unknown_retry = unknown_retry
+        self._filters = {}
+        self._loaded_at = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def is_fresh(self):
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    def refresh(self):
+        symbols = self.loader()
+        filters = {info['symbol']: SymbolFilters.from_exchange(info) for info in symbols}
+        with self._lock:
+            self._filters = filters
+            self._loaded_at = time.monotonic()
+        logger.debug("Loaded filters for %d symbols.", len(filters))
+        return filters
+
+    def get(self, symbol):
+        """
+        Filters for ``symbol``, or None if the exchange does not list it.
+
+        Reloads when the cache is stale, and for an unknown symbol (it may be a
+        new listing) at most once every ``unknown_retry`` seconds.
+        """
+        if not self.is_fresh:
+            with self._refresh_lock:
+                if not self.is_fresh:  # another caller may have reloaded while this one waited
+                    self.refresh()
+        filters = self._filters.get(symbol)
+        if filters is None and time.monotonic() - self._loaded_at >= self.unknown_retry:
+            with self._refresh_lock:
+                if time.monotonic() - self._loaded_at >= self.unknown_retry:
+                    self.refresh()
+            filters = self._filters.get(symbol)
+        return filters
+
+    def start_background_refresh(self, interval=None):
+        """Refresh in a daemon thread every ``interval`` seconds (default: 80% of the TTL)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        interval = interval or self.ttl * 0.8
+        self._stop.clear()
+
+        def _run():
+            while not self._stop.is_set():
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.error(f"Symbol filter refresh failed: {e}")
+                self._stop.wait(interval)
+
+        self._thread = threading.Thread(target=_run, name="symbol-filter-refresh", daemon=True)
+        self._thread.start()
+
+    def stop_background_refresh(self, timeout=5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_symbol_filter_registry(key, loader, **kwargs):
+    """
+    Process-wide registry for ``key`` (e.g. the exchange API key), refreshing in the background.
+
+    Every OrderExecution for the same account shares one registry and one
+    refresh thread instead of starting its own.
+    """
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = _registries[key] = SymbolFilterRegistry(loader, **kwargs)
+            registry.start_background_refresh()
+        return registry
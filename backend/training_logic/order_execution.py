@@ -7,6 +7,11 @@ from binance.enums import (
     TIME_IN_FORCE_GTC
 )
 from backend.ai_models import TradingAI, ReinforcementLearning, train_model  # ✅ Corrected import
+from backend.backtesting.engine import Backtester, check_backtest_range
+from backend.data.candle_store import get_candle_store
+from backend.data.indicators import SMACrossover
+from backend.data.kline_sources import BinanceKlineSource, interval_to_ms
+from backend.exchange.rate_limiter import get_rate_limiter
 
 # ============================
 # 🚀 Order Execution Class
@@ -73,15 +78,51 @@ class TradingLogic:
         self.long_window = long_window
         self.position = None
         self.order_executor = OrderExecution(api_key, api_secret)
+        self.candle_store = get_candle_store()
+        # Backfills share the process-wide spot weight budget with every other REST caller
+        self.kline_source = BinanceKlineSource(self.order_executor.client, rate_limiter=get_rate_limiter('spot'))
+        self.crossover = SMACrossover(short_window, long_window)
+        self._next_candle = None  # open time of the first hourly candle not yet fed to the crossover
+
+    def update_indicators(self):
+        """
+        Feed candles closed since the last call into the running crossover.
+
+        The first call primes it with ``long_window`` closed hourly candles. After
+        that each call reads only the new candles from the store, so an update
+        costs O(new candles) rather than re-summing both windows.
+
+        Returns:
+            tuple: (short_sma, long_sma), either None until enough candles are in.
+        """
+        step = interval_to_ms(Client.KLINE_INTERVAL_1HOUR)
+        now = int(time.time() * 1000)
+        # One extra hour: the window ending ``now`` also covers the still-open candle, which is never returned
+        start = self._next_candle if self._next_candle is not None else now - (self.long_window + 1) * step
+        timestamps, values = self.candle_store.history(
+            self.symbol,
+            Client.KLINE_INTERVAL_1HOUR,
+            start,
+            now,
+            source=self.kline_source
+        )
+        self.crossover.update_many(values[:, 3])
+        if len(timestamps):
+            self._next_candle = int(timestamps[-1]) + step
+        return self.crossover.short_sma, self.crossover.long_sma
 
     def fetch_data(self):
         try:
-            data = self.order_executor.client.get_historical_klines(
+            # Closed hourly candles come from the local store; only missing hours are downloaded
+            now = int(time.time() * 1000)
+            _, values = self.candle_store.history(
                 self.symbol,
                 Client.KLINE_INTERVAL_1HOUR,
-                "200 hours ago UTC"
+                now - 200 * interval_to_ms(Client.KLINE_INTERVAL_1HOUR),
+                now,
+                source=self.kline_source
             )
-            return {'close': [float(item[4]) for item in data]}
+            return {'close': values[:, 3].tolist()}
         except Exception as e:
             logging.error(f"Error fetching historical data: {e}")
             return {'close': []}
@@ -112,11 +153,18 @@ class TradingLogic:
             self.order_executor.execute_trade(self.symbol, SIDE_SELL, 1.0)
             self.position = 'short'
 
+    def backtest(self, start, end, interval=Client.KLINE_INTERVAL_1HOUR, fee_rate=0.001):
+        """Replay this strategy over stored candles in [start, end) (epoch ms) instead of trading live."""
+        check_backtest_range(interval, start, end)
+        timestamps, values = self.candle_store.history(
+            self.symbol, interval, start, end, source=self.kline_source
+        )
+        return Backtester(fee_rate=fee_rate).run_sma(timestamps, values[:, 3], self.short_window, self.long_window)
+
     def run(self):
         while True:
             try:
-                data = self.fetch_data()
-                short_sma, long_sma = self.calculate_indicators(data)
+                short_sma, long_sma = self.update_indicators()
                 if short_sma is None or long_sma is None:
                     time.sleep(60)
                     continue
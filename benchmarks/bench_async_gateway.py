@@ -0,0 +1,67 @@
+"""
+Benchmark: sequential vs. concurrent ticker/balance/positions fetches.
+
+Runs against the local StubExchangeServer with a simulated round-trip
+latency, so no network access or API keys are needed.
+
+Usage:
+    python -m benchmarks.bench_async_gateway [--symbols 20] [--latency 0.05] [--rounds 3]
+"""
+import argparse
+import asyncio
+import time
+
+from backend.exchange.async_gateway import AsyncExchangeGateway
+from backend.exchange.stub_server import StubExchangeServer
+
+
+def _calls(gateway, symbols):
+    return ([gateway.get_ticker(s) for s in symbols]
+            + [gateway.get_balance(), gateway.get_futures_balance(), gateway.get_open_futures_positions()])
+
+
+async def _sequential(gateway, symbols):
+    return [await call for call in _calls(gateway, symbols)]
+
+
+async def _concurrent(gateway, symbols):
+    return await asyncio.gather(*_calls(gateway, symbols))
+
+
+async def _time(fn, gateway, symbols, rounds):
+    best = float('inf')
+    for _ in range(rounds):
+        began = time.perf_counter()
+        await fn(gateway, symbols)
+        best = min(best, time.perf_counter() - began)
+    return best
+
+
+async def _run(symbols, latency, rounds):
+    with StubExchangeServer(latency=latency) as stub:
+        async with AsyncExchangeGateway("key", "secret", use_futures=True,
+                                        base_url=stub.url, futures_url=stub.url) as gateway:
+            names = [f"SYM{i}USDT" for i in range(symbols)]
+            await gateway.ping()  # open the pool before timing
+            sequential = await _time(_sequential, gateway, names, rounds)
+            concurrent = await _time(_concurrent, gateway, names, rounds)
+
+    requests = symbols + 3
+    print(f"requests per round  : {requests} ({symbols} tickers + balance + futures balance + positions)")
+    print(f"simulated latency   : {latency * 1000:.0f}ms")
+    print(f"sequential          : {sequential:.3f}s")
+    print(f"concurrent          : {concurrent:.3f}s")
+    print(f"speedup             : {sequential / concurrent:.1f}x")
+
+
+def run(symbols=20, latency=0.05, rounds=3):
+    asyncio.run(_run(symbols, latency, rounds))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    run(args.symbols, args.latency, args.rounds)
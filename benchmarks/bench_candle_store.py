@@ -0,0 +1,46 @@
+"""
+Benchmark: cold (downloading) vs. warm (memory-mapped) candle history loads.
+
+Uses the offline FakeKlineSource with a simulated REST latency, so no
+network access or API keys are needed.
+
+Usage:
+    python -m benchmarks.bench_candle_store [--days 30] [--interval 1m] [--latency 0.05]
+"""
+import argparse
+import tempfile
+import time
+
+from backend.data.candle_store import CandleStore
+from backend.data.kline_sources import FakeKlineSource
+
+
+def run(days=30, interval='1m', latency=0.05):
+    source = FakeKlineSource(latency=latency)
+    with tempfile.TemporaryDirectory() as root:
+        store = CandleStore(root, source=source)
+        end = int(time.time() * 1000)
+        start = end - days * 86_400_000
+
+        began = time.perf_counter()
+        timestamps, _ = store.history('BTCUSDT', interval, start, end)
+        cold = time.perf_counter() - began
+        cold_requests = source.requests
+
+        began = time.perf_counter()
+        store.history('BTCUSDT', interval, start, end)
+        warm = time.perf_counter() - began
+
+        print(f"candles loaded      : {len(timestamps)}")
+        print(f"cold load           : {cold:.3f}s ({cold_requests} requests, {latency * 1000:.0f}ms each)")
+        print(f"warm load           : {warm:.4f}s ({source.requests - cold_requests} requests)")
+        print(f"speedup             : {cold / warm:.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--interval", default="1m")
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+    run(args.days, args.interval, args.latency)
@@ -0,0 +1,88 @@
+"""
+Benchmark: weighted-ensemble inference, members one after another vs concurrently.
+
+Builds the three strategy members on simulated candles: the LSTM, TradingAI
+and the RL model, trained briefly so it does not abstain. Each member is
+timed alone, then as an ensemble on a thread pool. The concurrent ensemble
+should take about as long as its slowest member. How close it gets depends
+on free cores, because the members' TensorFlow kernels run in parallel.
+Weight lookups are also compared, cached against re-reading the JSON file.
+
+Usage:
+    python -m benchmarks.bench_ensemble [--rounds 20] [--time-steps 60]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from backend.ai_models.ensemble import StrategyWeights, WeightedEnsemble, price_member, rl_member, trend_member
+
+
+def simulated_candles(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    spread = close * rng.uniform(0.001, 0.01, n)
+    return np.column_stack([close, close + spread, close - spread, close, rng.uniform(1, 10, n)])
+
+
+def mean_latency(fn, rounds):
+    began = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - began) / rounds
+
+
+def run(rounds=20, time_steps=60):
+    from backend.ai_models.registry import get_model_registry
+    from backend.ai_models.trading_ai import TradingAI
+
+    values = simulated_candles()
+    registry = get_model_registry()
+    rl = registry.get('RL', time_steps, 1)
+    rl.train_on_candles(values, epochs=2, seed=0)
+    members = [
+        price_member('lstm', registry.get('LSTM', time_steps, 1), time_steps),
+        trend_member('trading_ai', TradingAI(model_type='GRU', time_steps=time_steps, scale_data=True)),
+        rl_member('rl', rl),
+    ]
+    weights = {'lstm': 0.33, 'trading_ai': 0.33, 'rl': 0.34}
+    window = values[-100:]
+
+    total = 0.0
+    for member in members:
+        member.score(window)  # warm-up
+        latency = mean_latency(lambda: member.score(window), rounds)
+        total += latency
+        print(f"{member.name:<20}: {latency * 1e3:.1f}ms")
+    print(f"{'sequential sum':<20}: {total * 1e3:.1f}ms")
+
+    ensemble = WeightedEnsemble(members, weights=lambda: weights)
+    ensemble.predict(window)
+    latency = mean_latency(lambda: ensemble.predict(window), rounds)
+    print(f"{'ensemble':<20}: {latency * 1e3:.1f}ms ({os.cpu_count()} CPUs)")
+    print(f"{'last prediction':<20}: {ensemble.predict(window)._replace(members=None)}")
+    ensemble.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "strategy_weights.json")
+        with open(path, "w") as f:
+            json.dump(weights, f)
+
+        def reread():
+            with open(path) as f:
+                return json.load(f)
+        cached = StrategyWeights(path)
+        print(f"{'weights, re-read':<20}: {mean_latency(reread, 10_000) * 1e6:.1f}us")
+        print(f"{'weights, cached':<20}: {mean_latency(cached.get, 10_000) * 1e6:.1f}us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--time-steps", type=int, default=60)
+    args = parser.parse_args()
+    run(args.rounds, args.time_steps)
@@ -0,0 +1,71 @@
+"""
+Benchmark: cold import time of the web/worker entry modules (python -X importtime).
+
+Each module is imported in a fresh interpreter. The report shows its
+cumulative import time, the slowest dependencies, and whether any of the
+heavy ML stacks were loaded. tests/test_import_time.py runs the same
+measurement to keep these numbers from regressing.
+
+Usage:
+    python -m benchmarks.bench_import_time [--top 8] [module ...]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_MODULES = [
+    "backend",
+    "backend.ai_models",
+    "backend.data.data_fetcher",
+    "backend.data.market_hub",
+    "backend.trading_logic.logic",
+    "backend.ai_models.trading_ai",
+    "backend.tasks",
+]
+
+# Packages that must only load when a model is actually built or trained
+HEAVY_PACKAGES = ("tensorflow", "keras", "sklearn", "torch")
+
+
+def measure(module):
+    """
+    Import ``module`` in a fresh interpreter with ``-X importtime``.
+
+    Returns:
+        dict: {imported module name: cumulative microseconds}.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            timings[name.strip()] = int(cumulative)
+    return timings
+
+
+def heavy_imports(timings):
+    return sorted({name.split(".")[0] for name in timings if name.split(".")[0] in HEAVY_PACKAGES})
+
+
+def run(modules=None, top=8):
+    for module in modules or ENTRY_MODULES:
+        timings = measure(module)
+        heavy = heavy_imports(timings)
+        print(f"{module:<32} {timings.get(module, 0) / 1e6:6.3f}s  heavy: {', '.join(heavy) or 'none'}")
+        roots = {n: t for n, t in timings.items() if "." not in n and n != module}
+        for name, us in sorted(roots.items(), key=lambda kv: -kv[1])[:top]:
+            print(f"    {name:<28} {us / 1e6:6.3f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("modules", nargs="*")
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+    run(args.modules, args.top)
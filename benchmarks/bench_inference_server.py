@@ -0,0 +1,76 @@
+"""
+Benchmark: per-sample Keras predict() vs. the micro-batching inference server.
+
+Several threads each request single-window predictions from an LSTM of the
+size TradingAI builds, as concurrent symbols and /api/ai_predict calls do.
+
+Usage:
+    python -m benchmarks.bench_inference_server [--threads 8] [--requests 25] [--max-batch 64] [--max-wait 0.002]
+"""
+import argparse
+import threading
+import time
+
+import numpy as np
+
+from backend.ai_models.inference_server import BatchingInferenceServer, keras_predict_fn
+
+
+def _build_model(time_steps, n_features):
+    from tensorflow.keras import Input, Sequential
+    from tensorflow.keras.layers import LSTM, Dense
+
+    model = Sequential([Input(shape=(time_steps, n_features)), LSTM(50, return_sequences=True), LSTM(50), Dense(1)])
+    model.compile(optimizer='adam', loss='mean_squared_error')
+    return model
+
+
+def _hammer(predict, threads, requests, sample):
+    def worker():
+        for _ in range(requests):
+            predict(sample)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    began = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return time.perf_counter() - began
+
+
+def run(threads=8, requests=25, max_batch=64, max_wait=0.002, time_steps=60, n_features=5):
+    model = _build_model(time_steps, n_features)
+    sample = np.random.rand(1, time_steps, n_features).astype(np.float32)
+    model.predict(sample, verbose=0)  # build and trace once before timing
+    total = threads * requests
+
+    lock = threading.Lock()  # Keras models are not safe to predict() from many threads at once
+
+    def per_sample(x):
+        with lock:
+            return model.predict(x, verbose=0)
+
+    baseline = _hammer(per_sample, threads, requests, sample)
+
+    with BatchingInferenceServer(keras_predict_fn(model), max_batch_size=max_batch, max_wait=max_wait) as server:
+        server.predict(sample)
+        batched = _hammer(server.predict, threads, requests, sample)
+        metrics = server.metrics()
+
+    print(f"predictions         : {total} ({threads} threads x {requests})")
+    print(f"per-sample predict  : {baseline:.3f}s ({total / baseline:.0f}/s)")
+    print(f"batching server     : {batched:.3f}s ({total / batched:.0f}/s)")
+    print(f"avg batch size      : {metrics['avg_batch_size']:.1f}")
+    print(f"latency p50 / p95   : {metrics['latency_ms_p50']:.1f}ms / {metrics['latency_ms_p95']:.1f}ms")
+    print(f"speedup             : {baseline / batched:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=25)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait", type=float, default=0.002)
+    args = parser.parse_args()
+    run(args.threads, args.requests, args.max_batch, args.max_wait)
@@ -0,0 +1,83 @@
+"""
+Benchmark: conversation memory at 100k turns, legacy JSON file vs the indexed JSONL store.
+
+The legacy ``append_conversation`` loads the whole JSON list and rewrites it
+with ``indent=2`` on every message. That is timed for a few appends once the
+history holds ``--turns`` turns. Every append to the JSONL store is timed
+while it grows to the same size. Reads compare ``load_memory`` on the full
+file against one page and the last N turns from the store. The one-off
+migration of the legacy file is timed too.
+
+Usage:
+    python -m benchmarks.bench_memory_store [--turns 100000] [--page 50]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from backend.core.memory_store import ConversationStore
+
+
+def turn(i):
+    return {"user": f"What should I do with BTCUSDT after candle {i}?",
+            "ai": f"Signal {i % 3}: hold the position and tighten the stop to {100 + i % 50}."}
+
+
+def legacy_load(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def legacy_append(path, user_input, reply):
+    memory = legacy_load(path)
+    memory.append({"user": user_input, "ai": reply})
+    with open(path, "w") as f:
+        json.dump(memory, f, indent=2)
+
+
+def timed(fn, repeat=1):
+    began = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - began) / repeat, result
+
+
+def run(n_turns=100_000, page=50, legacy_appends=5):
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = os.path.join(tmp, "conversation_memory.json")
+        with open(legacy, "w") as f:
+            json.dump([turn(i) for i in range(n_turns)], f, indent=2)
+        per_append, _ = timed(lambda: legacy_append(legacy, "q", "a"), legacy_appends)
+        print(f"{'legacy append':<20}: {per_append * 1e3:.1f}ms each at {n_turns} turns "
+              f"(~{per_append * n_turns / 2 / 60:.0f} min to build the history one message at a time)")
+        full_read, _ = timed(lambda: legacy_load(legacy))
+        print(f"{'legacy load_memory':<20}: {full_read * 1e3:.1f}ms (whole history on every /api/memory)")
+
+        store = ConversationStore(os.path.join(tmp, "conversation_memory.jsonl"))
+        began = time.perf_counter()
+        for i in range(n_turns):
+            store.append(turn(i))
+        elapsed = time.perf_counter() - began
+        print(f"{'store append':<20}: {elapsed / n_turns * 1e6:.1f}us each ({elapsed:.1f}s for {n_turns} turns)")
+        last, turns = timed(lambda: store.last(page), 100)
+        print(f"{'store last N':<20}: {last * 1e6:.0f}us for the last {len(turns)} turns")
+        middle, turns = timed(lambda: store.read(n_turns // 2, page), 100)
+        print(f"{'store page':<20}: {middle * 1e6:.0f}us for {len(turns)} turns from the middle")
+        size = os.path.getsize(store.path) + os.path.getsize(store.index_path)
+        print(f"{'store on disk':<20}: {size / 2**20:.1f}MiB vs legacy {os.path.getsize(legacy) / 2**20:.1f}MiB")
+        store.close()
+
+        migrated = ConversationStore(os.path.join(tmp, "migrated.jsonl"))
+        elapsed, count = timed(lambda: migrated.migrate_json(legacy))
+        print(f"{'migration':<20}: {count} turns in {elapsed:.2f}s")
+        migrated.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--turns", type=int, default=100_000)
+    parser.add_argument("--page", type=int, default=50)
+    args = parser.parse_args()
+    run(args.turns, args.page)
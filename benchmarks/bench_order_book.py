@@ -0,0 +1,66 @@
+"""
+Benchmark: local order book update throughput and query latency.
+
+Loads a snapshot of ``--levels`` price levels per side, applies a stream of
+single-level diff events (inserts, quantity changes and removals near the
+top of the book, as on a busy symbol), then times the read queries that
+previously cost a REST depth request.
+
+Usage:
+    python -m benchmarks.bench_order_book [--levels 1000] [--events 200000] [--vwap-size 5]
+"""
+import argparse
+import random
+import time
+
+from backend.data.order_book import OrderBook
+
+
+def _time(fn, repeat):
+    began = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - began) / repeat
+
+
+def run(levels=1000, events=200_000, vwap_size=5.0, repeat=20_000):
+    rng = random.Random(0)
+    tick = 0.01
+    mid = 30_000.0
+    snapshot = {
+        'lastUpdateId': 0,
+        'bids': [[f"{mid - (i + 1) * tick:.2f}", f"{rng.uniform(0.01, 2):.4f}"] for i in range(levels)],
+        'asks': [[f"{mid + (i + 1) * tick:.2f}", f"{rng.uniform(0.01, 2):.4f}"] for i in range(levels)],
+    }
+    diffs = []
+    for update_id in range(1, events + 1):
+        offset = (int(rng.expovariate(1 / 20)) + 1) * tick
+        price = f"{mid - offset:.2f}" if update_id % 2 else f"{mid + offset:.2f}"
+        quantity = "0" if rng.random() < 0.3 else f"{rng.uniform(0.01, 2):.4f}"
+        side = ([[price, quantity]], []) if update_id % 2 else ([], [[price, quantity]])
+        diffs.append({'e': 'depthUpdate', 'U': update_id, 'u': update_id, 'b': side[0], 'a': side[1]})
+
+    book = OrderBook("BTCUSDT")
+    book.load_snapshot(snapshot)
+    began = time.perf_counter()
+    for event in diffs:
+        book.apply_diff(event)
+    elapsed = time.perf_counter() - began
+
+    print(f"levels per side     : {levels}  (book now {len(book)} levels)")
+    print(f"diff updates        : {events / elapsed:,.0f}/s  ({elapsed / events * 1e6:.2f}us each)")
+    print(f"best bid/ask        : {_time(lambda: (book.best_bid(), book.best_ask()), repeat) * 1e6:.2f}us")
+    print(f"spread              : {_time(book.spread, repeat) * 1e6:.2f}us")
+    print(f"depth at price      : {_time(lambda: book.depth_at(mid - 5 * tick), repeat) * 1e6:.2f}us")
+    label = f"vwap {vwap_size:g} units"
+    print(f"{label:<20}: {_time(lambda: book.vwap('BUY', vwap_size), repeat) * 1e6:.2f}us")
+    print(f"depth(20)           : {_time(lambda: book.depth(20), repeat // 10) * 1e6:.2f}us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--levels", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--vwap-size", type=float, default=5.0)
+    args = parser.parse_args()
+    run(args.levels, args.events, args.vwap_size)
@@ -0,0 +1,76 @@
+"""
+Benchmark: per-dashboard polling vs. the SocketIO market push channel.
+
+Simulates ``--clients`` dashboards for ``--seconds`` of market activity with
+one candle revision per second. Polling mirrors the old frontend: a price
+request every 10s, a balance request every 5s, and a full OHLCV reload per
+chart refresh. Push mirrors MarketPushChannel: one publish per second, fanned
+out to every subscriber. Reports the hub and exchange reads each approach
+makes and the time spent publishing.
+
+Usage:
+    python -m benchmarks.bench_push_channel [--clients 1,10,100] [--seconds 60]
+"""
+import argparse
+import time
+
+from flask import Flask
+from flask_socketio import SocketIO
+
+from backend.data.market_hub import MarketDataHub
+from backend.data.push_channel import MarketPushChannel
+
+MINUTE = 60_000
+START = 1_700_000_000_000 - 1_700_000_000_000 % MINUTE
+
+
+class CountingHub(MarketDataHub):
+    reads = 0
+
+    def refresh_ohlcv(self, *args, **kwargs):
+        self.reads += 1
+        return super().refresh_ohlcv(*args, **kwargs)
+
+    def fetch_tickers(self, symbols):
+        self.reads += 1
+        return super().fetch_tickers(symbols)
+
+
+def run(client_counts=(1, 10, 100), seconds=60):
+    print(f"{'clients':>8}  {'poll reads':>10}  {'push reads':>10}  {'push ms/s':>9}  {'events/client':>13}")
+    for n_clients in client_counts:
+        app = Flask(__name__)
+        socketio = SocketIO(app, async_mode="threading")
+        hub = CountingHub(use_external=True, ticker_ttl=3600, ohlcv_ttl=3600)
+        for i in range(200):
+            hub.apply_kline("BTCUSDT", "1m", START + i * MINUTE, [100.0, 101.0, 99.0, 100.0 + i % 7, 5.0])
+        hub.apply_trade("BTCUSDT", "100.0")
+        balance = {"USDT": {"free": 500.0}}
+        channel = MarketPushChannel(socketio, hub, balance=lambda: balance).register()
+        clients = [socketio.test_client(app, namespace="/market") for _ in range(n_clients)]
+        for client in clients:
+            client.emit("subscribe", {"symbol": "BTCUSDT"}, namespace="/market")
+            client.get_received("/market")
+
+        hub.reads = 0
+        elapsed = 0.0
+        for second in range(seconds):
+            hub.apply_kline("BTCUSDT", "1m", START + 199 * MINUTE, [100.0, 101.0, 99.0, 100.0 + second, 5.0])
+            hub.apply_trade("BTCUSDT", str(100.0 + second))
+            began = time.perf_counter()
+            channel.publish()
+            elapsed += time.perf_counter() - began
+        received = sum(len(client.get_received("/market")) for client in clients)
+
+        # Old frontend: price every 10s, balance every 5s, chart reload every 10s, per client
+        poll_reads = n_clients * (seconds // 10 + seconds // 5 + seconds // 10)
+        print(f"{n_clients:>8}  {poll_reads:>10}  {hub.reads:>10}  {elapsed / seconds * 1e3:>9.2f}  "
+              f"{received / n_clients:>13.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", default="1,10,100")
+    parser.add_argument("--seconds", type=int, default=60)
+    args = parser.parse_args()
+    run(tuple(int(c) for c in args.clients.split(",")), args.seconds)
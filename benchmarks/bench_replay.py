@@ -0,0 +1,81 @@
+"""
+Benchmark: per-sample DQN replay loop vs. the vectorized DQNReplay engine.
+
+The legacy loop is reproduced here: one predict() for the bootstrap value
+and one fit(epochs=1) per sampled transition.
+
+Usage:
+    python -m benchmarks.bench_replay [--steps 20] [--batch-size 32] [--time-steps 10] [--n-features 10]
+"""
+import argparse
+import random
+import time
+from collections import deque
+
+import numpy as np
+
+from backend.ai_models.replay import DQNReplay, ReplayBuffer
+
+
+def _build_model(state_dim):
+    from tensorflow.keras import Input, Sequential
+    from tensorflow.keras.layers import Dense, Dropout
+
+    model = Sequential([Input(shape=(state_dim,)), Dense(64, activation='relu'), Dropout(0.2),
+                        Dense(64, activation='relu'), Dropout(0.2), Dense(1, activation='linear')])
+    model.compile(optimizer='adam', loss='mean_squared_error')
+    return model
+
+
+def _legacy_replay(model, memory, batch_size, gamma):
+    for state, _, reward, next_state, done in random.sample(memory, batch_size):
+        target = reward
+        if not done:
+            target += gamma * model.predict(next_state.reshape(1, -1), verbose=0)[0][0]
+        model.fit(state.reshape(1, -1), np.array([target]), epochs=1, verbose=0)
+
+
+def run(steps=20, batch_size=32, time_steps=10, n_features=10, gamma=0.95):
+    state_dim = time_steps * n_features
+    rng = np.random.default_rng(0)
+    memory = deque(((rng.normal(size=state_dim).astype(np.float32), 0, float(rng.normal()),
+                     rng.normal(size=state_dim).astype(np.float32), False) for _ in range(2000)), maxlen=2000)
+
+    buffer = ReplayBuffer(len(memory), state_dim)
+    for transition in memory:
+        buffer.add(*transition)
+
+    model = _build_model(state_dim)
+    _legacy_replay(model, memory, batch_size, gamma)  # build and trace before timing
+    legacy_steps = max(steps // 10, 2)
+    began = time.perf_counter()
+    for _ in range(legacy_steps):
+        _legacy_replay(model, memory, batch_size, gamma)
+    legacy = (time.perf_counter() - began) / legacy_steps
+
+    results = {}
+    for label, kwargs in (("vectorized", {}), ("+ target network", {'target_update_interval': 10}),
+                          ("+ prioritized", {'prioritized': True})):
+        model = _build_model(state_dim)
+        engine = DQNReplay(model, state_dim, batch_size=batch_size, gamma=gamma, **kwargs)
+        engine.step(buffer)
+        began = time.perf_counter()
+        for _ in range(steps):
+            engine.step(buffer)
+        results[label] = (time.perf_counter() - began) / steps
+
+    print(f"batch size          : {batch_size} (state_dim={state_dim})")
+    print(f"per-sample loop     : {legacy * 1000:8.1f}ms/step  {batch_size / legacy:8.0f} samples/s")
+    for label, seconds in results.items():
+        print(f"{label:<20}: {seconds * 1000:8.1f}ms/step  {batch_size / seconds:8.0f} samples/s"
+              f"  ({legacy / seconds:.0f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--time-steps", type=int, default=10)
+    parser.add_argument("--n-features", type=int, default=10)
+    args = parser.parse_args()
+    run(args.steps, args.batch_size, args.time_steps, args.n_features)
@@ -0,0 +1,80 @@
+"""
+Benchmark: deque-of-tuples replay memory vs. the array-backed ReplayBuffer.
+
+Fills both with a chained trajectory of float64 states (as train_model
+produces them) and reports memory held and minibatch sampling cost at
+several capacities.
+
+Usage:
+    python -m benchmarks.bench_replay_buffer [--state-dim 100] [--batch-size 32] [--capacities 2000,20000,200000]
+"""
+import argparse
+import random
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+from backend.ai_models.replay import ReplayBuffer
+
+
+def _deque_bytes(memory):
+    total = sys.getsizeof(memory)
+    seen = set()
+    for transition in memory:
+        total += sys.getsizeof(transition)
+        for item in transition:
+            if id(item) not in seen:
+                seen.add(id(item))
+                total += item.nbytes + 112 if isinstance(item, np.ndarray) else sys.getsizeof(item)
+    return total
+
+
+def _time(fn, repeat):
+    began = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - began) / repeat
+
+
+def run(state_dim=100, batch_size=32, capacities=(2000, 20000, 200000), repeat=200):
+    rng = np.random.default_rng(0)
+    print(f"state_dim={state_dim}  batch_size={batch_size}")
+    print(f"{'capacity':>10}  {'deque MB':>9}  {'buffer MB':>9}  {'ratio':>6}  "
+          f"{'deque sample':>13}  {'buffer sample':>13}")
+    for capacity in capacities:
+        memory = deque(maxlen=capacity)
+        buffer = ReplayBuffer(capacity, state_dim)
+        state = rng.normal(size=state_dim)
+        for _ in range(capacity):
+            next_state = rng.normal(size=state_dim)
+            memory.append((state, 0, 1.0, next_state, False))
+            buffer.add(state, 0, 1.0, next_state, False)
+            state = next_state
+
+        states = np.empty((batch_size, state_dim), dtype=np.float32)
+        next_states = np.empty_like(states)
+        rewards = np.empty(batch_size, dtype=np.float32)
+        not_done = np.empty(batch_size, dtype=np.float32)
+
+        def sample_deque():
+            for row, (s, _, r, ns, d) in enumerate(random.sample(memory, batch_size)):
+                states[row], next_states[row], rewards[row], not_done[row] = s, ns, r, not d
+
+        def sample_buffer():
+            buffer.gather(buffer.sample(batch_size, rng), states, next_states, rewards, not_done)
+
+        deque_mb, buffer_mb = _deque_bytes(memory) / 2 ** 20, buffer.nbytes / 2 ** 20
+        deque_s, buffer_s = _time(sample_deque, repeat), _time(sample_buffer, repeat)
+        print(f"{capacity:>10}  {deque_mb:>9.1f}  {buffer_mb:>9.1f}  {deque_mb / buffer_mb:>5.1f}x  "
+              f"{deque_s * 1e6:>11.0f}us  {buffer_s * 1e6:>11.0f}us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--state-dim", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--capacities", default="2000,20000,200000")
+    args = parser.parse_args()
+    run(args.state_dim, args.batch_size, tuple(int(c) for c in args.capacities.split(",")))
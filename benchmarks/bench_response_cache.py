@@ -0,0 +1,66 @@
+"""
+Benchmark: burst of identical read-only API requests with and without the response cache.
+
+Each round, ``--concurrency`` threads request the same key at once against an
+upstream call that takes ``--latency-ms``, as the exchange would. Rounds repeat
+for ``--seconds`` with the route's TTL. Reports upstream calls, hit ratio and
+mean request latency for no cache, the in-process backend, and the Redis
+backend (with several worker caches sharing one FakeRedis).
+
+Usage:
+    python -m benchmarks.bench_response_cache [--concurrency 100] [--latency-ms 20] [--ttl 1.0] [--seconds 3]
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.core.response_cache import FakeRedis, MemoryBackend, RedisBackend, ResponseCache
+
+
+def run(concurrency=100, latency_ms=20.0, ttl=1.0, seconds=3.0):
+    calls = [0]
+    lock = threading.Lock()
+
+    def upstream():
+        with lock:
+            calls[0] += 1
+        time.sleep(latency_ms / 1000)
+        return {"symbol": "BTCUSDT", "price": "30000.0"}
+
+    redis = FakeRedis()
+    setups = {
+        "no cache": None,
+        "memory": [ResponseCache(MemoryBackend())],
+        "redis x4 workers": [ResponseCache(RedisBackend(redis, prefix="bench:")) for _ in range(4)],
+    }
+    print(f"{'backend':<18} {'requests':>9} {'upstream':>9} {'hit ratio':>9} {'mean ms':>8}")
+    with ThreadPoolExecutor(concurrency) as pool:
+        for label, caches in setups.items():
+            calls[0] = 0
+            latencies = []
+
+            def request(i):
+                began = time.perf_counter()
+                if caches is None:
+                    upstream()
+                else:
+                    caches[i % len(caches)].get_or_compute("market_data:BTCUSDT", ttl, upstream)
+                latencies.append(time.perf_counter() - began)
+
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                list(pool.map(request, range(concurrency)))
+            hits = sum(c.metrics()["hits"] for c in caches) if caches else 0
+            print(f"{label:<18} {len(latencies):>9} {calls[0]:>9} {hits / len(latencies):>9.2f} "
+                  f"{1000 * sum(latencies) / len(latencies):>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--ttl", type=float, default=1.0)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+    run(args.concurrency, args.latency_ms, args.ttl, args.seconds)
@@ -0,0 +1,69 @@
+"""
+Benchmark: per-transition vs. batched tabular Q-learning on a year of candles.
+
+Trains RLTradingModel on synthetic 1m OHLCV candles, first with the scalar
+choose_action/learn loop that trainer.train_model used to drive (on a slice,
+extrapolated), then with train_on_candles. Also times Q-table growth to
+``--states`` rows against the old vstack-per-new-state approach.
+
+Usage:
+    python -m benchmarks.bench_rl_qtable [--candles 525600] [--epochs 5] [--states 20000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from backend.ai_models.rl_model import ACTION_POSITIONS, RLTradingModel, ohlcv_features
+
+
+def synthetic_candles(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 30_000 * np.exp(np.cumsum(rng.normal(0, 0.001, n)))
+    spread = close * rng.uniform(0, 0.002, n)
+    return np.column_stack([close, close + spread, close - spread, close, rng.uniform(1, 100, n)])
+
+
+def run(n_candles=525_600, epochs=5, n_states=20_000):
+    candles = synthetic_candles(n_candles)
+    print(f"candles             : {n_candles}  epochs={epochs}")
+
+    model = RLTradingModel(state_size=1, action_size=3)
+    began = time.perf_counter()
+    model.train_on_candles(candles, epochs=epochs, seed=0)
+    batched = time.perf_counter() - began
+    print(f"batched training    : {batched:.2f}s  ({epochs * n_candles / batched:,.0f} transitions/s)")
+
+    states = model.discretizer.transform(ohlcv_features(candles))
+    returns = candles[1:, 3] / candles[:-1, 3] - 1.0
+    scalar_model = RLTradingModel(state_size=model.discretizer.n_states, action_size=3)
+    sample = min(50_000, n_candles - 1)
+    began = time.perf_counter()
+    for t in range(21, sample):
+        action = scalar_model.choose_action(int(states[t]))
+        scalar_model.learn(int(states[t]), action, ACTION_POSITIONS[action] * returns[t], int(states[t + 1]))
+    per_transition = (time.perf_counter() - began) / (sample - 21)
+    print(f"scalar loop (est.)  : {per_transition * epochs * n_candles:.2f}s  "
+          f"({1 / per_transition:,.0f} transitions/s)")
+
+    began = time.perf_counter()
+    table = np.zeros((1, 3))
+    for state in range(1, n_states):
+        table = np.vstack([table, np.zeros((1, 3))])
+    vstack = time.perf_counter() - began
+    grown = RLTradingModel(state_size=1, action_size=3)
+    began = time.perf_counter()
+    for state in range(1, n_states):
+        grown._validate_state(state)
+    amortized = time.perf_counter() - began
+    label = f"grow to {n_states} states"
+    print(f"{label:<20}: vstack {vstack * 1e3:.0f}ms  amortized {amortized * 1e3:.0f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--candles", type=int, default=525_600)
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--states", type=int, default=20_000)
+    args = parser.parse_args()
+    run(args.candles, args.epochs, args.states)
@@ -0,0 +1,56 @@
+"""
+Benchmark: parameter sweep throughput by worker count, and a cached re-run.
+
+Sweeps SMA windows, aggressiveness and stop-loss over a synthetic 1m
+history held in shared memory.
+
+Usage:
+    python -m benchmarks.bench_sweep [--days 180] [--workers 1,2,4]
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from backend.backtesting.sweep import ParameterSweep, format_leaderboard, grid
+
+SPACE = {
+    'short_window': [10, 20, 50, 100],
+    'long_window': [100, 200, 400],
+    'aggressiveness': [2, 3],
+    'stop_loss': [2, 5],
+}
+
+
+def run(days=180, workers=None):
+    n = days * 1440
+    rng = np.random.default_rng(0)
+    timestamps = np.arange(n, dtype=np.int64) * 60_000
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.0008, n)))
+    params = grid(SPACE)
+    workers = workers or sorted({1, os.cpu_count() or 1})
+
+    print(f"candles             : {n} ({days} days of 1m), {len(params)} parameter sets, {os.cpu_count()} CPUs")
+    baseline = None
+    for count in workers:
+        sweep = ParameterSweep(timestamps, close, max_workers=count)
+        began = time.perf_counter()
+        results = sweep.evaluate(params)
+        elapsed = time.perf_counter() - began
+        baseline = baseline or elapsed
+        print(f"{f'{count} worker(s)':<20}: {elapsed:.2f}s ({len(params) / elapsed:.1f} backtests/s, "
+              f"{baseline / elapsed:.1f}x)")
+
+    began = time.perf_counter()
+    sweep.evaluate(params)
+    print(f"{'cached re-run':<20}: {time.perf_counter() - began:.4f}s")
+    print(format_leaderboard(results, top=5))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--workers", default=None, help="comma-separated worker counts")
+    args = parser.parse_args()
+    run(args.days, [int(w) for w in args.workers.split(",")] if args.workers else None)
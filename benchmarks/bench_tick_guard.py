@@ -0,0 +1,69 @@
+"""
+Benchmark: a tick queue behind a slow exchange, with and without the tick guard.
+
+A scheduler enqueues one tick every ``--period`` seconds for ``--ticks``
+ticks. One worker drains the queue, and each run takes ``--run-time`` seconds
+(longer than the period, as during an exchange slowdown). Reports how many
+runs executed, how stale their data was when they started, and how long the
+queue took to drain.
+
+Usage:
+    python -m benchmarks.bench_tick_guard [--ticks 30] [--period 0.05] [--run-time 0.15] [--max-age 0.3]
+"""
+import argparse
+import queue
+import threading
+import time
+
+from backend.core.tick_guard import TickGuard
+
+
+def simulate(n_ticks, period, run_time, guard=None):
+    ticks, lateness = queue.Queue(), []
+
+    def job(scheduled_at):
+        lateness.append(time.time() - scheduled_at)
+        time.sleep(run_time)
+
+    def worker():
+        while True:
+            scheduled_at = ticks.get()
+            if scheduled_at is None:
+                return
+            if guard is None:
+                job(scheduled_at)
+            else:
+                guard.run("BTCUSDT", lambda: job(scheduled_at), scheduled_at)
+
+    thread = threading.Thread(target=worker)
+    began = time.perf_counter()
+    thread.start()
+    for _ in range(n_ticks):
+        scheduled_at = time.time()
+        if guard is not None:
+            guard.stamp("BTCUSDT", scheduled_at)
+        ticks.put(scheduled_at)
+        time.sleep(period)
+    ticks.put(None)
+    thread.join()
+    return len(lateness), max(lateness), time.perf_counter() - began
+
+
+def run(n_ticks=30, period=0.05, run_time=0.15, max_age=0.3):
+    print(f"{'':<12} {'runs':>5} {'max staleness':>14} {'drained after':>14}")
+    runs, stalest, drained = simulate(n_ticks, period, run_time)
+    print(f"{'unguarded':<12} {runs:>5} {stalest:>13.2f}s {drained:>13.2f}s")
+    guard = TickGuard(max_age=max_age, late_after=period)
+    runs, stalest, drained = simulate(n_ticks, period, run_time, guard)
+    print(f"{'guarded':<12} {runs:>5} {stalest:>13.2f}s {drained:>13.2f}s")
+    print(f"guard metrics: {guard.metrics()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=30)
+    parser.add_argument("--period", type=float, default=0.05)
+    parser.add_argument("--run-time", type=float, default=0.15)
+    parser.add_argument("--max-age", type=float, default=0.3)
+    args = parser.parse_args()
+    run(args.ticks, args.period, args.run_time, args.max_age)
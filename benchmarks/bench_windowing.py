@@ -0,0 +1,52 @@
+"""
+Benchmark: list-comprehension windowing vs. strided sliding_windows.
+
+Usage:
+    python -m benchmarks.bench_windowing [--time-steps 60] [--features 1]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from backend.ai_models.windowing import sliding_windows
+
+ROW_COUNTS = (1_000, 100_000, 1_000_000)
+
+
+def legacy_windows(data, time_steps, n_features):
+    """The per-window copy the models used before sliding_windows."""
+    data = np.asarray(data).astype(np.float32)
+    windows = np.array([data[i:i + time_steps] for i in range(len(data) - time_steps + 1)])
+    return windows.reshape((windows.shape[0], time_steps, n_features))
+
+
+def _best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(time_steps=60, n_features=1, repeat=3):
+    rng = np.random.default_rng(0)
+    print(f"{'rows':>10} {'legacy (s)':>12} {'view (s)':>12} {'contig (s)':>12} {'speedup':>9}")
+    for rows in ROW_COUNTS:
+        data = rng.standard_normal((rows, n_features)).astype(np.float32)
+        # The legacy path materialises rows * time_steps * n_features floats;
+        # keep the 1M case to a single run so it finishes in reasonable time.
+        legacy = _best_of(lambda: legacy_windows(data, time_steps, n_features), 1 if rows >= 1_000_000 else repeat)
+        view = _best_of(lambda: sliding_windows(data, time_steps, n_features), repeat)
+        contig = _best_of(lambda: sliding_windows(data, time_steps, n_features, contiguous=True), repeat)
+        print(f"{rows:>10} {legacy:>12.4f} {view:>12.6f} {contig:>12.4f} {legacy / contig:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--time-steps", type=int, default=60)
+    parser.add_argument("--features", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.time_steps, args.features, args.repeat)
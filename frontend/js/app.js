@@ -1,5 +1,7 @@
 document.addEventListener("DOMContentLoaded", () => {
   const API_BASE = window.API_BASE || "http://backend:5000";
+  const SYMBOL = window.TRADE_SYMBOL || "BTCUSDT";
+  const CHART_LIMIT = 200;
 
   const priceElement = document.getElementById("price");
   const chatForm = document.getElementById("chat-form");
@@ -26,6 +28,7 @@ document.addEventListener("DOMContentLoaded", () => {
 
   let chart;
   let socket;
+  let candles = [];
 
   function showToast(message, type = "info") {
     const toast = document.createElement("div");
@@ -64,15 +67,25 @@ document.addEventListener("DOMContentLoaded", () => {
     }
   }
 
+  function showPrice(price) {
+    priceElement.textContent = price ? `$${parseFloat(price).toFixed(2)}` : "Error";
+  }
+
+  function showBalance(data) {
+    const balanceEl = document.getElementById("balance-display");
+    if (balanceEl) {
+      balanceEl.textContent = `Balance (${data.account}): $${data.balance.toFixed(2)}`;
+    }
+    if (balanceDiv) {
+      balanceDiv.innerHTML = `USDT Balance: ${data.usdt_balance}`;
+    }
+  }
+
   async function fetchPrice() {
     try {
       const res = await fetch(`${API_BASE}/api/market_data`);
       const data = await res.json();
-      if (data.price) {
-        priceElement.textContent = `$${parseFloat(data.price).toFixed(2)}`;
-      } else {
-        priceElement.textContent = "Error";
-      }
+      showPrice(data.price);
     } catch {
       priceElement.textContent = "Error";
     }
@@ -81,19 +94,65 @@ document.addEventListener("DOMContentLoaded", () => {
   async function fetchBalance() {
     try {
       const res = await fetch(`${API_BASE}/api/balance`);
-      const data = await res.json();
-      const balanceEl = document.getElementById("balance-display");
-      if (balanceEl) {
-        balanceEl.textContent = `Balance (${data.account}): $${data.balance.toFixed(2)}`;
-      }
-      if (balanceDiv) {
-        balanceDiv.innerHTML = `USDT Balance: ${data.usdt_balance}`;
-      }
+      showBalance(await res.json());
     } catch (err) {
       console.error("Balance fetch failed", err);
     }
   }
 
+  // Market data is pushed over SocketIO: one snapshot on subscribe, then coalesced deltas.
+  // Polling is only the fallback when the SocketIO client script could not be loaded.
+  function initializeMarketChannel() {
+    if (typeof io === "undefined") {
+      fetchPrice();
+      fetchBalance();
+      setInterval(fetchPrice, 10000);
+      setInterval(fetchBalance, 5000);
+      return;
+    }
+    const market = io(`${API_BASE}/market`);
+    market.on("connect", () => market.emit("subscribe", { symbol: SYMBOL }));
+    market.on("chart_snapshot", (msg) => {
+      candles = msg.candles;
+      renderCandles(msg.symbol);
+    });
+    market.on("chart_delta", (msg) => {
+      mergeCandles(msg.candles);
+      renderCandles(msg.symbol);
+    });
+    market.on("price", (msg) => showPrice(msg.price));
+    market.on("balance", showBalance);
+  }
+
+  // Candles are [openTime, open, high, low, close, volume]; a delta row replaces the row with
+  // the same open time (the still-open candle) or extends the series.
+  function mergeCandles(rows) {
+    rows.forEach((row) => {
+      const last = candles.length ? candles[candles.length - 1][0] : -1;
+      if (row[0] === last) {
+        candles[candles.length - 1] = row;
+      } else if (row[0] > last) {
+        candles.push(row);
+      }
+    });
+    if (candles.length > CHART_LIMIT) candles = candles.slice(-CHART_LIMIT);
+  }
+
+  function renderCandles(symbol) {
+    if (!chart) return;
+    chart.data.labels = candles.map((c) => new Date(c[0]).toLocaleTimeString());
+    chart.data.datasets = [{
+      label: symbol,
+      data: candles.map((c) => c[4]),
+      borderColor: getColor(0),
+      backgroundColor: "transparent",
+      borderWidth: 2,
+      pointRadius: 0,
+      tension: 0.3
+    }];
+    chart.update("none");
+  }
+
   async function loadMemory() {
     const res = await fetch(`${API_BASE}/api/memory`);
     const data = await res.json();
@@ -218,10 +277,8 @@ document.addEventListener("DOMContentLoaded", () => {
     });
   }
 
-  async function setupChart() {
+  function setupChart() {
     const ctx = document.getElementById("chart-canvas").getContext("2d");
-    const res = await fetch(`${API_BASE}/api/ohlcv`);
-    const data = await res.json();
 
     chart = new Chart(ctx, {
       type: "line",
@@ -241,7 +298,6 @@ document.addEventListener("DOMContentLoaded", () => {
       }
     });
 
-    updateChart(data);
     updateChartTheme(savedTheme);
   }
 
@@ -280,15 +336,11 @@ document.addEventListener("DOMContentLoaded", () => {
   buyBtn.addEventListener("click", () => placeOrder("buy"));
   sellBtn.addEventListener("click", () => placeOrder("sell"));
 
-  fetchPrice();
-  fetchBalance();
   loadMemory();
   setupChart();
+  initializeMarketChannel();
   initializeWebSocket();
 
-  setInterval(fetchPrice, 10000);
-  setInterval(fetchBalance, 5000);
-
   window.addEventListener("resize", () => {
     if (chart) {
       chart.resize();
@@ -1,23 +1,27 @@
 import json
 import os
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+from backend.ai_models.ensemble import DEFAULT_STRATEGY_WEIGHTS, STRATEGY_WEIGHTS_FILE, strategy_weights_file
+from backend.core.memory_store import ConversationStore
 
 # File paths
-MEMORY_FILE = "conversation_memory.json"
-WEIGHTS_FILE = "strategy_weights.json"
+MEMORY_FILE = "conversation_memory.jsonl"
+LEGACY_MEMORY_FILE = "conversation_memory.json"  # pre-JSONL format, migrated on import
+WEIGHTS_FILE = STRATEGY_WEIGHTS_FILE  # strategy_weights.json unless overridden in the environment
 
 # Default fallback
-default_weights = {
-    "lstm": 0.33,
-    "trading_ai": 0.33,
-    "rl": 0.34
-}
+default_weights = DEFAULT_STRATEGY_WEIGHTS
+
+# In-memory weights, re-read only when the file changes; shared with the ensemble predictor
+strategy_weights = strategy_weights_file(WEIGHTS_FILE)
+
+# Append-only, indexed conversation log shared by every worker process
+memory_store = ConversationStore(MEMORY_FILE)
 
 # Ensure files exist
 def _ensure_files():
-    if not os.path.exists(MEMORY_FILE):
-        with open(MEMORY_FILE, "w") as f:
-            json.dump([], f)
+    memory_store.migrate_json(LEGACY_MEMORY_FILE)
 
     if not os.path.exists(WEIGHTS_FILE):
         with open(WEIGHTS_FILE, "w") as f:
@@ -26,27 +30,26 @@ def _ensure_files():
 _ensure_files()
 
 # Conversation memory functions
-def load_memory() -> List[Dict[str, str]]:
-    with open(MEMORY_FILE, "r") as f:
-        return json.load(f)
+def load_memory(offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, str]]:
+    """Turns from ``offset`` on, at most ``limit`` of them (all by default), oldest first."""
+    return memory_store.read(offset, limit)
+
+def load_recent(n: int) -> List[Dict[str, str]]:
+    """The last ``n`` turns, oldest first."""
+    return memory_store.last(n)
+
+def memory_size() -> int:
+    return len(memory_store)
 
 def reset_memory():
-    with open(MEMORY_FILE, "w") as f:
-        json.dump([], f)
+    memory_store.reset()
 
 def append_conversation(user_input: str, reply: str):
-    memory = load_memory()
-    memory.append({"user": user_input, "ai": reply})
-    with open(MEMORY_FILE, "w") as f:
-        json.dump(memory, f, indent=2)
+    memory_store.append({"user": user_input, "ai": reply})
 
 # Strategy weight management
 def get_strategy_weights() -> Dict[str, float]:
-    try:
-        with open(WEIGHTS_FILE, "r") as f:
-            return json.load(f)
-    except Exception:
-        return default_weights
+    return strategy_weights.get()
 
 def update_strategy_weights(new_weights: Dict[str, float]):
     weights = get_strategy_weights()
@@ -56,5 +59,4 @@ def update_strategy_weights(new_weights: Dict[str, float]):
     if total == 0:
         total = 1
     normalized_weights = {k: v / total for k, v in weights.items()}
-    with open(WEIGHTS_FILE, "w") as f:
-        json.dump(normalized_weights, f, indent=2)
\ No newline at end of file
+    strategy_weights.write(normalized_weights)
\ No newline at end of file
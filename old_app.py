@@ -1,8 +1,11 @@
 import os
+import time
+import asyncio
 import logging
 import atexit
 import hmac
 import hashlib
+import numpy as np
 from flask import Flask, request, jsonify, send_from_directory
 from apscheduler.schedulers.background import BackgroundScheduler
 from binance.enums import SIDE_BUY, SIDE_SELL
@@ -36,9 +39,16 @@ else:
 # 📦 Backend Module Imports
 # ===========================
 from backend.trading_logic.order_execution import OrderExecution, TradingLogic
-from ai_models.model import ReinforcementLearning, NeuralNetwork
+from backend.ai_models.registry import get_model_registry
+from backend.ai_models.ensemble import candle_history, get_strategy_ensemble
 from training_logic.order_execution import execute_order
 from data.data_fetcher import DataFetcher
+from backend.exchange.async_gateway import AsyncExchangeGateway, SyncExchangeGateway
+from backend.backtesting import run_backtest
+from backend.data.stream_ingest import StreamIngestor
+from backend.core.response_cache import ROUTE_TTLS, get_response_cache
+from backend.core.tick_guard import get_tick_guard
+import memory_manager
 
 # ===========================
 # 🔐 API Setup
@@ -52,6 +62,29 @@ except Exception as e:
 # Explicitly pass the API key and secret for initialization
 fetcher = DataFetcher(api_key=config.API_KEY, api_secret=config.API_SECRET, trade_symbol=config.TRADE_SYMBOL)
 order_executor = OrderExecution(api_key=config.API_KEY, api_secret=config.API_SECRET)
+gateway = SyncExchangeGateway(AsyncExchangeGateway(config.API_KEY, config.API_SECRET))
+atexit.register(gateway.close)
+
+# Klines, trades and depth for the trade symbol are pushed into the fetcher's hub over WebSocket,
+# so ticker, order book and candle reads are served from memory instead of REST polling
+market_stream = StreamIngestor(fetcher.hub, [config.TRADE_SYMBOL], intervals=['1m', '1h'])
+if os.getenv('MARKET_STREAM', '1') != '0':
+    market_stream.start()
+    atexit.register(market_stream.stop)
+
+# Read-only routes go through one cache with request coalescing, so a burst of identical requests
+# costs one exchange call; RESPONSE_CACHE=redis shares it across worker processes
+response_cache = get_response_cache()
+
+# Build and warm the prediction models once at startup; routes share these instances
+model_registry = get_model_registry()
+rl_model, nn_model = model_registry.preload([
+    {'model_type': 'REINFORCEMENT', 'time_steps': 10, 'n_features': 10},
+    {'model_type': 'NEURALNETWORK', 'time_steps': 1, 'n_features': 10},
+])
+# lstm, trading_ai and rl combined with the strategy weights, run concurrently on one candle window
+strategy_ensemble = get_strategy_ensemble(
+    rl_history=candle_history(config.TRADE_SYMBOL, '1h', source=fetcher.hub.kline_source))
 
 # ===========================
 # 🚀 Flask App Setup
@@ -80,7 +113,8 @@ def serve_frontend(path):
 def get_market_data_api():
     logging.debug("Fetching market data for %s", config.TRADE_SYMBOL)
     try:
-        data = fetcher.fetch_ticker(config.TRADE_SYMBOL)
+        data = response_cache.get_or_compute(f"market_data:{config.TRADE_SYMBOL}", ROUTE_TTLS['market_data'],
+                                             lambda: fetcher.fetch_ticker(config.TRADE_SYMBOL))
         return jsonify(data)
     except Exception as e:
         logging.error("Error fetching market data: %s", str(e))
@@ -91,7 +125,8 @@ def order_book():
     symbol = request.args.get('symbol', config.TRADE_SYMBOL)
     logging.debug("Fetching order book for symbol: %s", symbol)
     try:
-        order_data = fetcher.fetch_order_book(symbol)
+        order_data = response_cache.get_or_compute(f"order_book:{symbol}", ROUTE_TTLS['order_book'],
+                                                   lambda: fetcher.fetch_order_book(symbol))
         return jsonify(order_data)
     except Exception as e:
         logging.error("Error fetching order book: %s", str(e))
@@ -102,8 +137,8 @@ def ohlcv():
     symbol = request.args.get('symbol', config.TRADE_SYMBOL)
     logging.debug("Fetching OHLCV data for symbol: %s", symbol)
     try:
-        df = fetcher.fetch_ohlcv_data(symbol)
-        return df.to_json(orient='records')
+        return response_cache.get_or_compute(f"ohlcv:{symbol}", ROUTE_TTLS['ohlcv'],
+                                             lambda: fetcher.fetch_ohlcv_data(symbol).to_json(orient='records'))
     except Exception as e:
         logging.error("Error fetching OHLCV data: %s", str(e))
         return jsonify({"error": "Error fetching OHLCV data", "details": str(e)}), 500
@@ -112,7 +147,7 @@ def ohlcv():
 def balance():
     logging.debug("Fetching account balance")
     try:
-        balance_data = fetcher.fetch_balance()
+        balance_data = response_cache.get_or_compute("balance", ROUTE_TTLS['balance'], fetcher.fetch_balance)
         return jsonify(balance_data)
     except Exception as e:
         logging.error("Error fetching balance: %s", str(e))
@@ -138,15 +173,35 @@ def ai_predict():
     market_data = request.json
     logging.debug("Predicting AI model based on market data")
     try:
+        features = np.asarray(market_data, dtype=np.float32)
         if ai_managed_preferences:
-            prediction = ReinforcementLearning().predict(market_data)
+            prediction = rl_model.predict(features)
         else:
-            prediction = NeuralNetwork().predict(market_data)
-        return jsonify({"prediction": prediction.tolist()})
+            prediction = nn_model.predict(features)
+        return jsonify({"prediction": np.asarray(prediction).tolist()})
     except Exception as e:
         logging.error("Error during AI prediction: %s", str(e))
         return jsonify({"error": "Error during AI prediction", "details": str(e)}), 500
 
+@app.route('/api/ensemble_predict', methods=['GET'])
+def ensemble_predict():
+    symbol = request.args.get('symbol', config.TRADE_SYMBOL)
+    logging.debug("Ensemble prediction for symbol: %s", symbol)
+    try:
+        result = strategy_ensemble.predict(fetcher.fetch_ohlcv_data(symbol))
+        return jsonify({
+            "symbol": symbol,
+            "score": result.score,
+            "signal": result.signal,
+            "latency_ms": round(result.latency * 1e3, 3),
+            "members": {name: {"score": m.score, "weight": m.weight,
+                               "latency_ms": round(m.latency * 1e3, 3), "error": m.error}
+                        for name, m in result.members.items()},
+        })
+    except Exception as e:
+        logging.error("Error during ensemble prediction: %s", str(e))
+        return jsonify({"error": "Error during ensemble prediction", "details": str(e)}), 500
+
 @app.route('/api/set_preferences', methods=['POST'])
 def set_preferences():
     global ai_managed_preferences, auto_trade_enabled
@@ -164,8 +219,10 @@ def set_preferences():
 def run_simulation():
     logging.debug("Running simulation")
     try:
-        results = simulate_trading_strategy()
+        results = simulate_trading_strategy(request.get_json(silent=True) or {})
         return jsonify(results)
+    except ValueError as e:
+        return jsonify({"error": "Invalid simulation request", "details": str(e)}), 400
     except Exception as e:
         logging.error("Error running simulation: %s", str(e))
         return jsonify({"error": "Error running simulation", "details": str(e)}), 500
@@ -176,6 +233,24 @@ def emergency_stop():
     stop_trading()
     return jsonify({"status": "Emergency stop activated"})
 
+# Conversation history is paged: ?offset=&limit= for a page, otherwise the newest ?last= turns
+MEMORY_DEFAULT_TURNS = 200
+
+@app.route('/api/memory', methods=['GET'])
+def get_memory():
+    try:
+        offset = request.args.get('offset', type=int)
+        if offset is not None:
+            turns = memory_manager.load_memory(offset, request.args.get('limit', MEMORY_DEFAULT_TURNS, type=int))
+        else:
+            turns = memory_manager.load_recent(request.args.get('last', MEMORY_DEFAULT_TURNS, type=int))
+        response = jsonify(turns)
+        response.headers['X-Total-Count'] = str(memory_manager.memory_size())
+        return response
+    except Exception as e:
+        logging.error("Error loading conversation memory: %s", str(e))
+        return jsonify({"error": "Error loading conversation memory", "details": str(e)}), 500
+
 # ===========================
 # 📡 Webhook Listener
 # ===========================
@@ -230,14 +305,30 @@ def notify_team(message):
 # ===========================
 # 📊 Simulated Trading Logic
 # ===========================
-def simulate_trading_strategy():
-    logging.debug("Simulating trading strategy")
-    return {
-        "P&L": 1500,
-        "Sharpe Ratio": 1.75,
-        "Win Rate": 65,
-        "Max Drawdown": -10
-    }
+def simulate_trading_strategy(params):
+    """
+    Backtest stored candles; missing history is downloaded into the candle store first.
+
+    Accepts symbol, interval, days (or start/end in epoch ms), strategy ('sma' or
+    'model'), short_window, long_window and fee_rate; defaults cover the last 30
+    days of hourly candles for the SMA crossover. Ranges over MAX_BACKTEST_CANDLES
+    are rejected with a ValueError before anything is downloaded.
+    """
+    logging.debug("Simulating trading strategy with %s", params)
+    end = int(params.get('end') or time.time() * 1000)
+    start = int(params.get('start') or end - float(params.get('days', 30)) * 86_400_000)
+    result = run_backtest(
+        symbol=params.get('symbol', config.TRADE_SYMBOL),
+        interval=params.get('interval', '1h'),
+        start=start,
+        end=end,
+        strategy=params.get('strategy', 'sma'),
+        source=fetcher.hub.kline_source,  # rate-limited, shared with the hub's other REST calls
+        short_window=int(params.get('short_window', 50)),
+        long_window=int(params.get('long_window', 200)),
+        fee_rate=float(params.get('fee_rate', 0.001)),
+    )
+    return result.metrics
 
 def stop_trading():
     scheduler.pause()
@@ -246,16 +337,24 @@ def stop_trading():
 # ===========================
 # ⏰ Background Trading Job
 # ===========================
+# One tick per symbol at a time, across every process sharing the guard (TICK_GUARD=redis)
+tick_guard = get_tick_guard()
+
+def trading_tick():
+    ticker = fetcher.fetch_ticker(config.TRADE_SYMBOL)
+    logging.debug("Ticker data: %s", ticker)
+
 def run_trading_job():
     logging.info("⏰ Running scheduled trading job...")
     try:
-        ticker = fetcher.fetch_ticker(config.TRADE_SYMBOL)
-        logging.debug("Ticker data: %s", ticker)
+        tick_guard.run(f"job:{config.TRADE_SYMBOL}", trading_tick, tick_guard.stamp(f"job:{config.TRADE_SYMBOL}"))
     except Exception as e:
         logging.error("Error in scheduled trading job: %s", str(e))
 
 scheduler = BackgroundScheduler()
-scheduler.add_job(run_trading_job, trigger='interval', seconds=60)
+# A run that overruns its slot is not doubled up, and missed runs collapse into one
+scheduler.add_job(run_trading_job, trigger='interval', seconds=60,
+                  max_instances=1, coalesce=True, misfire_grace_time=30)
 scheduler.start()
 
 atexit.register(lambda: scheduler.shutdown())
@@ -263,29 +362,41 @@ atexit.register(lambda: scheduler.shutdown())
 # ===========================
 # 💓 Health Check Endpoint
 # ===========================
+def exchange_checks():
+    health_data = {
+        "status": "healthy",
+        "message": "All systems are running smoothly."
+    }
+
+    # Ping and ticker checks run concurrently; failures come back as exceptions
+    ping, ticker = gateway.gather(
+        gateway.aio.ping(),
+        asyncio.to_thread(fetcher.fetch_ticker, config.TRADE_SYMBOL),
+    )
+
+    if isinstance(ping, Exception):
+        health_data["binance_api"] = f"Failed: {str(ping)}"
+        logging.error("Error with Binance API: %s", str(ping))
+    else:
+        health_data["binance_api"] = "Connected"
+
+    if isinstance(ticker, Exception):
+        health_data["data_fetcher"] = f"Failed: {str(ticker)}"
+        logging.error("Error with DataFetcher: %s", str(ticker))
+    else:
+        health_data["data_fetcher"] = "Working"
+    return health_data
+
 @app.route('/health', methods=['GET'])
 def health_check():
     logging.debug("Health check initiated.")
     try:
-        health_data = {
-            "status": "healthy",
-            "message": "All systems are running smoothly."
-        }
-
-        try:
-            client.ping()
-            health_data["binance_api"] = "Connected"
-        except Exception as e:
-            health_data["binance_api"] = f"Failed: {str(e)}"
-            logging.error("Error with Binance API: %s", str(e))
-
-        try:
-            fetcher.fetch_ticker(config.TRADE_SYMBOL)
-            health_data["data_fetcher"] = "Working"
-        except Exception as e:
-            health_data["data_fetcher"] = f"Failed: {str(e)}"
-            logging.error("Error with DataFetcher: %s", str(e))
-
+        # Exchange checks are cached; the in-process metrics below are always current
+        health_data = dict(response_cache.get_or_compute("health", ROUTE_TTLS['health'], exchange_checks))
+        health_data["market_stream"] = market_stream.metrics()
+        health_data["response_cache"] = response_cache.metrics()
+        health_data["ticks"] = tick_guard.metrics()
+        health_data["ensemble"] = strategy_ensemble.metrics()
         return jsonify(health_data), 200
     except Exception as e:
         logging.error("Health check failed: %s", str(e))
@@ -0,0 +1,123 @@
+import asyncio
+import time
+
+import pytest
+
+from backend.exchange.async_gateway import AsyncExchangeGateway, GatewayError, SyncExchangeGateway
+from backend.exchange.stub_server import StubExchangeServer
+
+
+@pytest.fixture
+def stub():
+    with StubExchangeServer() as server:
+        yield server
+
+
+def make_gateway(stub, **kwargs):
+    return AsyncExchangeGateway("key", "secret", base_url=stub.url, futures_url=stub.url, **kwargs)
+
+
+def test_spot_margin_and_futures_operations(stub):
+    async def scenario():
+        async with make_gateway(stub, use_futures=True) as gateway:
+            assert await gateway.ping() == {}
+            assert (await gateway.get_ticker("BTCUSDT"))["symbol"] == "BTCUSDT"
+            assert {b["asset"] for b in await gateway.get_balance()} == {"USDT", "BTC"}
+
+            order = await gateway.place_market_order("BTCUSDT", "BUY", 0.01)
+            assert (await gateway.get_order_status("BTCUSDT", order["orderId"]))["status"] == "FILLED"
+            assert (await gateway.cancel_order("BTCUSDT", order["orderId"]))["status"] == "CANCELED"
+
+            await gateway.place_margin_order("ETHUSDT", "SELL", 1)
+            await gateway.borrow_margin("USDT", 10)
+            assert (await gateway.set_leverage("BTCUSDT", 5))["leverage"] == 5
+            assert (await gateway.get_futures_balance())[0]["asset"] == "USDT"
+            assert (await gateway.get_open_futures_positions())[0]["symbol"] == "BTCUSDT"
+
+    asyncio.run(scenario())
+
+
+def test_conditional_orders(stub):
+    limiter_calls = []
+
+    class RecordingLimiter:
+        async def acquire_async(self, endpoint):
+            limiter_calls.append(endpoint)
+
+        def sync_used_weight(self, used):
+            pass
+
+        def penalize(self, retry_after):
+            pass
+
+    async def scenario():
+        async with make_gateway(stub, use_futures=True, rate_limiter=RecordingLimiter(),
+                                futures_rate_limiter=RecordingLimiter()) as gateway:
+            trailing = await gateway.place_trailing_stop_order("BTCUSDT", "SELL", 0.01, 30000.0, 1.0)
+            assert trailing["type"] == "STOP_MARKET" and float(trailing["price"]) == pytest.approx(29700.0)
+            take_profit = await gateway.place_take_profit_order("BTCUSDT", "SELL", 0.01, 35000.0)
+            assert take_profit["type"] == "LIMIT" and take_profit["timeInForce"] == "GTC"
+            spot_stop = await gateway.place_stop_loss_order("BTCUSDT", "SELL", 0.01, 28000.0)
+            futures_stop = await gateway.place_stop_loss_order("BTCUSDT", "SELL", 0.01, 28000.0, is_futures=True)
+            assert spot_stop["type"] == "STOP_LOSS" and futures_stop["type"] == "STOP_MARKET"
+            assert float(futures_stop["stopPrice"]) == 28000.0
+        async with make_gateway(stub) as spot_only:
+            with pytest.raises(GatewayError):
+                await spot_only.place_take_profit_order("BTCUSDT", "SELL", 0.01, 35000.0)
+
+    asyncio.run(scenario())
+    assert limiter_calls == ['futures_order', 'futures_order', 'stop_loss_order', 'stop_loss_order']
+    assert [path for _, path in stub.requests[-4:]] == ["/fapi/v1/order", "/fapi/v1/order", "/api/v3/order",
+                                                         "/fapi/v1/order"]
+
+
+def test_errors_raise_gateway_error(stub):
+    async def scenario():
+        async with make_gateway(stub) as gateway:
+            with pytest.raises(GatewayError) as excinfo:
+                await gateway.get_order_status("BTCUSDT", 999)
+            assert excinfo.value.status == 400
+            with pytest.raises(GatewayError):
+                await gateway.set_leverage("BTCUSDT", 5)  # futures not enabled
+        async with AsyncExchangeGateway(base_url=stub.url) as anonymous:
+            with pytest.raises(GatewayError):
+                await anonymous.get_balance()
+
+    asyncio.run(scenario())
+
+
+def test_proxy_error_page_raises_gateway_error(stub):
+    async def scenario():
+        stub.proxy_error = 502
+        async with make_gateway(stub) as gateway:
+            with pytest.raises(GatewayError) as excinfo:
+                await gateway.ping()
+            assert excinfo.value.status == 502 and "Bad Gateway" in str(excinfo.value)
+
+    asyncio.run(scenario())
+
+
+def test_fan_out_is_concurrent(stub):
+    stub.latency = 0.1
+    symbols = [f"SYM{i}USDT" for i in range(10)]
+
+    async def scenario():
+        async with make_gateway(stub) as gateway:
+            began = time.perf_counter()
+            tickers = await gateway.get_tickers(symbols)
+            return tickers, time.perf_counter() - began
+
+    tickers, elapsed = asyncio.run(scenario())
+    assert list(tickers) == symbols
+    assert elapsed < 0.5  # ten 100ms requests in parallel, not 1s in sequence
+
+
+def test_sync_facade(stub):
+    gateway = SyncExchangeGateway(make_gateway(stub))
+    try:
+        assert gateway.get_ticker("ETHUSDT")["symbol"] == "ETHUSDT"
+        pong, missing = gateway.gather(gateway.aio.ping(), gateway.aio.get_order_status("BTCUSDT", 1))
+        assert pong == {}
+        assert isinstance(missing, GatewayError)
+    finally:
+        gateway.close()
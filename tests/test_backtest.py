@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+
+from backend.backtesting.engine import (Backtester, apply_status_gate, model_positions, performance_metrics,
+                                        run_backtest, sma_crossover_positions, standardized_windows)
+from backend.core.status_manager import StatusManager
+from backend.data.candle_store import CandleStore
+from backend.data.kline_sources import FakeKlineSource
+
+MINUTE = 60_000
+
+
+def random_walk(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return 30000 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+
+
+def loop_sma_positions(close, short_window, long_window):
+    # TradingLogic.calculate_indicators + check_trade_signal, one candle at a time
+    position, out = None, []
+    for t in range(len(close)):
+        window = close[:t + 1]
+        if len(window) >= long_window:
+            short_sma = sum(window[-short_window:]) / short_window
+            long_sma = sum(window[-long_window:]) / long_window
+            if short_sma > long_sma and position != 'long':
+                position = 'long'
+            elif short_sma < long_sma and position != 'short':
+                position = 'short'
+        out.append({'long': 1, 'short': -1, None: 0}[position])
+    return np.array(out)
+
+
+def loop_gate(timestamps, desired, cooldown_ms, confidence, threshold):
+    position, last, out = 0, None, []
+    for t, target in enumerate(desired):
+        cooled = last is None or timestamps[t] - last > cooldown_ms
+        if target != position and cooled and confidence[t] >= threshold:
+            position, last = target, timestamps[t]
+        out.append(position)
+    return np.array(out)
+
+
+def test_sma_positions_match_live_signal_logic():
+    close = random_walk(600)
+    np.testing.assert_array_equal(sma_crossover_positions(close, 10, 40), loop_sma_positions(close, 10, 40))
+
+
+def test_status_gate_matches_per_candle_loop():
+    rng = np.random.default_rng(3)
+    n = 2000
+    timestamps = np.arange(n, dtype=np.int64) * MINUTE
+    desired = np.repeat(rng.integers(-1, 2, n // 5), 5).astype(np.int8)
+    confidence = rng.random(n)
+    positions, trades = apply_status_gate(timestamps, desired, 7 * MINUTE, confidence, 0.6)
+    np.testing.assert_array_equal(positions, loop_gate(timestamps, desired, 7 * MINUTE, confidence, 0.6))
+    assert np.all(positions[trades] != np.concatenate(([0], positions))[trades])
+
+
+def test_model_positions_follow_prediction_direction():
+    positions = model_positions([1.0, 2.0, 2.0, 1.5], time_steps=3, n_rows=6)
+    # predictions cover windows ending at rows 2..5; the first comparable one is row 3
+    np.testing.assert_array_equal(positions, [0, 0, 0, 1, 1, -1])
+
+
+def test_stop_loss_applies_while_the_gate_holds_a_position_past_its_signal():
+    timestamps = np.arange(6, dtype=np.int64) * MINUTE
+    close = np.array([100.0, 100.0, 100.0, 97.0, 94.0, 99.0])
+    # the signal goes flat at row 2, but the 10-minute cooldown keeps the long open into the drop
+    positions, trades = apply_status_gate(timestamps, np.array([1, 1, 0, 0, 0, 0], dtype=np.int8),
+                                          10 * MINUTE, close=close, stop_loss=5)
+    np.testing.assert_array_equal(positions, [1, 1, 1, 1, 0, 0])
+    np.testing.assert_array_equal(trades, [0, 4])
+
+
+def test_model_windows_are_standardised_without_later_rows():
+    features = random_walk(100)[:, None]
+    windows = standardized_windows(features, 10)
+    changed = features.copy()
+    changed[50:] *= 2.0
+    np.testing.assert_array_equal(standardized_windows(changed, 10)[:41], windows[:41])
+    assert windows.shape == (91, 10, 1)
+    np.testing.assert_allclose(windows.mean(axis=1), 0.0, atol=1e-5)
+
+
+def test_metrics_for_a_single_long_trade():
+    timestamps = np.arange(4, dtype=np.int64) * MINUTE
+    close = np.array([100.0, 110.0, 99.0, 120.0])
+    metrics, equity = performance_metrics(timestamps, close, [1, 1, 0, 0], fee_rate=0.0, initial_capital=1000.0)
+    np.testing.assert_allclose(equity, [1000.0, 1100.0, 990.0, 990.0])
+    assert metrics["P&L"] == pytest.approx(-10.0)
+    assert metrics["Max Drawdown"] == pytest.approx(-10.0)
+    assert metrics["Trades"] == 1 and metrics["Win Rate"] == 0.0
+
+
+def test_backtester_charges_fees_per_position_change():
+    timestamps = np.arange(3, dtype=np.int64) * MINUTE
+    close = np.full(3, 100.0)
+    backtester = Backtester(fee_rate=0.01, initial_capital=100.0, status_manager=StatusManager(0.0, 0))
+    result = backtester.run(timestamps, close, [1, -1, -1])
+    np.testing.assert_allclose(result.equity, [100.0, 99.0, 97.02])  # 1 unit in, then 2 units to flip
+    np.testing.assert_array_equal(result.trades, [0, 1])
+
+
+def test_run_backtest_over_candle_store(tmp_path):
+    now = 1_700_000_000.0
+    store = CandleStore(str(tmp_path), clock=lambda: now)
+    end = int(now * 1000)
+    start = end - 3 * 86_400_000
+    result = run_backtest('BTCUSDT', '1m', start, end, store=store, source=FakeKlineSource(clock=lambda: now),
+                          short_window=20, long_window=80)
+    assert result.metrics["Candles"] == len(result.equity) == 3 * 1440 - 1  # the open candle is not stored
+    assert set(result.metrics) >= {"P&L", "Sharpe Ratio", "Win Rate", "Max Drawdown"}
+
+    cached = run_backtest('BTCUSDT', '1m', start, end, store=store, short_window=20, long_window=80)
+    assert cached.metrics == result.metrics
+    with pytest.raises(ValueError):
+        run_backtest('BTCUSDT', '1m', start, end, strategy='martingale', store=store)
+    source = FakeKlineSource(clock=lambda: now)
+    with pytest.raises(ValueError, match="limited to"):
+        run_backtest('BTCUSDT', '1m', end - 10 * 365 * 86_400_000, end, store=store, source=source)
+    assert source.requests == 0
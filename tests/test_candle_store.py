@@ -0,0 +1,122 @@
+import threading
+import time
+
+import numpy as np
+from backend.data.candle_store import CandleStore
+from backend.data.kline_sources import FakeKlineSource
+
+HOUR = 3_600_000
+NOW = 1_699_999_200.0 + 1800  # fixed clock (seconds), half way through an hourly candle
+
+def make_store(tmp_path):
+    source = FakeKlineSource(clock=lambda: NOW)
+    return CandleStore(str(tmp_path), source=source, clock=lambda: NOW), source
+
+def test_cold_then_warm_history_only_hits_network_once(tmp_path):
+    store, source = make_store(tmp_path)
+    end = int(NOW * 1000)
+    start = end - 2000 * 60_000
+    ts, values = store.history("BTCUSDT", "1m", start, end)
+    cold_requests = source.requests
+    assert cold_requests == 2 and len(ts) == 2000
+    assert np.all(np.diff(ts) == 60_000) and ts[-1] + 60_000 <= end
+    ts2, values2 = store.history("BTCUSDT", "1m", start, end)
+    assert source.requests == cold_requests
+    np.testing.assert_array_equal(ts, ts2)
+    np.testing.assert_array_equal(values, values2)
+
+def test_partitions_by_day_and_fills_only_gaps(tmp_path):
+    store, source = make_store(tmp_path)
+    end = int(NOW * 1000)
+    store.history("ETHUSDT", "1h", end - 48 * HOUR, end - 24 * HOUR)
+    assert len(list((tmp_path / "ETHUSDT" / "1h").glob("*.npy"))) >= 2
+    open_hour = (end // HOUR) * HOUR
+    assert store.missing_ranges("ETHUSDT", "1h", end - 72 * HOUR, end) == [
+        (open_hour - 71 * HOUR, open_hour - 47 * HOUR),
+        (open_hour - 23 * HOUR, open_hour),
+    ]
+    ts, _ = store.history("ETHUSDT", "1h", end - 72 * HOUR, end)
+    assert len(ts) == 71 and source.requests == 3
+
+def test_open_candle_is_not_persisted(tmp_path):
+    store, _ = make_store(tmp_path)
+    open_time = (int(NOW * 1000) // HOUR) * HOUR
+    assert store.write("BTCUSDT", "1h", [open_time - HOUR, open_time], np.ones((2, 5))) == 1
+    ts, _ = store.load("BTCUSDT", "1h", open_time - HOUR, open_time + HOUR)
+    assert ts.tolist() == [open_time - HOUR]
+
+def test_only_recent_partitions_stay_mapped(tmp_path):
+    store = CandleStore(str(tmp_path), source=FakeKlineSource(clock=lambda: NOW), clock=lambda: NOW, max_open=4)
+    end = int(NOW * 1000)
+    ts, _ = store.history("BTCUSDT", "1h", end - 30 * 24 * HOUR, end)
+    assert len(ts) == 30 * 24 - 1 and len(store._maps) <= 4  # the open candle is not stored
+
+class ListedSource(FakeKlineSource):
+    """No candles before ``listed_at`` (ms), like a pair that was listed recently."""
+
+    def __init__(self, listed_at, **kwargs):
+        super().__init__(**kwargs)
+        self.listed_at = listed_at
+
+    def get_klines(self, symbol, interval, startTime=None, endTime=None, limit=1000):
+        klines = super().get_klines(symbol, interval, startTime=startTime, endTime=endTime, limit=limit)
+        return [k for k in klines if k[0] >= self.listed_at]
+
+def test_ranges_the_exchange_has_no_candles_for_are_not_downloaded_again(tmp_path):
+    end = int(NOW * 1000)
+    listed_at = (end // HOUR - 10 * 24) * HOUR
+    source = ListedSource(listed_at, clock=lambda: NOW)
+    store = CandleStore(str(tmp_path), source=source, clock=lambda: NOW)
+    ts, _ = store.history("NEWUSDT", "1h", end - 20 * 24 * HOUR, end)
+    requests = source.requests
+    assert ts[0] == listed_at
+    store.history("NEWUSDT", "1h", end - 20 * 24 * HOUR, end)
+    assert source.requests == requests
+    assert store.missing_ranges("NEWUSDT", "1h", end - 20 * 24 * HOUR, end) == []
+
+def _write_hours(root, parity):
+    store = CandleStore(root, clock=lambda: NOW)
+    day_start = (int(NOW * 1000) // 86_400_000 - 1) * 86_400_000
+    for hour in range(parity, 24, 2):
+        store.write("BTCUSDT", "1h", [day_start + hour * HOUR], np.ones((1, 5)))
+
+def test_writers_in_several_processes_do_not_lose_rows(tmp_path):
+    import multiprocessing
+    workers = [multiprocessing.Process(target=_write_hours, args=(str(tmp_path), p)) for p in (0, 1)]
+    for p in workers:
+        p.start()
+    for p in workers:
+        p.join()
+    day_start = (int(NOW * 1000) // 86_400_000 - 1) * 86_400_000
+    ts, _ = CandleStore(str(tmp_path), clock=lambda: NOW).load("BTCUSDT", "1h", day_start, day_start + 24 * HOUR)
+    assert len(ts) == 24
+
+class BlockingSource(FakeKlineSource):
+    def __init__(self, clock):
+        super().__init__(clock=clock)
+        self.entered, self.release = threading.Event(), threading.Event()
+
+    def get_klines(self, symbol, interval, **kwargs):
+        if symbol == "BTCUSDT":
+            self.entered.set()
+            self.release.wait(5)
+        return super().get_klines(symbol, interval, **kwargs)
+
+def test_one_symbols_download_does_not_block_other_symbols(tmp_path):
+    now = 1_700_000_000.0
+    store = CandleStore(str(tmp_path), clock=lambda: now)
+    source = BlockingSource(clock=lambda: now)
+    end = int(now * 1000)
+    start = end - 6 * 3_600_000
+    store.history("BTCUSDT", "1h", start - 86_400_000, start, source=FakeKlineSource(clock=lambda: now))
+    slow = threading.Thread(target=store.backfill, args=("BTCUSDT", "1h", start, end, source))
+    slow.start()
+    try:
+        assert source.entered.wait(5)
+        began = time.monotonic()
+        timestamps, _ = store.history("ETHUSDT", "1h", start, end, source=source)
+        assert len(store.load("BTCUSDT", "1h", start - 86_400_000, start)[0]) == 24
+        assert len(timestamps) == 5 and time.monotonic() - began < 1.0
+    finally:
+        source.release.set()
+        slow.join()
@@ -0,0 +1,159 @@
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.ai_models import ensemble as ensemble_module
+from backend.ai_models.ensemble import (EnsembleMember, StrategyWeights, WeightedEnsemble, get_strategy_ensemble,
+                                       ohlcv_values, price_member, rl_member)
+from backend.ai_models.rl_model import RLTradingModel
+
+
+def candles(n=80):
+    close = 100.0 + np.arange(n, dtype=float)
+    return np.column_stack([close, close + 1, close - 1, close, np.full(n, 5.0)])
+
+
+def sleeper(name, score, delay):
+    def run(values):
+        time.sleep(delay)  # stands in for a model call that releases the GIL
+        return score(values) if callable(score) else score
+    return EnsembleMember(name, run)
+
+
+def test_members_run_concurrently_and_combine_by_weight():
+    ensemble = WeightedEnsemble(
+        [sleeper('lstm', 1.0, 0.2), sleeper('trading_ai', -1.0, 0.2), sleeper('rl', 1.0, 0.2)],
+        weights=lambda: {'lstm': 0.5, 'trading_ai': 0.25, 'rl': 0.25})
+    result = ensemble.predict(candles())
+
+    assert result.score == pytest.approx(0.5)
+    assert result.signal == 'BUY'
+    assert result.latency < 0.35  # about the slowest member, not the 0.6s sum
+    assert all(m.latency >= 0.2 for m in result.members.values())
+    metrics = ensemble.metrics()
+    assert set(metrics) == {'lstm', 'trading_ai', 'rl', 'ensemble'}
+    assert metrics['lstm']['calls'] == 1 and metrics['lstm']['mean_ms'] >= 200
+    ensemble.close()
+
+
+def test_abstaining_failing_slow_and_unweighted_members_are_left_out():
+    def fail(values):
+        raise RuntimeError("model not loaded")
+
+    ensemble = WeightedEnsemble(
+        [sleeper('lstm', -0.5, 0.0), EnsembleMember('trading_ai', fail), sleeper('rl', None, 0.0),
+         sleeper('slow', 1.0, 1.0), sleeper('off', 1.0, 0.0)],
+        weights=lambda: {'lstm': 0.3, 'trading_ai': 0.3, 'rl': 0.3, 'slow': 0.1, 'off': 0.0}, timeout=0.3)
+    result = ensemble.predict(candles())
+
+    assert result.score == pytest.approx(-0.5) and result.signal == 'SELL'
+    assert result.members['trading_ai'].error == "model not loaded"
+    assert result.members['rl'].score is None and result.members['rl'].error is None
+    assert result.members['slow'].error == 'timed out'
+    assert result.members['off'].weight == 0.0
+    assert 'off' not in ensemble.metrics() and ensemble.metrics()['trading_ai']['errors'] == 1
+    ensemble.close()
+
+
+def test_members_share_one_read_only_window():
+    seen = []
+
+    def grab(values):
+        seen.append(values)
+        values[0, 0] = 0.0
+
+    ensemble = WeightedEnsemble([EnsembleMember('a', grab), EnsembleMember('b', grab)],
+                                weights=lambda: {'a': 1.0, 'b': 1.0})
+    frame = pd.DataFrame(candles(), columns=['Open', 'High', 'Low', 'Close', 'Volume']).assign(Timestamp=0)
+    result = ensemble.predict(frame)
+
+    assert seen[0] is seen[1] and seen[0].shape == (80, 5)
+    assert 'read-only' in result.members['a'].error
+    np.testing.assert_array_equal(ohlcv_values(frame), candles())
+    ensemble.close()
+
+
+class LastValueModel:
+    """Predicts that the next input value repeats the last one."""
+
+    def predict(self, windows):
+        return np.asarray(windows)[-1:, 0]
+
+
+def test_price_member_compares_the_prediction_in_price_terms():
+    values = candles()
+    values[:, 3] = 30_000.0 + np.arange(80) * 10.0
+    assert price_member('lstm', LastValueModel(), 60).score(values) == pytest.approx(0.0, abs=1e-9)
+    assert price_member('lstm', LastValueModel(), 100).score(values) is None
+
+
+def random_walk(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 30_000.0 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    return np.column_stack([close, close * 1.001, close * 0.999, close, rng.uniform(1, 10, n)])
+
+
+def test_strategy_ensemble_members_all_answer(monkeypatch):
+    history = random_walk(5000)
+    values = history[-201:-1]  # ends on a candle the RL model trained on
+    monkeypatch.setattr(ensemble_module, '_ensemble', None)
+    ensemble = get_strategy_ensemble(rl_history=lambda: history)
+    equal = WeightedEnsemble(ensemble.members, weights=lambda: {'lstm': 1.0, 'trading_ai': 1.0, 'rl': 1.0})
+    result = equal.predict(values)
+    equal.close()
+
+    for name in ('lstm', 'trading_ai', 'rl'):
+        member = result.members[name]
+        assert member.error is None and -1.0 <= member.score <= 1.0, (name, member)
+    assert result.members['trading_ai'].score != 0.0  # per-window predictions, so two to compare
+
+
+def test_rl_member_abstains_on_states_it_never_learned():
+    values = random_walk(200)
+    untrained = RLTradingModel(state_size=1, action_size=3)
+    member = rl_member('rl', untrained, history=lambda: values[:30])
+    assert member.score(values) is None  # too little history to train on
+    assert untrained.discretizer is None
+
+    model = RLTradingModel(state_size=1, action_size=3)
+    member = rl_member('rl', model, history=lambda: values)
+    member.score(values)
+    assert model.discretizer.fitted
+    model.q_table[:] = 0.0
+    assert member.score(values) is None  # trained discretizer, but the state's Q row was never updated
+    model.q_table[:, 0] = model.q_table[:, 2] = 0.5
+    assert member.score(values) is None  # short and long tied
+    model.q_table[:, 2] = 1.0
+    assert member.score(values) == 1.0
+
+
+def test_weights_reload_only_when_the_file_changes(tmp_path):
+    path = tmp_path / "strategy_weights.json"
+    weights = StrategyWeights(str(path), defaults={'lstm': 1.0}, check_interval=0.0)
+    assert weights.get() == {'lstm': 1.0}
+
+    path.write_text(json.dumps({'lstm': 0.2, 'rl': 0.8}))
+    assert weights.get() == {'lstm': 0.2, 'rl': 0.8}
+    assert weights.get() == {'lstm': 0.2, 'rl': 0.8} and weights.reloads == 1
+
+    weights.write({'lstm': 0.6, 'rl': 0.4})
+    assert weights.get() == {'lstm': 0.6, 'rl': 0.4} and weights.reloads == 2
+
+    mtime = os.stat(path).st_mtime_ns
+    path.write_text("{not json")
+    os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+    assert weights.get() == {'lstm': 0.6, 'rl': 0.4}  # a bad file keeps the last good weights
+
+
+def test_weights_are_not_restatted_within_the_check_interval(tmp_path):
+    path = tmp_path / "strategy_weights.json"
+    path.write_text(json.dumps({'lstm': 1.0}))
+    weights = StrategyWeights(str(path), check_interval=60.0)
+    assert weights.get() == {'lstm': 1.0}
+    path.write_text(json.dumps({'lstm': 0.5, 'rl': 0.5}))
+    assert weights.get() == {'lstm': 1.0}
+    assert weights.reload() == {'lstm': 0.5, 'rl': 0.5}
@@ -0,0 +1,26 @@
+import os
+
+import pytest
+
+from benchmarks.bench_import_time import ENTRY_MODULES, heavy_imports, measure
+
+# Generous enough for slow CI machines; a regression that pulls in TensorFlow costs several seconds
+IMPORT_BUDGET_S = float(os.getenv("IMPORT_BUDGET_S", "1.5"))
+
+
+@pytest.mark.parametrize("module", ENTRY_MODULES)
+def test_entry_modules_import_without_ml_stack(module):
+    timings = measure(module)
+    assert heavy_imports(timings) == []
+    assert timings[module] / 1e6 < IMPORT_BUDGET_S
+
+
+def test_lazy_package_attributes_still_resolve():
+    import backend.data
+    from backend.data.data_fetcher import DataFetcher, get_market_data
+
+    assert backend.data.DataFetcher is DataFetcher
+    assert backend.data.get_market_data is get_market_data
+    assert "DataFetcher" in dir(backend.data)
+    with pytest.raises(AttributeError):
+        backend.data.NoSuchThing
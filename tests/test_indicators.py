@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.data.indicators import (FEATURE_COLUMNS, IndicatorEngine, SMACrossover, StreamingSMA, feature_frame,
+                                     rolling_mean, sma_crossover_positions)
+from backend.data.market_hub import MarketStream
+
+def random_walk(n, seed=7):
+    rng = np.random.default_rng(seed)
+    return 30000 + np.cumsum(rng.normal(0, 25, n))
+
+def test_streaming_matches_pandas_every_step():
+    closes = random_walk(600)
+    expected = feature_frame(closes)
+    engine = IndicatorEngine()
+    for i, close in enumerate(closes):
+        engine.update(close)
+        latest = engine.latest()
+        row = expected.iloc[i]
+        if latest is None:
+            assert i + 1 < engine.min_periods or np.isnan(row['RSI_14'])
+            continue
+        np.testing.assert_allclose([latest[c] for c in FEATURE_COLUMNS], row[FEATURE_COLUMNS].to_numpy(), rtol=1e-10)
+
+def test_replace_last_matches_final_close():
+    closes = random_walk(100)
+    engine = IndicatorEngine()
+    engine.update_many(closes[:-1])
+    engine.update(closes[-1] + 500)  # provisional value of the open candle
+    engine.update(closes[-1], replace_last=True)
+    expected = feature_frame(closes).iloc[-1][FEATURE_COLUMNS].to_numpy()
+    np.testing.assert_allclose(engine.latest_features()[0], expected, rtol=1e-10)
+
+def test_flat_prices_have_undefined_rsi():
+    engine = IndicatorEngine()
+    engine.update_many([100.0] * 30)
+    assert engine.latest() is None
+    assert np.isnan(feature_frame([100.0] * 30)['RSI_14'].iloc[-1])
+
+def test_market_stream_feature_frame_skips_duplicate_candles():
+    closes = random_walk(150)
+    ts = pd.date_range("2024-01-01", periods=len(closes), freq="min")
+    df = pd.DataFrame({'Timestamp': ts, 'Open': closes, 'High': closes, 'Low': closes, 'Close': closes, 'Volume': 1.0})
+    stream = MarketStream("BTCUSDT", "1m", capacity=120)
+    stream.ingest_frame(df.iloc[:100])
+    stream.ingest_frame(df.iloc[50:])  # overlapping fetch
+    expected = feature_frame(closes).iloc[-1][FEATURE_COLUMNS].to_numpy()
+    np.testing.assert_allclose(stream.latest_feature_frame()[0], expected, rtol=1e-10)
+    assert stream.indicators.count == len(closes)
+
+
+def test_streaming_sma_crossover_matches_batch_positions():
+    closes = 30000 * np.exp(np.cumsum(np.random.default_rng(4).normal(0, 0.003, 3000)))
+    crossover = SMACrossover(20, 80)
+    streamed = [crossover.update(c) for c in closes]
+    np.testing.assert_array_equal(streamed, sma_crossover_positions(closes, 20, 80))
+    assert crossover.long_sma == pytest.approx(closes[-80:].mean(), rel=1e-12)
+
+    sma = StreamingSMA(5)
+    values = [sma.update(c) for c in closes[:50]]
+    assert values[:4] == [None] * 4
+    np.testing.assert_allclose(values[4:], rolling_mean(closes[:50], 5)[4:], rtol=1e-12)
+
+
+def test_trading_logic_crossover_is_ready_after_first_update(tmp_path, monkeypatch):
+    from backend.data.candle_store import CandleStore
+    from backend.data.kline_sources import FakeKlineSource
+    from backend.training_logic import order_execution
+
+    now = 1_699_999_200.0 + 1800  # half way through an hourly candle
+    monkeypatch.setattr(order_execution.time, 'time', lambda: now)
+    source = FakeKlineSource(clock=lambda: now)
+    logic = order_execution.TradingLogic.__new__(order_execution.TradingLogic)  # no exchange client needed
+    logic.symbol, logic.short_window, logic.long_window = 'BTCUSDT', 50, 200
+    logic.candle_store = CandleStore(str(tmp_path), source=source, clock=lambda: now)
+    logic.kline_source = source
+    logic.crossover = SMACrossover(50, 200)
+    logic._next_candle = None
+
+    short_sma, long_sma = logic.update_indicators()
+    assert short_sma is not None and long_sma is not None
+    assert logic.crossover.ready
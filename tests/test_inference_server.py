@@ -0,0 +1,71 @@
+import threading
+
+import numpy as np
+import pytest
+
+from backend.ai_models.inference_server import BatchingInferenceServer, get_inference_server
+
+
+class RecordingModel:
+    def __init__(self):
+        self.batch_sizes = []
+        self.gate = threading.Event()
+
+    def __call__(self, x):
+        self.gate.wait(1)
+        self.batch_sizes.append(len(x))
+        return x.reshape(len(x), -1).sum(axis=1, keepdims=True)
+
+
+def test_concurrent_requests_share_a_forward_pass():
+    model = RecordingModel()
+    with BatchingInferenceServer(model, max_batch_size=64, max_wait=0.05) as server:
+        futures = [server.submit(np.full((1, 3, 2), i)) for i in range(20)]
+        model.gate.set()
+        results = [f.result(2) for f in futures]
+
+    assert [float(r[0, 0]) for r in results] == [6.0 * i for i in range(20)]
+    assert sum(model.batch_sizes) == 20
+    assert len(model.batch_sizes) <= 2
+
+
+def test_batches_are_cut_at_max_batch_size():
+    model = RecordingModel()
+    model.gate.set()
+    with BatchingInferenceServer(model, max_batch_size=4, max_wait=0.05) as server:
+        futures = [server.submit(np.ones((2, 3))) for _ in range(6)]
+        for f in futures:
+            assert f.result(2).shape == (2, 1)
+        metrics = server.metrics()
+
+    assert max(model.batch_sizes) <= 4
+    assert metrics['requests'] == 6
+    assert metrics['rows'] == 12
+    assert metrics['latency_ms_p95'] >= metrics['latency_ms_p50'] > 0
+
+
+def test_mixed_shapes_and_failures():
+    def predict(x):
+        if x.shape[1] == 5:
+            raise RuntimeError("bad shape")
+        return x[:, :1]
+
+    with BatchingInferenceServer(predict, max_wait=0.02) as server:
+        good = server.submit(np.ones((1, 3)))
+        bad = server.submit(np.ones((1, 5)))
+        assert good.result(2).shape == (1, 1)
+        with pytest.raises(RuntimeError):
+            bad.result(2)
+
+    with pytest.raises(RuntimeError):
+        server.submit(np.ones((1, 3)))
+
+
+def test_keras_models_get_a_shared_server():
+    keras = pytest.importorskip("tensorflow.keras")
+    model = keras.Sequential([keras.Input(shape=(4,)), keras.layers.Dense(1)])
+    server = get_inference_server(model, max_wait=0.01)
+    assert get_inference_server(model) is server
+
+    x = np.random.rand(3, 4).astype(np.float32)
+    np.testing.assert_allclose(server.predict(x), model.predict(x, verbose=0), rtol=1e-5)
@@ -0,0 +1,106 @@
+import json
+import threading
+import time
+from backend.data.data_fetcher import DataFetcher
+from backend.data.market_hub import MarketDataHub
+
+class FakeClient:
+    def __init__(self, now_ms):
+        self.now_ms = now_ms
+        self.calls = []
+
+    def get_klines(self, symbol, interval, limit=500, startTime=None):
+        self.calls.append(("klines", symbol, startTime))
+        end = self.now_ms - self.now_ms % 60_000
+        start = startTime if startTime is not None else end - (limit - 1) * 60_000
+        return [[t, "1", "2", "0.5", str(t / 60_000 % 97), "3", 0] for t in range(start, end + 1, 60_000)][:limit]
+
+    def get_symbol_ticker(self, symbol=None, symbols=None):
+        self.calls.append(("ticker", symbol or symbols))
+        names = [symbol] if symbol else json.loads(symbols)
+        tickers = [{"symbol": s, "price": "1.0"} for s in names]
+        return tickers[0] if symbol else tickers
+
+def make_hub(**kwargs):
+    hub = MarketDataHub(api_key="key", api_secret="secret", **kwargs)
+    hub._client = FakeClient(int(time.time() * 1000))
+    return hub
+
+def test_repeat_reads_are_served_from_memory():
+    hub = make_hub(ohlcv_ttl=60)
+    first = hub.fetch_ohlcv_data("BTCUSDT", "1m", limit=50)
+    second = hub.fetch_ohlcv_data("BTCUSDT", "1m", limit=50)
+    assert len(first) == 50 and second.equals(first)
+    assert len(hub.client.calls) == 1
+    assert hub.get_latest_feature_frame("BTCUSDT", "1m").shape == (1, 5)
+
+def test_stale_buffer_is_topped_up_incrementally():
+    hub = make_hub(ohlcv_ttl=0)
+    hub.fetch_ohlcv_data("ETHUSDT", "1m", limit=50)
+    last = hub.stream("ETHUSDT", "1m").buffer.last_timestamp
+    hub.fetch_ohlcv_data("ETHUSDT", "1m", limit=50)
+    assert hub.client.calls[-1] == ("klines", "ETHUSDT", last)
+    assert len(hub.stream("ETHUSDT", "1m").buffer) == 50
+
+def test_tickers_for_tracked_symbols_share_one_request():
+    hub = make_hub(ticker_ttl=60)
+    hub.fetch_tickers(["BTCUSDT", "ETHUSDT", "BNBUSDT"])
+    assert hub.fetch_ticker("ETHUSDT")["symbol"] == "ETHUSDT"
+    assert [c[0] for c in hub.client.calls] == ["ticker"]
+
+def test_symbols_no_longer_asked_for_drop_out_of_the_ticker_request():
+    hub = make_hub(ticker_ttl=0, ticker_retention=0.05)
+    hub.fetch_tickers(["BTCUSDT", "ETHUSDT"])
+    time.sleep(0.06)
+    hub.fetch_tickers(["BNBUSDT"])
+    assert hub.client.calls[-1] == ("ticker", "BNBUSDT")
+
+class SlowClient(FakeClient):
+    def __init__(self, now_ms):
+        super().__init__(now_ms)
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def get_klines(self, *args, **kwargs):
+        self.entered.set()
+        self.release.wait(5)
+        return super().get_klines(*args, **kwargs)
+
+    def get_symbol_ticker(self, *args, **kwargs):
+        self.entered.set()
+        self.release.wait(5)
+        return super().get_symbol_ticker(*args, **kwargs)
+
+def test_pushed_updates_do_not_wait_for_rest_downloads():
+    hub = make_hub(ticker_ttl=60)
+    hub._client = client = SlowClient(hub.client.now_ms)
+    for download in (lambda: hub.fetch_tickers(["ETHUSDT"]), lambda: hub.fetch_ohlcv_data("BTCUSDT", "1m", limit=50)):
+        client.entered.clear()
+        client.release.clear()
+        worker = threading.Thread(target=download)
+        worker.start()
+        assert client.entered.wait(5)
+        began = time.monotonic()
+        hub.apply_trade("ETHUSDT", 2.0)
+        hub.apply_kline("BTCUSDT", "1m", client.now_ms - client.now_ms % 60_000, [1, 2, 0.5, 1.5, 3])
+        assert time.monotonic() - began < 0.5
+        client.release.set()
+        worker.join()
+    # pushed candles stay on top of the history downloaded around them
+    stream = hub.stream("BTCUSDT", "1m")
+    assert len(stream.buffer) == 50 and stream.buffer.column("close")[-1] == 1.5
+    assert hub.fetch_ticker("ETHUSDT")["price"] == "2.0"  # a download that started earlier does not overwrite it
+
+def test_fetcher_buffer_limit_sizes_the_hub_buffers():
+    hub = make_hub(buffer_limit=100)
+    fetcher = DataFetcher("key", "secret", trade_symbol="BTCUSDT", buffer_limit=300, hub=hub)
+    assert fetcher.ohlcv_buffer.capacity == 300
+    assert DataFetcher("key", "secret", trade_symbol="BTCUSDT", buffer_limit=50, hub=hub).buffer_limit == 300
+
+def test_fetchers_share_the_hub():
+    hub = make_hub()
+    a = DataFetcher("key", "secret", trade_symbol="BTCUSDT", hub=hub)
+    b = DataFetcher("key", "secret", trade_symbol="ETHUSDT", hub=hub)
+    assert a.client is b.client
+    a.fetch_ohlcv_data(limit=30)
+    assert len(a.ohlcv_buffer) == 30 and len(b.ohlcv_buffer) == 0
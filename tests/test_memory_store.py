@@ -0,0 +1,72 @@
+import json
+import multiprocessing
+import os
+
+from backend.core.memory_store import ConversationStore
+
+
+def turn(i):
+    return {"user": f"question {i}", "ai": f"answer {i}"}
+
+
+def test_pages_and_last_turns(tmp_path):
+    store = ConversationStore(str(tmp_path / "memory.jsonl"))
+    assert store.last(5) == [] and store.read() == []
+    for i in range(10):
+        assert store.append(turn(i)) == i
+
+    assert len(store) == 10
+    assert store.read() == [turn(i) for i in range(10)]
+    assert store.read(3, 4) == [turn(i) for i in range(3, 7)]
+    assert store.read(8, 5) == [turn(8), turn(9)]
+    assert store.read(20, 5) == []
+    assert store.last(3) == [turn(7), turn(8), turn(9)]
+    assert store.last(50) == store.read()
+
+    store.reset()
+    assert len(store) == 0 and store.last(3) == []
+
+
+def _write_turns(path, worker, n):
+    store = ConversationStore(path)
+    for i in range(n):
+        store.append({"user": f"w{worker}", "ai": str(i)})
+
+
+def test_concurrent_writers_never_interleave(tmp_path):
+    path = str(tmp_path / "memory.jsonl")
+    ConversationStore(path).append(turn(0))  # parent's descriptors must not leak into the workers
+    workers = [multiprocessing.Process(target=_write_turns, args=(path, w, 200)) for w in range(4)]
+    for p in workers:
+        p.start()
+    for p in workers:
+        p.join()
+
+    turns = ConversationStore(path).read()
+    assert len(turns) == 801
+    for w in range(4):
+        assert [t["ai"] for t in turns if t["user"] == f"w{w}"] == [str(i) for i in range(200)]
+
+
+def test_interrupted_append_is_repaired(tmp_path):
+    path = str(tmp_path / "memory.jsonl")
+    store = ConversationStore(path)
+    store.extend([turn(0), turn(1)])
+    with open(path, "a") as f:
+        f.write(json.dumps(turn(2)) + "\n")  # written, but the writer died before indexing it
+        f.write('{"user": "torn')            # died mid-write
+
+    assert store.read() == [turn(0), turn(1)]
+    assert store.append(turn(3)) == 3
+    assert store.read() == [turn(0), turn(1), turn(2), turn(3)]
+
+
+def test_migrates_legacy_json_once(tmp_path):
+    legacy = tmp_path / "conversation_memory.json"
+    legacy.write_text(json.dumps([turn(i) for i in range(5)], indent=2))
+    store = ConversationStore(str(tmp_path / "memory.jsonl"))
+
+    assert store.migrate_json(str(legacy)) == 5
+    assert not legacy.exists() and os.path.exists(f"{legacy}.migrated")
+    assert store.migrate_json(str(legacy)) == 0
+    assert store.last(2) == [turn(3), turn(4)]
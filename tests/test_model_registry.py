@@ -0,0 +1,50 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from backend.ai_models.inference_server import get_inference_server
+from backend.ai_models.registry import ModelRegistry
+
+
+class Dummy:
+    builds = 0
+
+    def __init__(self, time_steps, n_features):
+        Dummy.builds += 1
+        time.sleep(0.05)
+        self.shape = (time_steps, n_features)
+
+
+def test_models_are_built_once_per_key(tmp_path):
+    Dummy.builds = 0
+    registry = ModelRegistry(builders={'DUMMY': Dummy}, model_dir=str(tmp_path))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get('dummy', 10, 3))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert Dummy.builds == 1
+    assert all(m is results[0] for m in results)
+    assert registry.get('DUMMY', 10, 4) is not results[0]
+    assert registry.get('DUMMY', 10, 3, version='v2') is not results[0]
+    assert Dummy.builds == 3
+    with pytest.raises(ValueError):
+        registry.get('NOPE')
+
+
+def test_keras_model_is_warmed_and_weights_round_trip(tmp_path):
+    pytest.importorskip("tensorflow")
+    registry = ModelRegistry(model_dir=str(tmp_path))
+    model = registry.get('LSTM', time_steps=5, n_features=2)
+    assert get_inference_server(model.model).metrics()['rows'] == 1  # the warm-up pass
+    assert registry.get('lstm', 5, 2) is model
+
+    path = registry.save('LSTM', 5, 2)
+    fresh = ModelRegistry(model_dir=str(tmp_path)).get('LSTM', 5, 2, warm=False)
+    x = np.random.rand(1, 5, 2).astype(np.float32)
+    np.testing.assert_allclose(fresh.model.predict(x, verbose=0), model.model.predict(x, verbose=0), rtol=1e-5)
+    assert path.endswith('lstm-t5-f2-latest.weights.h5')
@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from backend.data.order_book import OrderBook, OrderBookGap
+
+
+def diff(first, last, bids=(), asks=()):
+    return {"e": "depthUpdate", "U": first, "u": last,
+            "b": [[str(p), str(q)] for p, q in bids], "a": [[str(p), str(q)] for p, q in asks]}
+
+
+SNAPSHOT = {"lastUpdateId": 100,
+            "bids": [["99.0", "1.0"], ["98.0", "2.0"], ["97.0", "3.0"]],
+            "asks": [["101.0", "1.5"], ["102.0", "2.5"]]}
+
+
+def test_buffered_events_replay_over_snapshot():
+    book = OrderBook("BTCUSDT")
+    assert book.apply_diff(diff(95, 99, bids=[(99.0, 7.0)])) is False     # older than the snapshot
+    assert book.apply_diff(diff(100, 102, asks=[(101.0, 0.0)])) is False  # straddles it
+    assert book.best_bid() is None
+    book.load_snapshot(SNAPSHOT)
+    assert book.synced and book.last_update_id == 102
+    assert book.best_bid() == (99.0, 1.0) and book.best_ask() == (102.0, 2.5)
+
+    assert book.apply_diff(diff(101, 102, bids=[(99.5, 1.0)])) is False  # stale
+    assert book.apply_diff(diff(103, 104, bids=[(99.5, 4.0), (98.0, 0.0)])) is True
+    assert book.best_bid() == (99.5, 4.0) and book.depth_at(98.0) == 0.0
+    assert book.spread() == pytest.approx(2.5) and book.mid() == pytest.approx(100.75)
+    assert book.depth(2) == {"lastUpdateId": 104,
+                             "bids": [["99.50000000", "4.00000000"], ["99.00000000", "1.00000000"]],
+                             "asks": [["102.00000000", "2.50000000"]]}
+
+
+def test_gap_unsyncs_until_next_snapshot():
+    book = OrderBook("BTCUSDT")
+    book.load_snapshot(SNAPSHOT)
+    with pytest.raises(OrderBookGap):
+        book.apply_diff(diff(105, 106, bids=[(99.0, 5.0)]))
+    assert not book.synced and book.vwap("BUY", 1.0) is None
+    with pytest.raises(OrderBookGap):
+        book.load_snapshot(SNAPSHOT)  # still older than the buffered event
+    book.load_snapshot(dict(SNAPSHOT, lastUpdateId=104))
+    assert book.last_update_id == 106 and book.depth_at(99.0) == 5.0
+
+
+def test_vwap_walks_levels():
+    book = OrderBook("BTCUSDT")
+    book.load_snapshot(SNAPSHOT)
+    assert book.vwap("BUY", 1.0) == pytest.approx(101.0)
+    assert book.vwap("BUY", 3.0) == pytest.approx((1.5 * 101.0 + 1.5 * 102.0) / 3.0)
+    assert book.vwap("SELL", 2.0) == pytest.approx((99.0 + 98.0) / 2.0)
+    assert book.vwap("BUY", 10.0) is None  # deeper than the book
+    for size in (0, 0.0, -1.0):
+        with pytest.raises(ValueError):
+            book.vwap("BUY", size)
+
+
+def test_matches_reference_after_random_updates():
+    rng = random.Random(7)
+    book, reference = OrderBook("BTCUSDT"), {"b": {}, "a": {}}
+    book.load_snapshot({"lastUpdateId": 0, "bids": [], "asks": []})
+    for update_id in range(1, 2001):
+        side = rng.choice("ba")
+        price = round(100.0 + (rng.randint(-50, -1) if side == "b" else rng.randint(1, 50)) * 0.1, 1)
+        quantity = rng.choice([0.0, round(rng.uniform(0.1, 5.0), 3)])
+        if quantity:
+            reference[side][price] = quantity
+        else:
+            reference[side].pop(price, None)
+        book.apply_diff(diff(update_id, update_id, **{"bids" if side == "b" else "asks": [(price, quantity)]}))
+
+    bids = sorted(reference["b"].items(), reverse=True)
+    asks = sorted(reference["a"].items())
+    assert book.best_bid() == bids[0] and book.best_ask() == asks[0]
+    assert len(book) == len(bids) + len(asks)
+    depth = book.depth(1000)
+    assert [(float(p), float(q)) for p, q in depth["bids"]] == bids
+    assert [(float(p), float(q)) for p, q in depth["asks"]] == asks
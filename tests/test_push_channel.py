@@ -0,0 +1,109 @@
+import time
+
+import pytest
+
+pytest.importorskip("flask_socketio")
+
+from flask import Flask  # noqa: E402
+from flask_socketio import SocketIO  # noqa: E402
+
+from backend.data.market_hub import MarketDataHub  # noqa: E402
+from backend.data.push_channel import MarketPushChannel  # noqa: E402
+
+MINUTE = 60_000
+START = 1_700_000_000_000 - 1_700_000_000_000 % MINUTE
+
+
+class CountingHub(MarketDataHub):
+    """Candles and trades are pushed in by the test; any REST call is counted."""
+
+    rest_calls = 0
+
+    def _download_klines(self, stream, limit):
+        self.rest_calls += 1
+        return []
+
+    def _download_tickers(self, symbols):
+        self.rest_calls += 1
+        return []
+
+
+def kline(hub, i, close):
+    hub.apply_kline("BTCUSDT", "1m", START + i * MINUTE, [100.0, 101.0, 99.0, close, 5.0])
+
+
+def events(received, name):
+    return [e["args"][0] for e in received if e["name"] == name]
+
+
+@pytest.fixture
+def setup():
+    app = Flask(__name__)
+    socketio = SocketIO(app, async_mode="threading")
+    hub = CountingHub(use_external=True, ticker_ttl=60)
+    for i in range(10):
+        kline(hub, i, 100.0 + i)
+    hub.apply_trade("BTCUSDT", "109.0")
+    channel = MarketPushChannel(socketio, hub, chart_limit=5, balance=lambda: {"USDT": {"free": 500.0}}).register()
+    return app, socketio, hub, channel
+
+
+def test_snapshot_then_coalesced_deltas_fan_out(setup):
+    app, socketio, hub, channel = setup
+    clients = [socketio.test_client(app, namespace="/market") for _ in range(20)]
+    for client in clients:
+        client.emit("subscribe", {"symbol": "btcusdt"}, namespace="/market")
+    assert channel.subscribers() == {"BTCUSDT": 20}
+
+    snapshots = [events(client.get_received("/market"), "chart_snapshot") for client in clients]
+    assert all(len(s) == 1 for s in snapshots)
+    snapshot = snapshots[0][0]
+    assert [c[0] for c in snapshot["candles"]] == [START + i * MINUTE for i in range(5, 10)]
+
+    channel.publish()  # nothing changed candle-wise since the snapshots; price and balance are new
+    for client in clients:
+        assert sorted(e["name"] for e in client.get_received("/market")) == ["balance", "price"]
+
+    kline(hub, 9, 120.0)   # open candle revised twice and a new one opened between publishes
+    kline(hub, 9, 121.0)
+    kline(hub, 10, 122.0)
+    hub.apply_trade("BTCUSDT", "122.0")
+    channel.publish()
+    for client in clients:
+        received = client.get_received("/market")
+        deltas = events(received, "chart_delta")
+        assert len(deltas) == 1
+        assert [(c[0], c[4]) for c in deltas[0]["candles"]] == [(START + 9 * MINUTE, 121.0),
+                                                                (START + 10 * MINUTE, 122.0)]
+        assert events(received, "price") == [{"symbol": "BTCUSDT", "price": "122.0"}]
+
+    channel.publish()  # idle: nothing is sent
+    assert clients[0].get_received("/market") == []
+    assert hub.rest_calls == 0
+    assert channel.events["chart_delta"] == 1  # one emit per room, however many clients
+
+
+def test_disconnect_unsubscribes(setup):
+    app, socketio, hub, channel = setup
+    client = socketio.test_client(app, namespace="/market")
+    client.emit("subscribe", {}, namespace="/market")
+    assert channel.subscribers() == {"BTCUSDT": 1}
+    client.disconnect(namespace="/market")
+    assert channel.subscribers() == {} and channel._topics == {}
+    channel.publish()
+    assert channel.events["price"] == 0
+
+
+def test_publisher_starts_on_first_subscription(setup):
+    app, socketio, hub, _ = setup
+    channel = MarketPushChannel(socketio, hub, chart_limit=5, period=0.05, autostart=True)
+    assert not channel._running  # nothing runs at import time, before a server forks its workers
+    channel.subscribe("sid-1", "BTCUSDT")
+    channel.subscribe("sid-2", "BTCUSDT")
+    try:
+        deadline = time.monotonic() + 2
+        while channel.publishes < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert channel.publishes >= 2
+    finally:
+        channel.stop()
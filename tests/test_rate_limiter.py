@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.exchange.rate_limiter import RateLimitTimeout, WeightedRateLimiter, throttle_delay, tickers_weight
+
+
+def drain(limiter):
+    limiter.acquire(weight=limiter.capacity)
+
+
+def test_weights_come_from_endpoint_table():
+    limiter = WeightedRateLimiter(600)
+    limiter.acquire('account')
+    limiter.acquire('klines')
+    metrics = limiter.metrics()
+    assert metrics['priorities']['account']['weight'] == 20
+    assert metrics['priorities']['market_data']['weight'] == 2
+    assert metrics['available_weight'] == pytest.approx(600 - 22, abs=1)
+    with pytest.raises(ValueError):
+        limiter.acquire('no_such_endpoint')
+
+
+def test_multi_symbol_tickers_are_charged_by_symbol_count():
+    assert [tickers_weight(n) for n in (2, 20, 21, 100, 200)] == [4, 4, 40, 40, 80]
+    limiter = WeightedRateLimiter(600)
+    assert limiter.call('tickers', lambda symbols: symbols, weight=tickers_weight(200), symbols='[...]') == '[...]'
+    assert limiter.metrics()['priorities']['market_data']['weight'] == 80
+
+
+def test_orders_jump_ahead_of_queued_market_data():
+    limiter = WeightedRateLimiter(600)  # refills 10 weight per second
+    drain(limiter)
+    served = []
+
+    def request(name, endpoint):
+        limiter.acquire(endpoint)
+        served.append(name)
+
+    pollers = [threading.Thread(target=request, args=(f"klines{i}", 'klines')) for i in range(3)]
+    for t in pollers:
+        t.start()
+    deadline = time.time() + 1
+    while limiter.metrics()['queue_depth'] < 3 and time.time() < deadline:
+        time.sleep(0.005)
+    assert limiter.metrics()['queue_depth_by_priority']['market_data'] == 3
+
+    order = threading.Thread(target=request, args=("order", 'create_order'))
+    order.start()
+    for t in pollers + [order]:
+        t.join(timeout=5)
+
+    assert served[0] == "order"
+    metrics = limiter.metrics()
+    assert metrics['queue_depth'] == 0
+    assert metrics['priorities']['market_data']['max_wait'] > 0.1
+
+
+def test_timeout_leaves_queue_clean():
+    limiter = WeightedRateLimiter(60)
+    drain(limiter)
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire(weight=30, timeout=0.05)
+    assert limiter.metrics()['queue_depth'] == 0
+
+
+def test_penalize_and_used_weight_header():
+    limiter = WeightedRateLimiter(6000)
+    limiter.sync_used_weight(5990)
+    assert limiter.metrics()['available_weight'] < 20
+
+    limiter.penalize(0.2)
+    began = time.monotonic()
+    limiter.acquire('create_order')
+    assert time.monotonic() - began >= 0.15
+    assert limiter.metrics()['throttled'] == 1
+
+    assert throttle_delay(429, {'Retry-After': '7'}) == 7.0
+    assert throttle_delay(418) == 60.0
+    assert throttle_delay(400) is None
+
+
+def test_call_pauses_on_throttled_response():
+    class Throttled(Exception):
+        status_code = 429
+
+        class response:
+            headers = {'Retry-After': '3'}
+
+    limiter = WeightedRateLimiter(6000)
+
+    def fail():
+        raise Throttled()
+
+    with pytest.raises(Throttled):
+        limiter.call('klines', fail)
+    assert limiter.metrics()['blocked_for'] > 2
+
+
+def test_async_acquire_respects_priority():
+    limiter = WeightedRateLimiter(600)
+    drain(limiter)
+    served = []
+
+    async def request(name, endpoint):
+        await limiter.acquire_async(endpoint)
+        served.append(name)
+
+    async def scenario():
+        pollers = [asyncio.create_task(request(f"ticker{i}", 'ticker')) for i in range(3)]
+        await asyncio.sleep(0.01)
+        await asyncio.gather(request("cancel", 'cancel_order'), *pollers)
+
+    asyncio.run(scenario())
+    assert served[0] == "cancel"
+    assert limiter.metrics()['queue_depth_by_priority']['market_data'] == 0
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+tf = pytest.importorskip("tensorflow")
+
+from backend.ai_models.replay import DQNReplay, ReplayBuffer  # noqa: E402
+
+
+def make_model(state_dim=6):
+    model = tf.keras.Sequential([tf.keras.Input(shape=(state_dim,)), tf.keras.layers.Dense(1)])
+    model.compile(optimizer='sgd', loss='mse')
+    return model
+
+
+def make_transitions(n=64, state_dim=6, seed=0):
+    rng = np.random.default_rng(seed)
+    return [(rng.normal(size=state_dim), 0, float(rng.normal()), rng.normal(size=state_dim), i % 5 == 0)
+            for i in range(n)]
+
+
+def make_memory(n=64, state_dim=6, seed=0):
+    buffer = ReplayBuffer(capacity=100, state_dim=state_dim)
+    for transition in make_transitions(n, state_dim, seed):
+        buffer.add(*transition)
+    return buffer
+
+
+def record_batches(model):
+    calls = []
+    train_on_batch = model.train_on_batch
+
+    def spy(x, y, sample_weight=None):
+        calls.append((x.copy(), y.copy(), sample_weight))
+        return train_on_batch(x, y, sample_weight=sample_weight)
+
+    model.train_on_batch = spy
+    return calls
+
+
+def test_batched_targets_match_per_sample_bellman_update():
+    model = make_model()
+    memory = make_memory()
+    engine = DQNReplay(model, state_dim=6, batch_size=16, gamma=0.9, seed=1)
+    calls = record_batches(model)
+    weights_before = model.get_weights()
+
+    assert engine.step(memory) is not None
+    states, targets, sample_weight = calls[0]
+    assert sample_weight is None
+
+    model.set_weights(weights_before)
+    by_state = {tuple(np.float32(s)): (r, ns, d) for s, _, r, ns, d in make_transitions()}
+    for state, target in zip(states, targets[:, 0]):
+        reward, next_state, done = by_state[tuple(state)]
+        expected = reward if done else reward + 0.9 * model.predict(next_state[None], verbose=0)[0, 0]
+        assert target == pytest.approx(expected, rel=1e-4, abs=1e-4)
+
+
+def test_small_memory_is_skipped():
+    engine = DQNReplay(make_model(), state_dim=6, batch_size=32)
+    assert engine.step(make_memory(n=10)) is None
+
+
+def test_target_network_syncs_on_interval():
+    model = make_model()
+    engine = DQNReplay(model, state_dim=6, batch_size=8, target_update_interval=3, seed=0)
+    memory = make_memory()
+    engine.step(memory)
+    assert not np.allclose(engine.target_model.get_weights()[0], model.get_weights()[0])
+    engine.step(memory)
+    engine.step(memory)
+    np.testing.assert_allclose(engine.target_model.get_weights()[0], model.get_weights()[0])
+
+
+def test_replay_buffer_memory_with_priorities():
+    model = make_model()
+    buffer = make_memory(n=40)
+    engine = DQNReplay(model, state_dim=6, batch_size=8, prioritized=True, seed=0)
+
+    calls = record_batches(model)
+    assert engine.step(buffer) is not None
+    weights = calls[0][2]
+    assert calls[0][0].shape == (8, 6)
+    assert weights.shape == (8,) and weights.max() == pytest.approx(1.0)
+    assert (buffer.priorities[buffer.valid] != 1.0).any()
+
+
+def test_strided_training_memory_keeps_memory_size_transitions():
+    from backend.ai_models.reinforcement_learning import ReinforcementLearning
+
+    agent = ReinforcementLearning(None, None, time_steps=3, n_features=2, memory_size=100)
+    # like train_model's strided walk, no transition's next_state is the following transition's state
+    for transition in make_transitions(300, state_dim=6):
+        agent.remember(*transition)
+    assert len(agent.memory) == 100
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from backend.ai_models.replay import ReplayBuffer
+
+
+def trajectory(n, state_dim=4, seed=0):
+    states = np.random.default_rng(seed).normal(size=(n + 1, state_dim))
+    return [(states[i], i % 3, float(i), states[i + 1], False) for i in range(n)]
+
+
+def test_chained_transitions_share_state_rows():
+    buffer = ReplayBuffer(capacity=16, state_dim=4)
+    transitions = trajectory(10)
+    for t in transitions:
+        buffer.add(*t)
+
+    assert len(buffer) == 10
+    assert buffer._filled == 11  # one row per transition plus the last next state
+    for i, (state, action, reward, next_state, done) in enumerate(transitions):
+        s, a, r, ns, d = buffer.transition(i)
+        np.testing.assert_allclose(s, state, rtol=1e-6)
+        np.testing.assert_allclose(ns, next_state, rtol=1e-6)
+        assert (a, r, d) == (action, reward, done)
+
+
+def test_unchained_transitions_keep_their_next_state():
+    rng = np.random.default_rng(1)
+    buffer = ReplayBuffer(capacity=32, state_dim=3)
+    transitions = [(rng.normal(size=3), 0, 1.0, rng.normal(size=3), i == 4) for i in range(5)]
+    for t in transitions:
+        buffer.add(*t)
+
+    assert len(buffer) == 5
+    rows = np.flatnonzero(buffer.valid)
+    for row, (state, _, _, next_state, done) in zip(rows, transitions):
+        s, _, _, ns, d = buffer.transition(row)
+        np.testing.assert_allclose(s, state, rtol=1e-6)
+        np.testing.assert_allclose(ns, next_state, rtol=1e-6)
+        assert d == done
+
+
+def test_wraparound_evicts_oldest_and_keeps_next_states_consistent():
+    buffer = ReplayBuffer(capacity=8, state_dim=2)
+    transitions = trajectory(20, state_dim=2)
+    for t in transitions:
+        buffer.add(*t)
+
+    assert len(buffer) == 7  # one row always holds the newest next state
+    rewards = sorted(float(buffer.rewards[row]) for row in np.flatnonzero(buffer.valid))
+    assert rewards == [float(i) for i in range(13, 20)]
+    for row in np.flatnonzero(buffer.valid):
+        _, _, reward, next_state, _ = buffer.transition(row)
+        np.testing.assert_allclose(next_state, transitions[int(reward)][3], rtol=1e-6)
+
+
+def test_sample_only_returns_live_transitions():
+    buffer = ReplayBuffer(capacity=64, state_dim=2)
+    rng = np.random.default_rng(0)
+    for i in range(20):
+        buffer.add(rng.normal(size=2), 0, 0.0, rng.normal(size=2), False)  # every other row is a next state
+
+    indices = buffer.sample(500, rng)
+    assert indices.shape == (500,)
+    assert buffer.valid[indices].all()
+
+    states = np.empty((500, 2), dtype=np.float32)
+    next_states = np.empty_like(states)
+    rewards = np.empty(500, dtype=np.float32)
+    not_done = np.empty(500, dtype=np.float32)
+    buffer.gather(indices, states, next_states, rewards, not_done)
+    np.testing.assert_array_equal(next_states, buffer.states[(indices + 1) % 64])
+
+
+def test_prioritized_sampling_favours_high_priority_rows():
+    buffer = ReplayBuffer(capacity=16, state_dim=2)
+    for t in trajectory(10, state_dim=2):
+        buffer.add(*t)
+    buffer.update_priorities(np.array([3]), np.array([1000.0]))
+
+    indices, weights = buffer.sample_prioritized(200, np.random.default_rng(0), alpha=1.0, beta=1.0)
+    assert buffer.valid[indices].all()
+    assert (indices == 3).mean() > 0.9
+    assert weights.max() == pytest.approx(1.0)
+    assert buffer.max_priority == 1000.0
+
+
+def test_memory_mapped_storage(tmp_path):
+    buffer = ReplayBuffer(capacity=100, state_dim=3, path=str(tmp_path))
+    for t in trajectory(5, state_dim=3):
+        buffer.add(*t)
+    buffer.flush()
+
+    on_disk = np.load(tmp_path / 'states.npy', mmap_mode='r')
+    assert on_disk.shape == (100, 3)
+    np.testing.assert_array_equal(on_disk[:6], buffer.states[:6])
@@ -0,0 +1,87 @@
+import threading
+import time
+
+import pytest
+
+from backend.core.response_cache import FakeRedis, MemoryBackend, RedisBackend, ResponseCache
+
+
+class SlowUpstream:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        time.sleep(self.delay)
+        return {"price": "100.0", "call": call}
+
+
+def burst(caches, key, ttl, compute, n=40):
+    results, barrier = [], threading.Barrier(n)
+
+    def worker(cache):
+        barrier.wait()
+        results.append(cache.get_or_compute(key, ttl, compute))
+
+    threads = [threading.Thread(target=worker, args=(caches[i % len(caches)],)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_concurrent_misses_share_one_upstream_call_and_expire():
+    cache, upstream = ResponseCache(MemoryBackend()), SlowUpstream()
+    results = burst([cache], "market_data:BTCUSDT", 0.2, upstream)
+    assert upstream.calls == 1 and all(r == {"price": "100.0", "call": 1} for r in results)
+    assert cache.get_or_compute("market_data:BTCUSDT", 0.2, upstream)["call"] == 1
+    time.sleep(0.25)
+    assert cache.get_or_compute("market_data:BTCUSDT", 0.2, upstream)["call"] == 2
+
+    metrics = cache.metrics()
+    assert metrics["requests"] == 42 and metrics["upstream_calls"] == 2
+    assert metrics["upstream_calls_saved"] == 40
+    assert metrics["hits"] + metrics["coalesced"] == 40
+
+
+def test_errors_reach_waiters_and_are_not_cached():
+    cache = ResponseCache()
+
+    def failing():
+        time.sleep(0.05)
+        raise RuntimeError("exchange down")
+
+    errors = []
+    threads = [threading.Thread(target=lambda: errors.append(pytest.raises(
+        RuntimeError, cache.get_or_compute, "balance", 5.0, failing))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(errors) == 5 and cache.metrics()["upstream_calls"] < 5
+    assert cache.get_or_compute("balance", 5.0, lambda: {"USDT": 1}) == {"USDT": 1}
+
+
+def test_redis_backend_coalesces_across_processes():
+    redis = FakeRedis()
+    workers = [ResponseCache(RedisBackend(redis, poll_interval=0.005)) for _ in range(4)]  # one per process
+    upstream = SlowUpstream()
+    results = burst(workers, "ohlcv:BTCUSDT", 5.0, upstream)
+    assert upstream.calls == 1 and {r["call"] for r in results} == {1}
+    assert ResponseCache(RedisBackend(redis)).get_or_compute("ohlcv:BTCUSDT", 5.0, upstream)["call"] == 1
+    assert redis.get("simtwo:cache:lock:ohlcv:BTCUSDT") is None
+
+
+def test_backend_outage_falls_back_to_upstream():
+    class DownRedis(FakeRedis):
+        def get(self, name):
+            raise ConnectionError("redis unavailable")
+
+    cache = ResponseCache(RedisBackend(DownRedis()))
+    assert cache.get_or_compute("health", 10.0, lambda: {"status": "healthy"}) == {"status": "healthy"}
+    assert cache.metrics()["backend_errors"] >= 1
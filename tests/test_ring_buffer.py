@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+from backend.data.ring_buffer import OHLCVRingBuffer
+
+def make_klines(start, n, step=60_000):
+    first = start // step
+    return [[(first + i) * step, str(100 + first + i), str(101 + first + i), str(99 + first + i),
+             str(100.5 + first + i), str(10 + first + i), 0] for i in range(n)]
+
+def test_compaction_keeps_ordered_contiguous_view():
+    buf = OHLCVRingBuffer(5, slack=2)
+    for i in range(3):
+        buf.append_klines(make_klines(i * 4 * 60_000, 4))
+    timestamps, values = buf.view()
+    assert len(buf) == 5
+    np.testing.assert_array_equal(timestamps, np.arange(7, 12) * 60_000)
+    np.testing.assert_array_equal(buf.column('close'), np.arange(7, 12) + 100.5)
+    assert values.flags['C_CONTIGUOUS'] and np.shares_memory(values, buf._values)
+
+def test_overlap_is_deduplicated_and_open_candle_revised():
+    buf = OHLCVRingBuffer(10)
+    buf.append_klines(make_klines(0, 4))
+    revised = make_klines(2 * 60_000, 4)
+    revised[1][4] = "999"  # candle 3 was still open and has since closed higher
+    result = buf.append_klines(revised)
+    assert (result.first, result.revised) == (1, True)
+    np.testing.assert_array_equal(buf.column('timestamp'), np.arange(6) * 60_000)
+    assert buf.column('close')[3] == 999.0
+
+def test_frame_round_trip_and_bulk_overflow():
+    ts = pd.date_range("2024-01-01", periods=50, freq="min")
+    df = pd.DataFrame({'timestamp': ts, 'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': np.arange(50.0), 'volume': 3.0})
+    buf = OHLCVRingBuffer(20)
+    buf.append_frame(df)
+    out = buf.to_frame()
+    assert list(out.columns) == ['Timestamp', 'Open', 'High', 'Low', 'Close', 'Volume']
+    assert out['Timestamp'].iloc[0] == ts[30] and out['Close'].iloc[-1] == 49.0
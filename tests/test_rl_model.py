@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from backend.ai_models.rl_model import ACTION_POSITIONS, HOLD_ACTION, RLTradingModel, StateDiscretizer, ohlcv_features
+
+
+def momentum_candles(n=20_000, seed=0):
+    """Closes whose returns are autocorrelated, so the last return predicts the next."""
+    rng = np.random.default_rng(seed)
+    returns = np.zeros(n)
+    for t in range(1, n):
+        returns[t] = 0.6 * returns[t - 1] + rng.normal(0, 0.002)
+    close = 100 * np.exp(np.cumsum(returns))
+    volume = rng.uniform(1, 10, n)
+    return np.column_stack([close, close * 1.001, close * 0.999, close, volume])
+
+
+def test_q_table_grows_in_place_and_keeps_values():
+    model = RLTradingModel(state_size=4, action_size=3, exploration_rate=0.0)
+    model.learn(1, 2, 1.0, 2)
+    capacities = set()
+    for state in range(4, 200):
+        model.choose_action(state)
+        capacities.add(len(model._q))
+    assert model.q_table.shape == (200, 3)
+    assert model.q_table[1, 2] == pytest.approx(0.1)
+    assert len(capacities) <= 6  # doubling, not one reallocation per state
+
+
+def test_learn_batch_matches_sequential_learn_for_distinct_pairs():
+    rng = np.random.default_rng(1)
+    states, actions = np.arange(50), rng.integers(0, 3, 50)
+    next_states, rewards = np.arange(50, 100), rng.normal(size=50)
+    batched = RLTradingModel(100, 3, exploration_rate=0.5)
+    sequential = RLTradingModel(100, 3, exploration_rate=0.5)
+    batched.q_table = sequential.q_table = rng.normal(size=(100, 3))
+
+    batched.learn_batch(states, actions, rewards, next_states)
+    for s, a, r, ns in zip(states, actions, rewards, next_states):
+        sequential.learn(int(s), int(a), float(r), int(ns))
+    np.testing.assert_allclose(batched.q_table, sequential.q_table)
+    assert batched.exploration_rate == pytest.approx(0.5 * batched.exploration_decay)  # one decay step per batch
+
+
+def test_learn_batch_averages_repeated_pairs():
+    model = RLTradingModel(2, 3)
+    model.learn_batch([0, 0, 0], [1, 1, 1], [1.0, 2.0, 3.0], [1, 1, 1], dones=[True, True, True])
+    assert model.q_table[0, 1] == pytest.approx(0.1 * 2.0)
+
+
+def test_discretizer_bins_are_balanced():
+    features = np.random.default_rng(2).normal(size=(10_000, 2))
+    discretizer = StateDiscretizer(n_bins=4).fit(features)
+    states = discretizer.transform(features)
+    assert discretizer.n_states == 16 and states.min() == 0 and states.max() == 15
+    counts = np.bincount(states % 4, minlength=4)
+    assert counts.min() > 0.24 * len(states)
+    assert discretizer.transform([[np.nan, 0.0]])[0] == 0
+
+
+def test_train_on_candles_learns_momentum():
+    candles = momentum_candles()
+    model = RLTradingModel(state_size=1, action_size=3, exploration_decay=0.9)
+    errors = model.train_on_candles(candles, epochs=5, seed=0)
+    assert len(errors) == 5 and model.q_table.shape[0] == model.discretizer.n_states
+    assert model.exploration_rate == pytest.approx(0.9 ** (5 * 5))  # five 4096-candle batches per epoch
+
+    positions = ACTION_POSITIONS[model.predict_candles(candles)]
+    close = candles[:, 3]
+    warmed_up = ~np.isnan(ohlcv_features(candles)[:-1]).any(axis=1)
+    assert (positions[:-1] * (close[1:] / close[:-1] - 1.0))[warmed_up].sum() > 0
+
+
+def test_greedy_ties_go_to_hold():
+    model = RLTradingModel(state_size=3, action_size=3, exploration_rate=0.0)
+    model.q_table = [[0.0, 0.0, 0.0], [0.2, 0.2, -0.1], [0.1, 0.0, 0.1]]
+    actions = model.choose_actions([0, 1, 2, 7], explore=False)  # 7 is a state never seen
+    np.testing.assert_array_equal(actions, [HOLD_ACTION, HOLD_ACTION, 0, HOLD_ACTION])
+    assert model.choose_action(0) == HOLD_ACTION
@@ -0,0 +1,91 @@
+import time
+
+import pytest
+
+pytest.importorskip("websockets")
+
+from backend.data.data_fetcher import DataFetcher  # noqa: E402
+from backend.data.market_hub import MarketDataHub  # noqa: E402
+from backend.data.stream_ingest import StreamIngestor, stream_names  # noqa: E402
+from backend.exchange.stub_server import StubStreamServer  # noqa: E402
+
+MINUTE = 60_000
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.01)
+
+
+class NoTickerHub(MarketDataHub):
+    def _download_tickers(self, symbols):
+        raise AssertionError(f"REST ticker request for {symbols}")
+
+    def fetch_depth_snapshot(self, symbol, limit=1000):
+        self.snapshots = getattr(self, 'snapshots', 0) + 1
+        return {"lastUpdateId": 40, "bids": [["129.8", "3.0"]], "asks": [["130.2", "1.0"]]}
+
+
+@pytest.fixture
+def stub():
+    with StubStreamServer() as server:
+        yield server
+
+
+def test_stream_names_and_connection_split():
+    assert stream_names(["BTCUSDT"], intervals=("1m", "1h")) == [
+        "btcusdt@kline_1m", "btcusdt@kline_1h", "btcusdt@trade", "btcusdt@depth@100ms"]
+    hub = MarketDataHub(use_external=True)
+    ingestor = StreamIngestor(hub, [f"SYM{i}USDT" for i in range(10)], max_streams_per_connection=8)
+    assert [len(c) for c in ingestor.connection_streams] == [8, 8, 8, 6]
+
+
+def test_pushed_klines_trades_and_depth_reach_the_hub(stub):
+    hub = NoTickerHub(use_external=True, ticker_ttl=60)
+    with StreamIngestor(hub, ["BTCUSDT", "ETHUSDT"], url=stub.url, resync=False) as ingestor:
+        stub.wait_for_connections()
+        start = 1_700_000_000_000 - 1_700_000_000_000 % MINUTE
+        for i in range(30):
+            stub.publish_kline("BTCUSDT", "1m", start + i * MINUTE, 100, 102, 99, 100 + i, 5, closed=True)
+        stub.publish_kline("BTCUSDT", "1m", start + 29 * MINUTE, 100, 140, 99, 135, 7)  # open candle revised
+        stub.publish_trade("ETHUSDT", 2000.5)
+        stub.publish_depth_update("BTCUSDT", 39, 41, bids=[(129.9, 1.0)])  # buffered, triggers the snapshot
+        wait_until(lambda: hub.local_order_book("BTCUSDT").synced)
+        stub.publish_depth_update("BTCUSDT", 42, 42, asks=[(130.1, 2.0)])
+        wait_until(lambda: ingestor.messages['depth'] == 2 and ingestor.messages['trade'] == 1)
+
+    stream = hub.stream("BTCUSDT", "1m")
+    timestamps, values = stream.buffer.view()
+    assert len(timestamps) == 30 and values[-1, 3] == 135.0
+    assert stream.indicators.close == 135.0
+    assert hub.fetch_ticker("ETHUSDT") == {"symbol": "ETHUSDT", "price": "2000.5"}  # no REST call
+
+    fetcher = DataFetcher("key", "secret", trade_symbol="BTCUSDT", hub=hub)
+    book = fetcher.fetch_order_book()
+    assert book["lastUpdateId"] == 42 and hub.snapshots == 1
+    assert book["bids"][0] == ["129.90000000", "1.00000000"] and book["asks"][0] == ["130.10000000", "2.00000000"]
+
+
+def test_reconnects_with_backoff_after_drop(stub):
+    hub = MarketDataHub(use_external=True)
+    with StreamIngestor(hub, ["BTCUSDT"], url=stub.url, resync=False, trades=True, depth=False,
+                        backoff_initial=0.05) as ingestor:
+        stub.wait_for_connections()
+        stub.drop_connections()
+        wait_until(lambda: ingestor.connects == 2 and stub.connections == 1)
+        stub.publish_trade("BTCUSDT", 31000)
+        wait_until(lambda: ingestor.messages['trade'] == 1)
+        assert ingestor.metrics()['reconnects'] == 1
+    assert stub.paths[-1] == "/stream?streams=btcusdt@kline_1m/btcusdt@trade"
+
+
+def test_malformed_messages_are_counted_not_fatal():
+    hub = MarketDataHub(use_external=True)
+    ingestor = StreamIngestor(hub, ["BTCUSDT"])
+    ingestor.handle_message('{"stream": "btcusdt@aggTrade", "data": {"e": "aggTrade"}}')
+    with pytest.raises(KeyError):
+        ingestor.handle_message('{"stream": "btcusdt@trade", "data": {"e": "trade"}}')
+    assert ingestor.messages == {'kline': 0, 'trade': 0, 'depth': 0}
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from backend.backtesting.engine import Backtester
+from backend.backtesting.sweep import (ParameterSweep, SharedCandles, evaluate_params, grid, leaderboard,
+                                       random_samples, walk_forward_splits)
+from backend.core.status_manager import StatusManager
+
+MINUTE = 60_000
+
+
+def history(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.arange(n, dtype=np.int64) * MINUTE, 30000 * np.exp(np.cumsum(rng.normal(0, 0.001, n)))
+
+
+SPACE = {'short_window': [5, 20, 60], 'long_window': [40, 120], 'stop_loss': [1, 5]}
+
+
+def test_grid_skips_inverted_windows():
+    params = grid(SPACE)
+    assert len(params) == 10  # 12 combinations minus short=60 with long=40
+    assert all(p['short_window'] < p['long_window'] for p in params)
+
+
+def test_random_samples_are_distinct_and_reproducible():
+    samples = random_samples(SPACE, 6, seed=1)
+    assert samples == random_samples(SPACE, 6, seed=1)
+    assert len({tuple(sorted(p.items())) for p in samples}) == 6
+
+
+def test_walk_forward_splits_are_ordered_and_disjoint():
+    splits = walk_forward_splits(1000, n_splits=4, train_fraction=0.75)
+    assert splits[0] == ((0, 187), (187, 250))
+    for (train_start, train_end), (test_start, test_end) in splits:
+        assert train_start < train_end == test_start < test_end
+    assert walk_forward_splits(1000, 4, anchored=True)[-1][0][0] == 0
+
+
+def test_stop_loss_exits_adverse_position():
+    timestamps = np.arange(6, dtype=np.int64) * MINUTE
+    close = np.array([100.0, 100.0, 97.0, 94.0, 96.0, 99.0])
+    backtester = Backtester(fee_rate=0.0, status_manager=StatusManager(0.0, 0), stop_loss=5)
+    result = backtester.run(timestamps, close, [1, 1, 1, 1, 1, 1])
+    np.testing.assert_array_equal(result.positions, [1, 1, 1, 0, 0, 0])
+
+
+def test_pool_results_match_in_process_and_are_cached(tmp_path):
+    timestamps, close = history()
+    params = grid(SPACE)
+    cache_path = str(tmp_path / "sweep.json")
+
+    pooled = ParameterSweep(timestamps, close, max_workers=2, cache_path=cache_path)
+    results = pooled.evaluate(params)
+    serial = ParameterSweep(timestamps, close, max_workers=1).evaluate(params)
+    assert results == serial
+    assert results[0]['metrics'] == evaluate_params(timestamps, close, params[0])
+
+    pooled.evaluate(params)
+    assert pooled.evaluations == len(params)
+    reloaded = ParameterSweep(timestamps, close, max_workers=1, cache_path=cache_path)
+    assert reloaded.evaluate(params) == results and reloaded.evaluations == 0
+
+
+def test_walk_forward_reports_out_of_sample_metrics():
+    timestamps, close = history()
+    report = ParameterSweep(timestamps, close, max_workers=1).walk_forward(grid(SPACE), n_splits=2)
+    assert len(report) == 2
+    for split in report:
+        assert split['params'] in grid(SPACE)
+        assert split['test_metrics']['Candles'] == split['test'][1] - split['test'][0]
+
+
+def test_leaderboard_orders_by_metric():
+    results = [{'params': {'x': i}, 'metrics': {'Sharpe Ratio': s, 'P&L': 0.0}} for i, s in enumerate([0.5, 2.0, -1])]
+    assert [r['params']['x'] for r in leaderboard(results, top=2)] == [1, 0]
+
+
+def test_shared_candles_round_trip():
+    timestamps, close = history(100)
+    with SharedCandles(timestamps, close) as shared:
+        length, ts_name, close_name = shared.spec
+        assert length == 100
+        from multiprocessing import shared_memory
+        block = shared_memory.SharedMemory(name=close_name)
+        np.testing.assert_array_equal(np.ndarray((100,), np.float64, buffer=block.buf), close)
+        block.close()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=close_name)
@@ -0,0 +1,85 @@
+import threading
+import time
+
+from backend.trading_logic.symbol_filters import SymbolFilterRegistry, get_symbol_filter_registry
+
+SYMBOLS = [
+    {'symbol': 'BTCUSDT', 'minQty': '0.001', 'stepSize': '0.001', 'minPrice': '0.01', 'maxPrice': '1000000', 'tickSize': '0.01'},
+    {'symbol': 'ETHUSDT', 'minQty': '0.1', 'stepSize': '0.1', 'minPrice': '0.1', 'maxPrice': '100000', 'tickSize': '0.1'},
+]
+
+def make_loader(symbols, delay=0.0):
+    calls = []
+    def loader():
+        calls.append(1)
+        time.sleep(delay)
+        return loader.symbols
+    loader.symbols = symbols
+    loader.calls = calls
+    return loader
+
+def test_lookups_are_cached_until_ttl():
+    loader = make_loader(SYMBOLS)
+    registry = SymbolFilterRegistry(loader, ttl=60)
+    for _ in range(100):
+        assert registry.get('BTCUSDT').symbol == 'BTCUSDT'
+    assert len(loader.calls) == 1
+
+    registry._loaded_at -= 61
+    registry.get('ETHUSDT')
+    assert len(loader.calls) == 2
+
+def test_concurrent_stale_lookups_share_one_reload():
+    loader = make_loader(SYMBOLS, delay=0.05)
+    registry = SymbolFilterRegistry(loader, ttl=60)
+    threads = [threading.Thread(target=registry.get, args=('BTCUSDT',)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(loader.calls) == 1
+
+def test_exact_decimal_step_and_tick_checks():
+    filters = SymbolFilterRegistry(make_loader(SYMBOLS)).get('ETHUSDT')
+    # 0.3 % 0.1 is not 0 in float arithmetic, but 0.3 is on the 0.1 grid
+    assert filters.quantity_ok(0.3)
+    assert filters.quantity_ok('1.7')
+    assert not filters.quantity_ok(0.35)
+    assert not filters.quantity_ok(0.05)
+
+    assert filters.price_ok(2500.3)
+    assert not filters.price_ok(2500.35)
+    assert not filters.price_ok(200000)
+
+def test_unknown_symbol_retry_is_throttled():
+    loader = make_loader(SYMBOLS)
+    registry = SymbolFilterRegistry(loader, unknown_retry=30)
+    assert registry.get('NEWUSDT') is None
+    assert registry.get('NEWUSDT') is None
+    assert len(loader.calls) == 1
+
+    loader.symbols = SYMBOLS + [dict(SYMBOLS[0], symbol='NEWUSDT')]
+    registry._loaded_at -= 31
+    assert registry.get('NEWUSDT') is not None
+    assert len(loader.calls) == 2
+
+def test_background_refresh_stops():
+    loader = make_loader(SYMBOLS)
+    registry = SymbolFilterRegistry(loader, ttl=60)
+    registry.start_background_refresh(interval=0.01)
+    try:
+        deadline = time.time() + 2
+        while len(loader.calls) < 3 and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        registry.stop_background_refresh()
+    assert len(loader.calls) >= 3
+    assert registry.is_fresh
+    assert not any(t.name == "symbol-filter-refresh" and t.is_alive() for t in threading.enumerate())
+
+def test_executors_for_one_account_share_a_registry():
+    first = get_symbol_filter_registry('test-account', make_loader(SYMBOLS))
+    try:
+        assert get_symbol_filter_registry('test-account', make_loader([])) is first
+    finally:
+        first.stop_background_refresh()
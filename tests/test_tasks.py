@@ -0,0 +1,106 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("celery")
+
+from backend import tasks  # noqa: E402
+from backend.celery_app import celery_app  # noqa: E402
+from backend.data.market_hub import MarketDataHub  # noqa: E402
+
+HOUR = 3_600_000
+START = 1_700_000_000_000 - 1_700_000_000_000 % HOUR
+
+
+class RecordingExecutor:
+    def __init__(self):
+        self.orders = []
+
+    def execute_trade(self, symbol, side, quantity):
+        self.orders.append((symbol, side, quantity))
+        return {"symbol": symbol, "side": side}
+
+
+def trend_signal(market_data):
+    close = market_data['Close']
+    return 'BUY' if close.iloc[-1] > close.iloc[0] else 'SELL' if close.iloc[-1] < close.iloc[0] else 'HOLD'
+
+
+class ListedSymbolsClient:
+    """Exchange client with no candles for any symbol; the hub's buffers are fed by apply_kline."""
+
+    def get_klines(self, **params):
+        return []
+
+
+@pytest.fixture
+def eager():
+    celery_app.conf.update(task_always_eager=True, task_eager_propagates=True)
+    hub = MarketDataHub(api_key="key", api_secret="secret", ohlcv_ttl=3600)
+    hub._client = ListedSymbolsClient()
+    for symbol, step in (("BTCUSDT", 1.0), ("ETHUSDT", -1.0), ("BNBUSDT", 0.0)):
+        for i in range(100):
+            hub.apply_kline(symbol, "1h", START + i * HOUR, [100.0, 101.0, 99.0, 100.0 + step * i, 5.0])
+    executor = RecordingExecutor()
+    builds = []
+
+    def signal(market_data):
+        builds.append(len(market_data))
+        return trend_signal(market_data)
+
+    tasks.init_worker_resources(tasks.WorkerResources(hub, executor, signal))
+    yield executor, builds
+    tasks._resources = None
+    celery_app.conf.update(task_always_eager=False, task_eager_propagates=False)
+
+
+def test_tick_fans_out_per_symbol_and_aggregates(eager):
+    executor, calls = eager
+    summary = tasks.trading_tick(["BTCUSDT", "ETHUSDT", "BNBUSDT", "NOPEUSDT"]).apply_async().get()
+    assert summary["symbols"] == 4
+    assert summary["signals"] == {"BUY": 1, "SELL": 1, "HOLD": 1}
+    assert sorted(executor.orders) == [("BTCUSDT", "buy", tasks.TRADE_QUANTITY),
+                                       ("ETHUSDT", "sell", tasks.TRADE_QUANTITY)]
+    assert summary["errors"] == {"NOPEUSDT": "No market data received for NOPEUSDT"}  # reported, not raised
+    assert calls == [100, 100, 100]  # the worker's resources were reused, not rebuilt
+
+
+def test_signals_only_tick_and_symbol_sharding(eager):
+    executor, _ = eager
+    summary = tasks.trading_tick(["BTCUSDT"], trade=False).apply_async().get()
+    assert summary["signals"] == {"BUY": 1} and executor.orders == []
+
+    assert tasks.symbol_queue("BTCUSDT", shards=0) is None
+    queues = {tasks.symbol_queue(f"SYM{i}USDT", shards=4) for i in range(50)}
+    assert queues == {"symbols.0", "symbols.1", "symbols.2", "symbols.3"}
+    assert tasks.symbol_queue("BTCUSDT", shards=4) == tasks.symbol_queue("BTCUSDT", shards=4)
+
+
+def test_stale_ticks_are_dropped_per_symbol(eager):
+    executor, calls = eager
+    summary = tasks.trading_tick(["BTCUSDT", "ETHUSDT"], scheduled_at=time.time() - 3600).apply_async().get()
+    assert summary["statuses"] == {"stale": 2} and summary["signals"] == {}
+    assert executor.orders == [] and calls == []
+
+
+def test_worker_model_signal_reads_per_window_predictions(monkeypatch):
+    monkeypatch.setattr(tasks, "USE_EXTERNAL_DATA", True)  # no exchange credentials needed
+    resources = tasks.init_worker_resources()
+    try:
+        from backend.ai_models.trading_ai import get_trading_ai
+        rng = np.random.default_rng(0)
+        close = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.01, 100)))
+        market_data = pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close, 'Volume': 1.0})
+        assert len(get_trading_ai().predict(market_data[['Close']])) == 100 - 60 + 1
+        assert resources.signal(market_data) in ('BUY', 'SELL')
+    finally:
+        tasks._resources = None
+
+
+def test_ticks_use_the_redis_guard_unless_run_eagerly(monkeypatch):
+    monkeypatch.delenv("TICK_GUARD", raising=False)
+    assert tasks.tick_guard().metrics()["backend"] == "redis"  # stamps must reach the worker processes
+    monkeypatch.setitem(celery_app.conf, "task_always_eager", True)
+    assert tasks.tick_guard().metrics()["backend"] == "memory"
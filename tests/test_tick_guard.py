@@ -0,0 +1,66 @@
+import threading
+import time
+
+import pytest
+
+from backend.core.response_cache import FakeRedis
+from backend.core.tick_guard import TickGuard
+
+
+def hold(guard, key, release, started):
+    def job():
+        started.set()
+        release.wait(5)
+        return "slow"
+    thread = threading.Thread(target=guard.run, args=(key, job))
+    thread.start()
+    assert started.wait(5)
+    return thread
+
+
+def test_stale_and_superseded_ticks_are_dropped():
+    guard = TickGuard(max_age=30.0, late_after=1.0)
+    now = time.time()
+    assert guard.run("BTCUSDT", lambda: 1, now - 60).status == "stale"
+
+    for t in (now - 20, now - 10, now - 2):  # backlog queued behind a slow exchange
+        guard.stamp("BTCUSDT", t)
+    assert guard.run("BTCUSDT", lambda: 1, now - 20).status == "superseded"
+    assert guard.run("BTCUSDT", lambda: 1, now - 10).status == "superseded"
+    assert guard.run("BTCUSDT", lambda: "newest", now - 2) == ("ran", "newest")
+    assert guard.run("ETHUSDT", lambda: 2).status == "ran"  # keys are independent
+
+    metrics = guard.metrics()
+    assert (metrics["stale"], metrics["superseded"], metrics["ran"], metrics["late"]) == (1, 2, 2, 1)
+    assert metrics["max_lateness"] >= 2.0
+
+
+def test_overlapping_tick_is_skipped_and_failures_release_the_lock():
+    guard = TickGuard()
+    release, started = threading.Event(), threading.Event()
+    thread = hold(guard, "BTCUSDT", release, started)
+    assert guard.run("BTCUSDT", lambda: 1).status == "overlap"
+    release.set()
+    thread.join()
+
+    with pytest.raises(RuntimeError):
+        guard.run("BTCUSDT", lambda: (_ for _ in ()).throw(RuntimeError("exchange down")))
+    assert guard.run("BTCUSDT", lambda: 1).status == "ran"
+    assert guard.metrics()["failed"] == 1
+
+
+def test_redis_lock_and_stamps_are_shared_across_processes():
+    redis = FakeRedis()
+    worker_a, worker_b = TickGuard(redis), TickGuard(redis)
+    release, started = threading.Event(), threading.Event()
+    thread = hold(worker_a, "BTCUSDT", release, started)
+    assert worker_b.run("BTCUSDT", lambda: 1).status == "overlap"
+    release.set()
+    thread.join()
+    assert worker_b.run("BTCUSDT", lambda: 1).status == "ran"
+
+    now = time.time()
+    worker_a.stamp("BTCUSDT", now)
+    assert worker_b.run("BTCUSDT", lambda: 1, now - 1).status == "superseded"
+    worker_b.stamp("BTCUSDT", now - 5)  # a slower scheduler stamping an older tick does not roll it back
+    assert worker_a.latest("BTCUSDT") == now
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.ai_models.windowing import sliding_windows
+
+def legacy_windows(data, time_steps, n_features):
+    data = np.asarray(data).astype(np.float32)
+    windows = np.array([data[i:i + time_steps] for i in range(len(data) - time_steps + 1)])
+    return windows.reshape((windows.shape[0], time_steps, n_features))
+
+def test_matches_list_comprehension():
+    data = np.random.default_rng(1).standard_normal((50, 3))
+    result = sliding_windows(data, 10, 3)
+    np.testing.assert_array_equal(result, legacy_windows(data, 10, 3))
+    assert result.shape == (41, 10, 3)
+
+def test_view_shares_memory_and_contiguous_copies():
+    data = np.arange(20, dtype=np.float32).reshape(10, 2)
+    view = sliding_windows(data, 4)
+    assert np.shares_memory(view, data)
+    dense = sliding_windows(data, 4, contiguous=True)
+    assert dense.flags["C_CONTIGUOUS"] and not np.shares_memory(dense, data)
+
+def test_dataframe_drops_datetime_and_handles_1d():
+    df = pd.DataFrame({"ts": pd.date_range("2024-01-01", periods=6, freq="min"), "close": np.arange(6.0)})
+    assert sliding_windows(df, 3, 1).shape == (4, 3, 1)
+    assert sliding_windows(np.arange(6.0), 3).shape == (4, 3, 1)
+
+def test_rejects_short_or_mismatched_input():
+    with pytest.raises(ValueError):
+        sliding_windows(np.zeros((3, 1)), 5)
+    with pytest.raises(ValueError):
+        sliding_windows(np.zeros((10, 2)), 5, n_features=3)